@@ -0,0 +1,64 @@
+# bench_ctl.py
+# -*- coding: utf-8 -*-
+"""
+miniDSP Gain Helper - minidsp-ctl Startup Benchmark
+===================================
+• 새 인터프리터에서 minidsp_ctl 을 import 하는 시간(중앙값)을 빈 인터프리터와 비교
+• 무거운 모듈(Qt, core3, hid, asyncio)이 import 되지 않았는지 확인
+• 선택: --cmd "get" 처럼 실제 명령 전체 시간(프로세스 시작 → 종료)도 측정
+• 예산(--budget, 기본 100 ms)을 넘거나 금지 모듈이 있으면 종료 코드 1
+
+    python bench_ctl.py
+    python bench_ctl.py --cmd "get" --runs 20
+"""
+import argparse, json, os, shlex, statistics, subprocess, sys, time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FORBIDDEN = ("PySide6", "core3", "hid", "asyncio", "config", "tracing")
+
+PROBE = ("import sys, time; t = time.perf_counter(); import minidsp_ctl; "
+         "print(__import__('json').dumps({'import_ms': (time.perf_counter() - t) * 1000, "
+         "'modules': sorted(sys.modules)}))")
+
+
+def _run(argv: list[str]) -> tuple[float, str]:
+    t0 = time.perf_counter()
+    out = subprocess.run(argv, cwd=HERE, capture_output=True, text=True)
+    return (time.perf_counter() - t0) * 1000, out.stdout
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=15)
+    parser.add_argument("--budget", type=float, default=100.0, help="max median wall time in ms")
+    parser.add_argument("--cmd", help="also time 'minidsp_ctl.py CMD' end to end")
+    args = parser.parse_args()
+
+    base = [_run([sys.executable, "-c", "pass"])[0] for _ in range(args.runs)]
+    wall, imports, modules = [], [], set()
+    for _ in range(args.runs):
+        ms, out = _run([sys.executable, "-c", PROBE])
+        data = json.loads(out)
+        wall.append(ms)
+        imports.append(data["import_ms"])
+        modules.update(data["modules"])
+    bad = [m for m in FORBIDDEN if m in modules]
+
+    result = {
+        "interpreter_ms": round(statistics.median(base), 1),
+        "startup_ms":     round(statistics.median(wall), 1),
+        "import_ms":      round(statistics.median(imports), 1),
+        "forbidden":      bad,
+    }
+    if args.cmd:
+        cmd = [sys.executable, os.path.join(HERE, "minidsp_ctl.py"), *shlex.split(args.cmd)]
+        result["command_ms"] = round(statistics.median(_run(cmd)[0] for _ in range(args.runs)), 1)
+
+    ok = not bad and result["startup_ms"] <= args.budget and result.get("command_ms", 0) <= args.budget
+    print(json.dumps(result))
+    print(("PASS" if ok else "FAIL") + f" (budget {args.budget:.0f} ms)")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+# bench_engine.py
+# -*- coding: utf-8 -*-
+"""
+miniDSP Gain Helper - Engine Jitter Benchmark
+===================================
+• 기기 엔진을 같은 프로세스(inproc)에서 돌릴 때와 별도 프로세스(--engine process)로 돌릴 때의
+  폴링 주기 지터와 핫키 → 기기 쓰기 지연을, GUI 스레드 부하가 없을 때/있을 때 나란히 비교
+  - GUI 부하: 10 ms 마다 8 ms 동안 GIL 을 잡고 도는 스레드 (Diagnostics 의 "Simulate GUI load" 와 같음)
+  - 핫키: Win32 훅 대신 hook_ring 에 직접 넣음 (--rate 초당 횟수, 올림/내림 번갈아)
+• 조합마다 새 인터프리터에서 실행 (sim_device, 실시간 시계) - 처음 --warmup 초는 통계에서 제외
+• 결과: 조합별 poll_* (주기 평균/지터/최대) 와 key_* (hook-worker 깨어남 → 쓰기 완료), ms
+• 엔진 자식은 평소 캐시 디렉터리를 쓰므로 실행 전후로 cache/ 를 보존·복원
+
+    python bench_engine.py
+    python bench_engine.py --seconds 20 --interval 0.05
+"""
+import argparse, json, os, shutil, subprocess, sys, tempfile, threading, time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+MODES = ("inproc", "process")
+LOAD_BUSY, LOAD_PERIOD = 0.008, 0.010
+
+
+def _gui_load(stop: threading.Event):
+    while not stop.is_set():
+        t = time.perf_counter() + LOAD_BUSY
+        while time.perf_counter() < t:
+            pass
+        time.sleep(LOAD_PERIOD - LOAD_BUSY)
+
+
+def _child(mode: str, load: bool, args) -> dict:
+    os.environ["MINIDSP_SIM"] = "1"
+    os.environ["MINIDSP_LOG_NAME"] = "bench-engine"
+    sys.path.insert(0, HERE)
+    import core3 as core
+    import hook_ring
+
+    core.CACHE_DIR = tempfile.mkdtemp(prefix="minidsp-bench-")
+    core.STATE_CACHE = os.path.join(core.CACHE_DIR, "state.json")
+    if mode == "process":
+        if not core.start_engine(None, args.interval):
+            raise RuntimeError("device engine did not start")
+    else:
+        core.open_device()
+        core.start_polling(args.interval)
+    # 훅 워커만 시작 (Win32 훅은 설치하지 않음)
+    core._hook_stop.clear()
+    core._hook_thread = threading.Thread(target=core._hook_worker, name="hook-worker", daemon=True)
+    core._hook_thread.start()
+    ids = [next(i for i, (act, _) in enumerate(core._bind_actions[1:], 1) if act == a)
+           for a in ("volume_up", "volume_down")]
+
+    stop = threading.Event()
+    if load:
+        threading.Thread(target=_gui_load, args=(stop,), name="gui-load", daemon=True).start()
+    t_end = time.perf_counter() + args.warmup + args.seconds
+    reset_at = time.perf_counter() + args.warmup
+    n = 0
+    while time.perf_counter() < t_end:
+        if reset_at and time.perf_counter() >= reset_at:
+            core.reset_poll_stats()
+            core._key_latency.reset()
+            reset_at = 0
+        hook_ring.push(ids[n & 1], 1)
+        n += 1
+        time.sleep(1 / args.rate)
+    stop.set()
+
+    poll, hook = core.get_poll_stats(), core.get_hook_stats()
+    result = {f"poll_{k}": poll[k] for k in ("n", "mean_ms", "jitter_ms", "max_ms")}
+    result.update({k: hook[k] for k in ("key_n", "key_mean_ms", "key_jitter_ms", "key_max_ms")})
+    core._hook_stop.set()
+    hook_ring.signal.set()
+    core.stop_engine()
+    core.stop_polling()
+    shutil.rmtree(core.CACHE_DIR, ignore_errors=True)
+    return result
+
+
+def _run(mode: str, load: bool, args) -> dict:
+    argv = [sys.executable, os.path.abspath(__file__), "--child", mode,
+            "--seconds", str(args.seconds), "--warmup", str(args.warmup),
+            "--interval", str(args.interval), "--rate", str(args.rate)]
+    if load:
+        argv.append("--load")
+    out = subprocess.run(argv, cwd=HERE, capture_output=True, text=True, timeout=args.seconds + 60)
+    if out.returncode:
+        raise RuntimeError(f"{mode} run failed:\n{out.stderr}")
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=10.0, help="measured seconds per combination")
+    parser.add_argument("--warmup", type=float, default=1.0)
+    parser.add_argument("--interval", type=float, default=0.1, help="poll interval (s)")
+    parser.add_argument("--rate", type=float, default=20.0, help="injected hotkeys per second")
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--load", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(_child(args.child, args.load, args)))
+        return 0
+
+    cache = os.path.join(HERE, "cache")
+    backup = tempfile.mkdtemp(prefix="minidsp-cache-")
+    had_cache = os.path.isdir(cache)
+    if had_cache:
+        shutil.copytree(cache, backup, dirs_exist_ok=True)
+    try:
+        results = {f"{mode}{'+load' if load else ''}": _run(mode, load, args)
+                   for load in (False, True) for mode in MODES}
+    finally:
+        shutil.rmtree(cache, ignore_errors=True)
+        if had_cache:
+            shutil.copytree(backup, cache)
+        shutil.rmtree(backup, ignore_errors=True)
+
+    cols = ("poll_mean_ms", "poll_jitter_ms", "poll_max_ms", "key_mean_ms", "key_jitter_ms", "key_max_ms")
+    print(f"{'':<16}" + "".join(f"{c:>16}" for c in cols))
+    for name, r in results.items():
+        print(f"{name:<16}" + "".join(f"{r[c]:>16}" for c in cols))
+    print(json.dumps(results))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+# bench_hooks.py
+# -*- coding: utf-8 -*-
+"""
+miniDSP Gain Helper - Hook Decode Benchmark
+===================================
+• 저수준 훅 콜백이 이벤트마다 하는 일(구조체 필드 읽기 → hook_ring 디코딩 → 링 push)의 호출당 시간
+• Win32 없이 실행 - KBDLLHOOKSTRUCT / MSLLHOOKSTRUCT / MSG 를 같은 배치의 ctypes 구조체로 만들고
+  core3 의 _kb_proc / _msg_proc / _mouse_proc 와 같은 본문을 주소로 호출 (CallNextHookEx 대신 0)
+• 경우별: 바인딩 없는 키(대부분의 타이핑), 수정키, 바인딩된 키, WM_APPCOMMAND, 휠 (부분 델타 포함)
+• 링은 RING_SIZE 보다 적게 채우고 시간 구간 밖에서 비움 (워커 쪽 비용은 제외)
+• 경우별 중앙값이 예산(--budget, 기본 5 µs)을 넘으면 종료 코드 1
+
+    python bench_hooks.py
+    python bench_hooks.py --rounds 500 --budget 2
+"""
+import argparse, ctypes, json, statistics, sys, time
+
+import hook_ring
+import hotkeys
+
+WM_KEYDOWN, WM_KEYUP, WM_SYSKEYDOWN = 0x0100, 0x0101, 0x0104
+WM_APPCOMMAND = 0x0319
+WM_MBUTTONDOWN, WM_MOUSEWHEEL, WM_MOUSEHWHEEL = 0x0207, 0x020A, 0x020E
+BATCH = hook_ring.RING_SIZE // 2
+
+DWORD, ULONG_PTR = ctypes.c_uint32, ctypes.c_size_t
+
+
+# ─── 가짜 디코딩 계층: Windows 와 같은 필드 배치
+class POINT(ctypes.Structure):
+    _fields_ = [("x", ctypes.c_long), ("y", ctypes.c_long)]
+
+class MSLLHOOKSTRUCT(ctypes.Structure):
+    _fields_ = [("pt", POINT), ("mouseData", DWORD), ("flags", DWORD),
+                ("time", DWORD), ("dwExtraInfo", ULONG_PTR)]
+
+class KBDLLHOOKSTRUCT(ctypes.Structure):
+    _fields_ = [("vkCode", DWORD), ("scanCode", DWORD), ("flags", DWORD),
+                ("time", DWORD), ("dwExtraInfo", ULONG_PTR)]
+
+class MSG(ctypes.Structure):
+    _fields_ = [("hWnd", ctypes.c_void_p), ("message", ctypes.c_uint), ("wParam", ULONG_PTR),
+                ("lParam", ctypes.c_ssize_t), ("time", DWORD), ("pt", POINT)]
+
+
+def _kb_proc(nCode, wParam, lParam):
+    if nCode == 0:
+        vk = KBDLLHOOKSTRUCT.from_address(lParam).vkCode & 0xFF
+        if hook_ring.on_key(vk, wParam == WM_KEYDOWN or wParam == WM_SYSKEYDOWN):
+            return 1
+    return 0
+
+def _msg_proc(nCode, wParam, lParam):
+    if nCode == 0:
+        msg = MSG.from_address(lParam)
+        if msg.message == WM_APPCOMMAND and hook_ring.on_appcmd((msg.lParam >> 16) & 0xFFF):
+            return 1
+    return 0
+
+def _mouse_proc(nCode, wParam, lParam):
+    if nCode == 0:
+        if wParam == WM_MBUTTONDOWN:
+            if hook_ring.on_button(hotkeys.KEY_MBUTTON):
+                return 1
+        elif wParam == WM_MOUSEWHEEL or wParam == WM_MOUSEHWHEEL:
+            delta = ctypes.c_short(MSLLHOOKSTRUCT.from_address(lParam).mouseData >> 16).value
+            if hook_ring.on_wheel(delta):
+                return 1
+    return 0
+
+
+def _cases() -> dict:
+    """이름 → (proc, [(wParam, 구조체)...], 기대 반환값, 누르고 있을 수정키 vk) - 한 배치 안에서 순환"""
+    kb = lambda vk: KBDLLHOOKSTRUCT(vkCode=vk)
+    wheel = lambda d: MSLLHOOKSTRUCT(mouseData=(d & 0xFFFF) << 16)
+    appcmd = MSG(message=WM_APPCOMMAND, lParam=10 << 16)        # APPCOMMAND_VOLUME_UP
+    return {
+        "key_unbound":  (_kb_proc, [(WM_KEYDOWN, kb(ord("E"))), (WM_KEYUP, kb(ord("E")))], 0, 0),
+        "key_modifier": (_kb_proc, [(WM_KEYDOWN, kb(0xA2)), (WM_KEYUP, kb(0xA2))], 0, 0),
+        "key_bound":    (_kb_proc, [(WM_KEYDOWN, kb(0xAF))], 1, 0),          # VOLUME_UP (mods any)
+        "appcommand":   (_msg_proc, [(0, appcmd)], 1, 0),
+        "wheel":        (_mouse_proc, [(WM_MOUSEWHEEL, wheel(120))], 1, 0xA0),     # Shift+휠
+        "wheel_hires":  (_mouse_proc, [(WM_MOUSEWHEEL, wheel(30))], 1, 0xA0),      # 4 이벤트 → 1 노치
+    }
+
+
+def _bench(proc, events, expect, hold, rounds: int) -> float:
+    """배치당 BATCH 번 호출 → 호출당 ns 의 중앙값"""
+    mod = KBDLLHOOKSTRUCT(vkCode=hold)
+    bit = hotkeys.MOD_VKS.get(hold, 0)
+    hook_ring.set_mod_probe(lambda: bit)     # GetAsyncKeyState 자리 (시스템 호출 비용은 빠짐)
+    if hold:
+        _kb_proc(0, WM_KEYDOWN, ctypes.addressof(mod))
+    calls = [(w, ctypes.addressof(s)) for w, s in events]
+    seq = (calls * BATCH)[:BATCH]
+    for w, addr in seq:                                       # 워밍업 + 결과 확인
+        if proc(0, w, addr) != expect:
+            raise RuntimeError(f"{proc.__name__}: unexpected result for wParam {w:#x}")
+    hook_ring.drain([])
+    perf = time.perf_counter_ns
+    samples = []
+    for _ in range(rounds):
+        t0 = perf()
+        for w, addr in seq:
+            proc(0, w, addr)
+        samples.append((perf() - t0) / BATCH)
+        hook_ring.drain([])
+    if hold:
+        _kb_proc(0, WM_KEYUP, ctypes.addressof(mod))
+    return statistics.median(samples)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--budget", type=float, default=5.0, help="max median per call in µs")
+    args = parser.parse_args()
+
+    table, _ = hotkeys.compile_bindings(hotkeys.DEFAULT_BINDINGS)
+    hook_ring.set_table(table)
+    result = {name: round(_bench(*case, args.rounds)) for name, case in _cases().items()}
+    dropped = hook_ring.stats()["dropped"]
+
+    ok = not dropped and max(result.values()) <= args.budget * 1000
+    print(json.dumps({"ns_per_call": result, "dropped": dropped}))
+    print(("PASS" if ok else "FAIL") + f" (budget {args.budget:g} µs)")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
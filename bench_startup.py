@@ -0,0 +1,157 @@
+# bench_startup.py
+# -*- coding: utf-8 -*-
+"""
+miniDSP Gain Helper - Helper Startup Benchmark
+===================================
+• main.py 를 새 프로세스로 반복 실행하며 콜드 스타트 시간과 트레이 전용 상태의 메모리를 측정
+  - tray_ms        : 실행 → 트레이 표시 (헬퍼가 로그에 남기는 "Tray ready", 무거운 import 이후 기준)
+  - hooks_ms       : 실행 → 키보드 훅 설치 (이 스크립트가 로그를 보고 잰 벽시계 시간)
+  - first_hotkey_ms: 실행 → 첫 핫키 처리 완료 (훅 설치 직후 Alt+F11, Alt+F10 을 보냄 - 한 스텝 올렸다 내림)
+  - rss_mb         : 첫 핫키 뒤 --settle 초 동안 창을 열지 않은 상태의 Working Set (Linux 는 VmRSS)
+• 로그는 MINIDSP_LOG_NAME=bench-startup 으로 따로 (error.log 는 건드리지 않음)
+• 기본은 실제 기기 - --sim 이면 sim_device (캐시 파일은 어느 쪽이든 평소처럼 갱신됨)
+• 중앙값이 예산(--budget ms, --rss-budget MB)을 넘으면 종료 코드 1
+• 핫키 주입은 Windows 에서만 (다른 OS 에서는 first_hotkey_ms 없음)
+
+    python bench_startup.py
+    python bench_startup.py --sim --runs 10 --budget 1500
+"""
+import argparse, ctypes, json, os, re, statistics, subprocess, sys, tempfile, time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+LOG_NAME = "bench-startup"
+LOG_PATH = os.path.join(HERE, "logs", f"{LOG_NAME}.log")
+TIMEOUT = 30.0
+
+VK_LMENU, VK_F10, VK_F11 = 0xA4, 0x79, 0x7A
+KEYEVENTF_KEYUP = 0x2
+
+
+class _Log:
+    """헬퍼 로그를 따라 읽으며 특정 메시지가 나온 시각(실행 기준 ms)을 기록"""
+    def __init__(self, t0: float):
+        self.t0 = t0
+        self.pos = 0
+        self.seen = {}                      # 메시지 → (벽시계 ms, 매치)
+
+    def wait(self, child, pattern: str, timeout: float = TIMEOUT):
+        deadline = time.perf_counter() + timeout
+        while pattern not in self.seen:
+            if child.poll() is not None:
+                raise RuntimeError(f"helper exited with {child.returncode} before {pattern!r}")
+            if time.perf_counter() > deadline:
+                raise RuntimeError(f"timed out waiting for {pattern!r}")
+            self._read()
+            time.sleep(0.002)
+        return self.seen[pattern]
+
+    def _read(self):
+        try:
+            with open(LOG_PATH, encoding="utf-8", errors="replace") as f:
+                f.seek(self.pos)
+                chunk = f.read()
+        except FileNotFoundError:
+            return
+        now = (time.perf_counter() - self.t0) * 1000
+        lines = chunk.split("\n")
+        self.pos += len(chunk.encode("utf-8")) - len(lines[-1].encode("utf-8"))   # 끝나지 않은 줄은 다음에
+        for line in lines[:-1]:
+            for pattern in ("Tray ready in", "Keyboard hooks installed", "First hotkey handled"):
+                if pattern in line and pattern not in self.seen:
+                    self.seen[pattern] = (now, line)
+
+
+def _send_alt(vk: int):
+    user32 = ctypes.windll.user32
+    user32.keybd_event(VK_LMENU, 0, 0, 0)
+    user32.keybd_event(vk, 0, 0, 0)
+    user32.keybd_event(vk, 0, KEYEVENTF_KEYUP, 0)
+    user32.keybd_event(VK_LMENU, 0, KEYEVENTF_KEYUP, 0)
+
+
+def _rss_mb(pid: int) -> float | None:
+    if sys.platform == "win32":
+        from ctypes import wintypes as wt
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [("cb", wt.DWORD), ("PageFaultCount", wt.DWORD),
+                        ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                        ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+        kernel32 = ctypes.windll.kernel32
+        kernel32.OpenProcess.restype = wt.HANDLE
+        handle = kernel32.OpenProcess(0x1000, False, pid)     # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return None
+        try:
+            pmc = PROCESS_MEMORY_COUNTERS()
+            pmc.cb = ctypes.sizeof(pmc)
+            if kernel32.K32GetProcessMemoryInfo(wt.HANDLE(handle), ctypes.byref(pmc), pmc.cb):
+                return pmc.WorkingSetSize / (1024*1024)
+            return None
+        finally:
+            kernel32.CloseHandle(wt.HANDLE(handle))
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def _run_once(config: str, sim: bool, settle: float) -> dict:
+    env = dict(os.environ, MINIDSP_LOG_NAME=LOG_NAME, MINIDSP_DEBUG="1")
+    if sim:
+        env["MINIDSP_SIM"] = "1"
+    if os.path.exists(LOG_PATH):
+        os.remove(LOG_PATH)
+    t0 = time.perf_counter()
+    child = subprocess.Popen([sys.executable, os.path.join(HERE, "main.py"), "--config", config],
+                             cwd=HERE, env=env)
+    log = _Log(t0)
+    try:
+        _, line = log.wait(child, "Tray ready in")
+        result = {"tray_ms": float(re.search(r"Tray ready in (\d+)", line).group(1))}
+        result["hooks_ms"] = log.wait(child, "Keyboard hooks installed")[0]
+        if sys.platform == "win32":
+            _send_alt(VK_F11)
+            result["first_hotkey_ms"] = log.wait(child, "First hotkey handled")[0]
+            _send_alt(VK_F10)                   # 올린 한 스텝을 되돌림
+        time.sleep(settle)
+        result["rss_mb"] = _rss_mb(child.pid)
+        return result
+    finally:
+        child.terminate()
+        child.wait(10)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=1500.0,
+                        help="max median ms from launch to the first handled hotkey (hooks installed off Windows)")
+    parser.add_argument("--rss-budget", type=float, default=80.0, help="max median tray-only RSS in MB")
+    parser.add_argument("--settle", type=float, default=2.0, help="seconds idle before reading RSS")
+    parser.add_argument("--sim", action="store_true", help="use the simulated device (MINIDSP_SIM=1)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="minidsp-bench-") as tmp:
+        config = os.path.join(tmp, "config.toml")   # 기본 설정으로 시작 (사용자 config.toml 은 그대로)
+        runs = [_run_once(config, args.sim, args.settle) for _ in range(args.runs)]
+
+    result = {}
+    for key in ("tray_ms", "hooks_ms", "first_hotkey_ms", "rss_mb"):
+        values = [r[key] for r in runs if r.get(key) is not None]
+        if values:
+            result[key] = round(statistics.median(values), 1)
+    cold = result.get("first_hotkey_ms", result["hooks_ms"])
+    ok = cold <= args.budget and result.get("rss_mb", 0) <= args.rss_budget
+    print(json.dumps(result))
+    print(("PASS" if ok else "FAIL") + f" (budget {args.budget:.0f} ms, {args.rss_budget:.0f} MB)")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+# clock.py
+# -*- coding: utf-8 -*-
+"""
+miniDSP Gain Helper - Clock
+===================================
+• core 가 직접 time.* 를 부르지 않고 이 인터페이스를 통해 시간을 읽고 대기
+  - time() / monotonic() / perf() / sleep(s) / wait(event, timeout) / blocked(s)
+• RealClock   : 실제 시간 (기본값)
+• VirtualClock: 수동으로 진행하는 가상 시간
+  - auto_advance=True : sleep 이 즉시 시간을 앞당김 → 몇 시간 분량 폴링을 밀리초에
+  - auto_advance=False: sleep 은 다른 스레드가 advance() 로 목표 시각을 넘길 때까지 블록
+    (타이밍 버그를 한 단계씩 결정적으로 재현)
+
+    import core3, clock
+    vc = clock.VirtualClock()
+    core3.set_clock(vc)
+"""
+import threading
+import time as _time
+
+
+class RealClock:
+    virtual = False
+
+    time      = staticmethod(_time.time)
+    monotonic = staticmethod(_time.monotonic)
+    perf      = staticmethod(_time.perf_counter)
+    sleep     = staticmethod(_time.sleep)
+
+    def wait(self, event: threading.Event, timeout: float | None) -> bool:
+        return event.wait(timeout)
+
+    def blocked(self, seconds: float):
+        """블로킹 I/O 가 seconds 동안 기다렸음을 알림 - 실제 시간은 이미 흘렀으므로 no-op"""
+
+
+class VirtualClock:
+    virtual = True
+
+    def __init__(self, start: float = 0.0, auto_advance: bool = True,
+                 epoch: float = 1_700_000_000.0):
+        self.auto_advance = auto_advance
+        self.epoch = epoch
+        self._now = start
+        self._cv = threading.Condition()
+        self._targets: list[float] = []     # 잠든 스레드들의 깨어날 시각
+
+    # ─── 읽기
+    def monotonic(self) -> float:
+        return self._now
+
+    perf = monotonic
+
+    def time(self) -> float:
+        return self.epoch + self._now
+
+    # ─── 진행
+    def advance(self, seconds: float):
+        """시간을 seconds 만큼 진행하고 깨어날 시각이 된 sleep 을 풀어줌"""
+        with self._cv:
+            self._now += seconds
+            self._cv.notify_all()
+
+    def run_until(self, t: float, step: float = 0.01):
+        """manual 모드: sleeper 가 있을 때마다 step 씩 진행해 t 까지"""
+        while self._now < t:
+            self.wait_for_sleepers()
+            self.advance(min(step, t - self._now))
+
+    def wait_for_sleepers(self, n: int = 1, timeout: float = 5.0) -> bool:
+        """(실시간으로) 아직 깨어날 시각이 안 된 sleeper 가 n 개 이상이 될 때까지 대기"""
+        with self._cv:
+            return self._cv.wait_for(
+                lambda: sum(t > self._now for t in self._targets) >= n, timeout)
+
+    # ─── 대기
+    def sleep(self, seconds: float, event: threading.Event | None = None) -> bool:
+        if seconds <= 0:
+            return bool(event and event.is_set())
+        with self._cv:
+            target = self._now + seconds
+            if self.auto_advance:
+                self._now = target
+                self._cv.notify_all()
+                return bool(event and event.is_set())
+            self._targets.append(target)
+            self._cv.notify_all()
+            try:
+                # event 는 다른 스레드가 set 할 수 있으므로 짧게 깨어나 확인
+                while self._now < target and not (event and event.is_set()):
+                    self._cv.wait(0.05)
+            finally:
+                self._targets.remove(target)
+        return bool(event and event.is_set())
+
+    def wait(self, event: threading.Event, timeout: float | None) -> bool:
+        if event.is_set():
+            return True
+        if timeout is None:
+            return event.wait()
+        return self.sleep(timeout, event)
+
+    def blocked(self, seconds: float):
+        self.sleep(seconds)
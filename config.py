@@ -0,0 +1,264 @@
+# config.py
+# -*- coding: utf-8 -*-
+"""
+miniDSP Gain Helper - Config File
+===================================
+• core3 / GUI 런타임 설정 전부를 TOML 파일 하나로 (기본 config.toml, --config 로 변경)
+  - 관리 PC 들은 파일만 배포하면 됨
+• 시작 시 한 번 파싱 → 이후 감시 스레드가 mtime/크기 변화를 확인해 다시 읽고
+  바뀐 키("섹션.키", "bindings", "scenes")만 on_change 로 전달 → 해당 서브시스템만 재설정
+• 읽기는 tomllib, 쓰기는 이 파일에 필요한 만큼만 지원하는 작은 writer
+  (str/int/float/bool, 배열, 인라인 테이블, [섹션], [[배열 테이블]])
+• 파일이 없으면 migrate() 결과(이전 QSettings 값)를 기본값에 덮어 새로 생성
+• Qt 를 import 하지 않음
+"""
+import copy, logging, math, os, threading, tomllib
+import hotkeys
+
+logger = logging.getLogger('minidsp')
+
+WATCH_INTERVAL = 1.0                  # 파일 변경 확인 주기 (s)
+
+# 섹션 테이블은 키별로 diff, 배열 테이블(bindings/scenes)은 통째로 diff
+DEFAULTS = {
+    "device":  {"path": ""},                              # "" = 캐시된 마지막 기기 / 첫 miniDSP
+    "polling": {"interval": 0.1},
+    "hotkeys": {"media": True, "alt": True, "shift": True, "paused": False},
+    "volume":  {"step_curve": "fine", "acceleration": False},
+    "gui":     {"theme": "dark"},
+    "tracing": {"enabled": False},
+    "startup": {"engine": "inproc", "http": ""},          # 재시작해야 반영 (CLI 옵션이 우선)
+    "scenes":  [],                                        # 바인딩이 장면 번호를 참조하므로 먼저
+    "bindings": [dict(b) for b in hotkeys.DEFAULT_BINDINGS],
+}
+
+STEP_CURVES = ("fine", "adaptive", "coarse")          # core3.STEP_CURVES 의 키
+ENGINES     = ("inproc", "process")                   # main.py --engine
+THEMES      = ("dark", "light")
+
+
+def _number(x) -> bool:
+    return isinstance(x, (int, float)) and not isinstance(x, bool)
+
+
+# 타입이 맞아도 범위/허용값을 벗어나면 기본값 유지: (검사, 경고에 쓸 설명)
+# NaN 은 비교가 전부 거짓이라 범위 검사에서 걸림
+RULES = {
+    ("polling", "interval"):  (lambda v: 0.01 <= v <= 10.0, "between 0.01 and 10 s"),
+    ("volume", "step_curve"): (lambda v: v in STEP_CURVES, "one of " + "/".join(STEP_CURVES)),
+    ("gui", "theme"):         (lambda v: v in THEMES, "one of " + "/".join(THEMES)),
+    ("startup", "engine"):    (lambda v: v in ENGINES, "one of " + "/".join(ENGINES)),
+}
+# 배열 테이블 항목의 키: 벗어나면 그 키만 빼고 씀 (= 없을 때의 동작)
+ITEM_RULES = {
+    ("scenes", "gain"):   (lambda v, item: _number(v) and -127.0 <= v <= 0.0, "a dB value between -127 and 0"),
+    ("scenes", "fade"):   (lambda v, item: _number(v) and 0.0 <= v <= 60.0, "between 0 and 60 s"),
+    ("bindings", "arg"):  (lambda v, item: (type(v) is int and v >= 1) if item.get("action") == "scene"
+                           else (_number(v) and 0.0 < v <= 127.0),
+                           "a step in dB between 0 and 127 (scene: a number >= 1)"),
+}
+
+
+# ─── 쓰기 (TOML 부분집합)
+def _value(v) -> str:
+    if isinstance(v, bool):
+        return "true" if v else "false"
+    if isinstance(v, int):
+        return str(v)
+    if isinstance(v, float):
+        if not math.isfinite(v):
+            return ("-inf" if v < 0 else "inf") if math.isinf(v) else "nan"
+        return repr(v)
+    if isinstance(v, str):
+        return '"' + "".join(c if c not in '"\\' and c >= " " else f"\\u{ord(c):04x}"
+                             for c in v) + '"'
+    if isinstance(v, (list, tuple)):
+        return "[" + ", ".join(_value(x) for x in v) + "]"
+    if isinstance(v, dict):
+        # TOML 에는 null 이 없음 - 값이 없는 키는 빼고 씀 ([[배열 테이블]] 과 같은 규칙)
+        return "{ " + ", ".join(f"{_key(k)} = {_value(x)}" for k, x in v.items()
+                                if x is not None) + " }"
+    raise TypeError(f"cannot write {type(v).__name__} to TOML")
+
+
+def _key(k) -> str:
+    k = str(k)
+    return k if k and all(c.isalnum() or c in "_-" for c in k) else _value(k)
+
+
+def dumps(data: dict) -> str:
+    lines = []
+    for name, v in data.items():
+        if isinstance(v, dict):
+            lines.append(f"[{_key(name)}]")
+            lines += [f"{_key(k)} = {_value(x)}" for k, x in v.items()]
+            lines.append("")
+        elif isinstance(v, list) and v and all(isinstance(x, dict) for x in v):
+            for item in v:
+                lines.append(f"[[{_key(name)}]]")
+                lines += [f"{_key(k)} = {_value(x)}" for k, x in item.items() if x is not None]
+                lines.append("")
+        else:
+            # 빈 배열 등은 섹션 앞에 와야 하므로 맨 위로
+            lines.insert(0, f"{_key(name)} = {_value(v)}")
+    return "\n".join(lines)
+
+
+# ─── 읽기 / 검증
+def _check_item(name: str, i: int, item: dict) -> dict:
+    out = dict(item)
+    for k, x in item.items():
+        rule = ITEM_RULES.get((name, k))
+        if rule is not None and not rule[0](x, item):
+            logger.warning("Config: %s[%d].%s = %r must be %s - ignored", name, i, k, x, rule[1])
+            del out[k]
+    return out
+
+
+def _merge(raw: dict) -> dict:
+    """기본값 위에 파일 값을 덮음 - 알 수 없는 키는 경고, 타입/범위가 맞지 않으면 기본값 유지"""
+    out = copy.deepcopy(DEFAULTS)
+    for name, v in raw.items():
+        if name not in DEFAULTS:
+            logger.warning("Config: unknown section %r ignored", name)
+            continue
+        default = DEFAULTS[name]
+        if isinstance(default, list):
+            if isinstance(v, list) and all(isinstance(x, dict) for x in v):
+                out[name] = [_check_item(name, i, x) for i, x in enumerate(v)]
+            else:
+                logger.warning("Config: %r must be an array of tables", name)
+            continue
+        if not isinstance(v, dict):
+            logger.warning("Config: [%s] must be a table", name)
+            continue
+        for k, x in v.items():
+            if k not in default:
+                logger.warning("Config: unknown key %s.%s ignored", name, k)
+            elif not (type(x) is type(default[k]) or (isinstance(default[k], float) and type(x) is int)):
+                logger.warning("Config: %s.%s must be %s - using %r",
+                               name, k, type(default[k]).__name__, default[k])
+            elif (rule := RULES.get((name, k))) is not None and not rule[0](x):
+                logger.warning("Config: %s.%s = %r must be %s - using %r",
+                               name, k, x, rule[1], default[k])
+            else:
+                out[name][k] = float(x) if isinstance(default[k], float) else x
+    return out
+
+
+def flatten(data: dict) -> dict:
+    """{"섹션.키": 값, "bindings": [...], "scenes": [...]}"""
+    flat = {}
+    for name, v in data.items():
+        if isinstance(v, dict):
+            flat.update((f"{name}.{k}", x) for k, x in v.items())
+        else:
+            flat[name] = v
+    return flat
+
+
+class ConfigFile:
+    def __init__(self, path: str, on_change=None):
+        self.path = path
+        self.on_change = on_change or (lambda changes: None)
+        self.data = copy.deepcopy(DEFAULTS)
+        self._lock = threading.Lock()
+        self._stamp = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    # ─── 값 접근
+    def get(self, key: str):
+        name, _, k = key.partition(".")
+        v = self.data[name]
+        return v[k] if k else v
+
+    def set(self, key: str, value):
+        """GUI 에서 바뀐 값 → 파일에 저장 (같은 값이면 아무것도 안 함)"""
+        name, _, k = key.partition(".")
+        # 파일에서 다시 읽었을 때와 같은 형태로 (튜플 → 배열, 정수 키 → 문자열 키)
+        value = tomllib.loads(dumps({"v": value}))["v"]
+        with self._lock:
+            if k:
+                if self.data[name][k] == value:
+                    return
+                self.data[name][k] = value
+            else:
+                if self.data[name] == value:
+                    return
+                self.data[name] = value
+        self.save()
+
+    # ─── 파일
+    def _read_stamp(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def load(self, migrate=None):
+        """시작 시 한 번: 파일이 없으면 migrate() 값을 기본값에 덮어 새로 만듦"""
+        if not os.path.exists(self.path):
+            raw = (migrate() if migrate else None) or {}
+            self.data = _merge(tomllib.loads(dumps(_merge(raw))))
+            self.save()
+            logger.info("Config created at %s", self.path)
+            return
+        try:
+            with open(self.path, "rb") as f:
+                self.data = _merge(tomllib.load(f))
+        except (OSError, tomllib.TOMLDecodeError) as e:
+            logger.warning("Config %s unreadable - using defaults: %s", self.path, e)
+        self._stamp = self._read_stamp()
+
+    def save(self):
+        """원자적 저장 - 감시 스레드가 자기 쓰기를 변경으로 보지 않도록 stamp 갱신"""
+        with self._lock:
+            text = dumps(self.data)
+            tmp = self.path + ".tmp"
+            try:
+                with open(tmp, "w", encoding="utf-8") as f:
+                    f.write(text)
+                os.replace(tmp, self.path)
+            except OSError as e:
+                logger.warning("Config save failed: %s", e)
+                return
+            self._stamp = self._read_stamp()
+
+    def reload(self) -> dict:
+        """파일을 다시 읽고 바뀐 키만 반환 (파싱 실패 시 현재 값 유지)"""
+        stamp = self._read_stamp()
+        try:
+            with open(self.path, "rb") as f:
+                new = _merge(tomllib.load(f))
+        except (OSError, tomllib.TOMLDecodeError) as e:
+            logger.warning("Config %s not reloaded: %s", self.path, e)
+            self._stamp = stamp               # 같은 깨진 파일로 경고를 반복하지 않음
+            return {}
+        with self._lock:
+            old, self.data, self._stamp = flatten(self.data), new, stamp
+        return {k: v for k, v in flatten(new).items() if old.get(k) != v}
+
+    # ─── 감시
+    def watch(self):
+        self._thread = threading.Thread(target=self._watch, name="config-watch", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(WATCH_INTERVAL * 2)
+
+    def _watch(self):
+        while not self._stop.wait(WATCH_INTERVAL):
+            stamp = self._read_stamp()
+            if stamp is None or stamp == self._stamp:
+                continue
+            changes = self.reload()
+            if changes:
+                logger.info("Config reloaded: %s", ", ".join(sorted(changes)))
+                try:
+                    self.on_change(changes)
+                except Exception:
+                    logger.exception("Config apply failed")
@@ -11,12 +11,22 @@ miniDSP Volume & Mute Control with Hotkeys + Volume Polling
 • 
 """
 
-import ctypes, threading, time, atexit, hid, logging, os, sys, functools, glob
+import ctypes, threading, time, atexit, hid, logging, os, sys, functools, glob, random, json, struct
 from logging.handlers import RotatingFileHandler
 from ctypes import wintypes as wt
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future, ThreadPoolExecutor
 from enum import Enum, auto
-_executor = ThreadPoolExecutor(max_workers=1)
+import flight_recorder as fr
+import device_mirror as dm
+import device_caps as dc
+import protocol
+import profiler
+import hotkeys
+import hook_ring
+import clock
+import tracing
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="minidsp-io")
+_clock = clock.RealClock()            # 폴링/읽기/쓰기 경로의 시간 소스 (set_clock 으로 교체)
 MUTE_THRESHOLD = -126.9
 
 # ─── 로깅 설정 (프로그램 폴더 아래 logs 디렉토리 / ERROR 이상)
@@ -33,13 +43,18 @@ formatter = logging.Formatter(
     '%(asctime)s %(name)s %(levelname)s %(message)s'
 )
 
-# ① 기존 로그(백업 포함) 삭제
-for f in glob.glob(os.path.join(LOG_DIR, 'error.log*')):
+# 엔진 프로세스(engine_host)는 engine.log 에 따로 기록
+LOG_NAME = os.getenv('MINIDSP_LOG_NAME', 'error')
+
+# ① 직전 실행 로그는 error.prev.log 로 보존하고 나머지(백업 포함) 삭제
+if os.path.exists(os.path.join(LOG_DIR, f'{LOG_NAME}.log')):
+    os.replace(os.path.join(LOG_DIR, f'{LOG_NAME}.log'), os.path.join(LOG_DIR, f'{LOG_NAME}.prev.log'))
+for f in glob.glob(os.path.join(LOG_DIR, f'{LOG_NAME}.log*')):
     os.remove(f)
 
 # 파일 핸들러 (회전 로테이션)
 fh = RotatingFileHandler(
-    os.path.join(LOG_DIR, 'error.log'),
+    os.path.join(LOG_DIR, f'{LOG_NAME}.log'),
     mode='w',                           # 매번 파일을 덮어쓰기
     maxBytes=5*1024*1024,
     backupCount=3
@@ -68,6 +83,26 @@ def log_exceptions(func):
             raise
     return wrapper
 
+# ─── 기기 엔진 위치 (--engine process 면 engine_host.EngineClient)
+_engine = None
+
+def _routed(func):
+    """엔진이 별도 프로세스면 같은 이름의 함수를 그쪽에서 실행하고 결과를 반환"""
+    name = func.__name__
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if _engine is not None:
+            return _engine.call(name, *args)
+        return func(*args, **kwargs)
+    return wrapper
+
+# 엔진 프로세스에서 _executor 를 거치지 않고 바로 실행하는 조회 함수 / 상태만 바꾸는 설정 함수
+# (설정 함수가 HID I/O 뒤에 줄 서면 GUI 스레드가 클릭마다 최대 CALL_TIMEOUT 동안 멈춤)
+ENGINE_DIRECT = {"get_write_stats", "get_rtt_stats", "get_poll_stats", "reset_poll_stats",
+                 "get_swap_stats", "set_tracing", "get_trace_spans", "get_caps", "get_report_stats",
+                 "start_profiler",
+                 "set_poll_interval", "set_step_curve", "enable_acceleration", "pause_hotkeys"}
+
 # ─── ctypes.wintypes enhancement 
 if not hasattr(wt, 'ULONG_PTR'):
     wt.ULONG_PTR = ctypes.c_ulonglong if ctypes.sizeof(ctypes.c_void_p)==8 else wt.DWORD
@@ -75,8 +110,8 @@ if not hasattr(wt, 'LRESULT'):
     wt.LRESULT = ctypes.c_longlong if ctypes.sizeof(ctypes.c_void_p)==8 else ctypes.c_long
 
 # ─── Device Discovery 
-VIDS = {0x2752, 0x04D8}         # minidsp 구형 기기 0x04D8
-PIDS = {0x0011, 0x0044, 0x003F} # 디락활성화 전/후
+SIMULATE = os.getenv('MINIDSP_SIM', '0') == '1'   # 실제 기기 대신 sim_device 사용
+VIDS, PIDS = protocol.VIDS, protocol.PIDS
 
 @log_exceptions
 def _find_miniDSP():
@@ -88,85 +123,649 @@ def _find_miniDSP():
 @log_exceptions
 def get_available_devices() -> list[dict]:
     """현재 연결된 모든 miniDSP 기기 정보(dict 리스트)를 반환"""
+    if SIMULATE:
+        from sim_device import SIM_INFO
+        return [SIM_INFO]
     return [
         d for d in hid.enumerate()
         if d['vendor_id'] in VIDS and d['product_id'] in PIDS
     ]
 
 @log_exceptions
-def set_device(path: str):
-    """새 경로(path)에 해당하는 HID 디바이스로 교체"""
-    global _dev, device_path
-    _dev.close()
-    _dev = hid.Device(path=path)
-    device_path = path
-    logger.info(f"Switched to device: {path}")
+def set_device(path: bytes) -> Future:
+    """
+    새 경로(path)에 해당하는 HID 디바이스로 교체를 예약 → Future (결과: I/O 중단 시간 s, 실패면 예외)
+    _executor 작업으로 실행: 앞선 명령은 모두 끝난 뒤 교체, 교체 중 들어온 명령은 뒤에 대기
+    호출한 스레드(GUI)는 기다리지 않음 - 완료는 Future 콜백으로
+    """
+    return _executor.submit(swap_device, path)
+
+@_routed
+@log_exceptions
+def swap_device(path: bytes) -> float:
+    """I/O 워커에서 실행 (set_device 가 예약): 기기 교체 → I/O 중단 시간(s)"""
+    global _dev, device_path, device_id, state, _shadow_gain, prev_db, prev_raw, _last_state
+    if path == device_path:
+        return 0.0
+    info = next((d for d in get_available_devices() if d['path'] == path), None)
+    new = hid.Device(path=path)             # 실패하면 예외 - 기존 기기는 그대로 사용
+    t0 = _perf()
+    # 폴링 스레드를 join (진행 중인 읽기 교환 하나가 끝날 때까지 - 최대 RTO 두 번)
+    was_polling = _poller.running
+    _poller.stop()
+    with _lock:
+        old = _dev
+        _device_ctx[device_path] = (state, _shadow_gain, prev_db, prev_raw, _last_state)
+        _dev, device_path = new, path
+        device_id = (info['vendor_id'] << 16) | info['product_id'] if info else 0
+        # 전에 쓰던 기기면 플래그/기준값을 그대로 복원 → 초기 읽기 없이 바로 재개
+        state, _shadow_gain, prev_db, prev_raw, _last_state = _device_ctx.get(
+            path, (VolumeState(), None, None, None, None))
+        _select_rtt()
+    if was_polling:
+        _poller.start()
+    down = _perf() - t0
+    _swap_time.add(down)
+    try:
+        old.close()
+    except Exception:
+        pass
+    _attach_mirror(info)
+    if _last_state is not None:
+        _notify_state(get_state())
+    logger.info("Switched to device: %s (I/O paused %.1f ms)", path, down * 1000)
+    return down
+
+_device_ctx = {}                      # 경로 → (VolumeState, shadow gain, prev_db, prev_raw, 마지막 상태)
+
+@_routed
+@log_exceptions
+def get_swap_stats() -> dict:
+    """기기 교체 시 I/O 가 멈춰 있던 시간"""
+    return dict(_swap_time.snapshot(), devices=len(_device_ctx) + 1)
 
-info = _find_miniDSP()
-device_path = info['path']            # info 로부터 경로 꺼내기
-_dev = hid.Device(path=info['path'])
+@log_exceptions
+def open_device(path=None):
+    """시작 시 호출: path(캐시된 마지막 기기)가 연결돼 있으면 그것, 아니면 첫 miniDSP"""
+    global _dev, device_path, device_id
+    if SIMULATE:
+        from sim_device import SimulatedDevice, SIM_INFO
+        _dev = SimulatedDevice(busy_exc=hid.HIDException, blocking=not _clock.virtual)
+        device_path = SIM_INFO['path']
+        device_id = (SIM_INFO['vendor_id'] << 16) | SIM_INFO['product_id']
+        _select_rtt()
+        _attach_mirror(SIM_INFO)
+        logger.info("Using simulated device")
+        return
+    devices = get_available_devices()
+    info = next((d for d in devices if d['path'] == path), None) if path else None
+    if info is None:
+        info = _find_miniDSP()
+    _dev = hid.Device(path=info['path'])
+    device_path = info['path']
+    device_id = (info['vendor_id'] << 16) | info['product_id']
+    _select_rtt()
+    _attach_mirror(info)
+
+    # ─── 시작 시 한 번만 남기는 컨텍스트 로깅
+    logger.info(
+        "App start",
+        extra={
+            "os": sys.platform,
+            "python": sys.version.replace('\n', ' '),
+            "device_path": device_path
+        }
+    )
+
+device_path = None
+device_id   = 0                       # (VID << 16) | PID
+_dev = None
 _lock = threading.Lock()
+_shadow_gain = None                   # 마지막으로 읽거나 쓴 gain (버스 왕복 없이 참조용)
+
+def set_clock(c):
+    """시간 소스 교체 (clock.VirtualClock 등) - 폴링 시작 전에 호출"""
+    global _clock
+    _clock = c
+    _write_guard.reset()
+    _write_guard._stamp = c.monotonic()
+
+# ─── USB I/O Helpers (프레임 형식은 protocol - minidsp_ctl 과 공유)
+PAD, _frame = protocol.PAD, protocol.frame
+
+class CircuitOpenError(RuntimeError):
+    """연속 쓰기 실패로 브레이커가 열린 상태 - 즉시 실패 (재연결 로직이 넘겨받음)"""
+
+class WriteGuard:
+    """
+    _safe_write 용 흐름 제어
+    • 토큰 버킷: 기기가 실제로 받아주는 속도(AIMD 로 추정)에 맞춰 쓰기 간격 조절
+    • 0x000003E5(장치 바쁨) 재시도: 지수 백오프 + full jitter
+    • 서킷 브레이커: 연속 실패 시 open → 일정 시간 후 half-open 1회 시도
+    """
+    BUSY = "0x000003E5"
+
+    def __init__(self, rate=100.0, burst=4, min_rate=5.0, max_rate=250.0,
+                 base_delay=0.004, max_delay=0.08, max_retries=4,
+                 fail_threshold=3, open_time=2.0):
+        self.rate, self.burst = rate, burst
+        self.min_rate, self.max_rate = min_rate, max_rate
+        self.base_delay, self.max_delay = base_delay, max_delay
+        self.max_retries = max_retries
+        self.fail_threshold, self.open_time = fail_threshold, open_time
+        self._tokens   = float(burst)
+        self._stamp    = _clock.monotonic()
+        self._fails    = 0              # 연속 실패 횟수
+        self._open_until = 0.0          # 0 이면 closed
+        self.stats = dict(writes=0, retries=0, busy=0, failures=0,
+                          breaker_opens=0, fast_fails=0)
+
+    @property
+    def state(self) -> str:
+        if not self._open_until:
+            return "closed"
+        return "open" if _clock.monotonic() < self._open_until else "half-open"
+
+    def acquire(self):
+        """쓰기 직전 호출: 브레이커 확인 후 토큰이 생길 때까지 대기"""
+        now = _clock.monotonic()
+        if self._open_until and now < self._open_until:
+            self.stats["fast_fails"] += 1
+            raise CircuitOpenError("miniDSP write circuit open")
+        self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+        if self._tokens < 1.0:
+            _clock.sleep((1.0 - self._tokens) / self.rate)
+            self._tokens = 1.0
+            self._stamp = _clock.monotonic()
+        self._tokens -= 1.0
+
+    def backoff(self, attempt: int):
+        """장치 바쁨: 속도 절반으로 낮추고 지수 백오프(jitter) 대기"""
+        self.stats["busy"] += 1
+        self.stats["retries"] += 1
+        self.rate = max(self.min_rate, self.rate * 0.5)
+        _clock.sleep(random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt))))
+
+    def success(self):
+        self.stats["writes"] += 1
+        self.rate = min(self.max_rate, self.rate + 2.0)
+        self._fails = 0
+        self._open_until = 0.0
+
+    def failure(self):
+        self.stats["failures"] += 1
+        self._fails += 1
+        if self._fails >= self.fail_threshold or self._open_until:
+            # half-open 시도가 실패해도 다시 open
+            self._open_until = _clock.monotonic() + self.open_time
+            self.stats["breaker_opens"] += 1
+            fr.record(fr.BREAKER, 1, self._fails)
+            logger.warning("Write circuit opened after %d failures", self._fails)
+
+    def reset(self):
+        self._fails = 0
+        self._open_until = 0.0
+
+    def set_max_rate(self, max_rate: float):
+        """기기 모델별 안전한 최대 쓰기 속도 - AIMD 는 이 안에서만 움직임"""
+        self.max_rate = max_rate
+        self.rate = min(self.rate, max_rate)
+
+    def snapshot(self) -> dict:
+        return dict(self.stats, state=self.state, rate=round(self.rate, 1), max_rate=self.max_rate)
+
+_write_guard = WriteGuard()
+
+class RttEstimator:
+    """
+    기기별 요청→응답 왕복 시간 추정 (TCP RTO 방식, RFC 6298)
+    • SRTT ← 7/8·SRTT + 1/8·R,  RTTVAR ← 3/4·RTTVAR + 1/4·|SRTT − R|
+    • RTO = SRTT + 4·RTTVAR (min/max 제한) - 읽기 데드라인
+    • 타임아웃 시 RTO 2배 (다음 정상 샘플에서 복구), 재시도 응답은 샘플에서 제외 (Karn)
+    """
+    ALPHA, BETA, K = 1 / 8, 1 / 4, 4
+
+    def __init__(self, initial=0.3, min_rto=0.03, max_rto=1.0, granularity=0.002):
+        self.min_rto, self.max_rto, self.granularity = min_rto, max_rto, granularity
+        self.srtt = None
+        self.rttvar = None
+        self.rto = initial
+        self.stats = dict(samples=0, timeouts=0, retries=0)
+
+    def sample(self, rtt: float):
+        if self.srtt is None:
+            self.srtt, self.rttvar = rtt, rtt / 2
+        else:
+            self.rttvar = (1 - self.BETA) * self.rttvar + self.BETA * abs(self.srtt - rtt)
+            self.srtt = (1 - self.ALPHA) * self.srtt + self.ALPHA * rtt
+        self.rto = min(self.max_rto, max(self.min_rto,
+                       self.srtt + max(self.granularity, self.K * self.rttvar)))
+        self.stats["samples"] += 1
+
+    def timeout(self):
+        self.stats["timeouts"] += 1
+        self.rto = min(self.max_rto, self.rto * 2)
+
+    @property
+    def slice_ms(self) -> int:
+        """read() 한 번의 대기 길이 - 데드라인의 1/4 (최소 1 ms)"""
+        return max(1, round(self.rto * 250))
+
+    @property
+    def flush_ms(self) -> int:
+        """남은 IN 리포트 플러시 대기 - 평소 왕복 시간이면 충분"""
+        return 5 if self.srtt is None else max(1, min(5, round(self.srtt * 1000)))
+
+    def snapshot(self) -> dict:
+        ms = lambda v: None if v is None else round(v * 1000, 2)
+        return dict(self.stats, srtt_ms=ms(self.srtt), rttvar_ms=ms(self.rttvar), rto_ms=ms(self.rto))
+
+_rtt_by_device = {}
+_rtt = RttEstimator()
+
+def _select_rtt():
+    """기기 교체 시 호출: 경로별 추정치를 유지"""
+    global _rtt
+    _rtt = _rtt_by_device.setdefault(device_path, RttEstimator())
+
+@_routed
+@log_exceptions
+def get_rtt_stats() -> dict:
+    """현재 기기의 SRTT/RTTVAR/RTO 와 타임아웃·재시도 횟수"""
+    return _rtt.snapshot()
 
-# ─── 시작 시 한 번만 남기는 컨텍스트 로깅
-logger.info(
-    "App start",
-    extra={
-        "os": sys.platform,
-        "python": sys.version.replace('\n', ' '),
-        "device_path": device_path
-    }
-)
-
-# ─── USB I/O Helpers
-CHK = lambda *b: sum(b) & 0xFF
-PAD = lambda p: b"\x00" + p.ljust(64, b"\xFF")
+class LatencyStats:
+    """지연/주기 누적 통계 (Welford) - 표준편차를 지터로 표시"""
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.n, self.mean, self._m2, self.max = 0, 0.0, 0.0, 0.0
+
+    def add(self, v: float):
+        self.n += 1
+        d = v - self.mean
+        self.mean += d / self.n
+        self._m2 += d * (v - self.mean)
+        self.max = max(self.max, v)
+
+    def snapshot(self) -> dict:
+        jitter = (self._m2 / (self.n - 1)) ** 0.5 if self.n > 1 else 0.0
+        return {"n": self.n, "mean_ms": round(self.mean * 1000, 2),
+                "jitter_ms": round(jitter * 1000, 2), "max_ms": round(self.max * 1000, 2)}
+
+def _exchange(req: bytes, match, code: int, addr: int = 0) -> bytes | None:
+    """
+    _lock 을 잡은 상태에서 호출: 요청을 보내고 match(r) 인 응답을 RTO 안에 기다림
+    타임아웃이면 (2배로 늘어난) RTO 로 한 번 더 시도, 그래도 없으면 None
+    """
+    est = _rtt
+    for attempt in range(2):
+        if attempt:
+            est.stats["retries"] += 1
+        _safe_write(req)
+        t0 = _clock.perf()
+        deadline = t0 + est.rto
+        slice_ms = est.slice_ms
+        while (left := deadline - _clock.perf()) > 0:
+            ms = max(1, min(slice_ms, int(left * 1000) + 1))
+            r = _dev.read(65, ms)
+            if not r:
+                _clock.blocked(ms / 1000)
+                continue
+            if r[0] == 0: r = r[1:]
+            if match(r):
+                if not attempt:
+                    est.sample(_clock.perf() - t0)
+                fr.record(fr.HID_RX, code, *fr.frame_words(bytes(r)))
+                return bytes(r)
+        est.timeout()
+        fr.record(fr.TIMEOUT, code, addr, attempt)
+    return None
+
+# ─── 응답 검증 (길이/체크섬/값 범위) - 거절된 프레임은 버리고 같은 _exchange 안에서 계속 기다림
+_report_stats = {"accepted": 0, protocol.BAD_LENGTH: 0, protocol.BAD_CHECKSUM: 0,
+                 protocol.BAD_VALUE: 0, "unconfirmed": 0}
+
+def _rejected(r: bytes, e: protocol.FrameError):
+    _report_stats[e.reason] += 1
+    logger.debug("Rejected report %s: %s", bytes(r[:8]).hex(" "), e)
+
+def _reply_match(code: int, addr: int, parse=protocol.check_frame):
+    """protocol.reply_match + 받아들인/거절한 프레임 수 집계 - _exchange 매처"""
+    match = protocol.reply_match(code, addr, parse, _rejected)
+    def counted(r):
+        if not match(r):
+            return False
+        _report_stats["accepted"] += 1
+        return True
+    return counted
+
+@_routed
+@log_exceptions
+def get_report_stats() -> dict:
+    """받아들인/거절한 응답 프레임 수와 확인 창에서 버린 리포트 수"""
+    return dict(_report_stats)
 
 @log_exceptions
-def _safe_write(data: bytes, retries: int=5, delay: float=0.02):
-    for _ in range(retries):
+def _safe_write(data: bytes):
+    """_lock 을 잡은 상태에서 호출 - 흐름 제어 + 바쁨 재시도 + 브레이커"""
+    _write_guard.acquire()
+    for attempt in range(_write_guard.max_retries + 1):
         try:
-            return _dev.write(data)
+            t = tracing.now()
+            n = _dev.write(data)
+            tracing.mark("usb.write", t)
+            fr.record(fr.HID_TX, attempt, *fr.frame_words(data))
         except hid.HIDException as e:
-            if "0x000003E5" in str(e):
-                time.sleep(delay)
+            if WriteGuard.BUSY in str(e) and attempt < _write_guard.max_retries:
+                _write_guard.backoff(attempt)
                 continue
+            _write_guard.failure()
             raise
-    return _dev.write(data)
+        _write_guard.success()
+        return n
+
+@_routed
+@log_exceptions
+def get_write_stats() -> dict:
+    """재시도/브레이커 카운터와 현재 쓰기 속도"""
+    return _write_guard.snapshot()
+
+@log_exceptions
+def _reopen_device() -> bool:
+    """
+    브레이커가 열렸을 때 폴링 루프가 호출: 같은 경로로 핸들 재생성
+    채널/상태 값은 미러에 남아 있으므로 재연결 후 버스로 다시 읽지 않음
+    """
+    global _dev
+    if SIMULATE:
+        _write_guard.reset()
+        return True
+    with _lock:
+        try:
+            _dev.close()
+        except Exception:
+            pass
+        try:
+            _dev = hid.Device(path=device_path)
+        except Exception as e:
+            logger.warning("Reconnect failed: %s", e)
+            fr.record(fr.RECONNECT, 0)
+            return False
+        _write_guard.reset()
+        fr.record(fr.RECONNECT, 1)
+    logger.info("Reconnected to device: %s", device_path)
+    return True
 
 @log_exceptions
 def _read_gain_raw():
-    """(dB, muted, raw_bytes) 반환"""
+    """(dB, muted, raw_bytes) 반환 - 상태 읽기가 없는 모델은 shadow 값 (raw 는 b"")"""
+    global _shadow_gain
+    if not _caps.supports(dc.READ_STATUS):
+        if _shadow_gain is None:
+            raise RuntimeError(f"{_caps.name}: gain is not readable")
+        return _shadow_gain, state.digital_muted, b""
     with _lock:
-        req = bytes([0x05,0x05,0xFF,0xDA,0x02, CHK(0x05,0x05,0xFF,0xDA,0x02)])
-        _dev.write(PAD(req))
-        t0 = time.time()
-        while time.time() - t0 < 0.3:
-            r = _dev.read(65, 50)
-            if not r: continue
-            if r[0] == 0: r = r[1:]
-            if bytes(r[:4]) == b"\x06\x05\xFF\xDA":
-                val   = r[4]
-                db    = -0.5 * val
-                muted = bool(r[5])
-                return db, muted, bytes(r)
-        raise RuntimeError("GAIN read timeout")
+        r = _exchange(protocol.memory_request(protocol.MASTER_GAIN, 2),
+                      _GAIN_REPLY, 0xDA)
+        if r is None:
+            raise RuntimeError("GAIN read timeout")
+        val, muted = protocol.parse_gain(r)
+        db    = protocol.raw_to_db(val)
+        _shadow_gain = db
+        _mirror.set_byte(protocol.MASTER_GAIN, val)
+        _mirror.set_byte(protocol.MASTER_GAIN + 1, int(muted))
+        return db, muted, r
+
+_GAIN_REPLY = _reply_match(0x05, protocol.MASTER_GAIN, protocol.parse_gain)
 
 @log_exceptions
+@tracing.traced("write_gain")
 def _write_gain(db: float):
+    global _shadow_gain
+    t = tracing.now()
     with _lock:
+        tracing.mark("lock.wait", t)
         # flush any pending IN
-        _dev.read(65, 5)
-        db = max(min(db, 0.0), -127.0)
-        val = int(round(-2*db))
-        cmd = bytes([0x03,0x42,val, CHK(0x03,0x42,val)])
-        _safe_write(PAD(cmd))
+        _dev.read(65, _rtt.flush_ms)
+        db = max(min(db, _caps.gain_max), _caps.gain_min)
+        db = round(db / _caps.gain_step) * _caps.gain_step     # 모델의 gain 그리드
+        _safe_write(protocol.gain_request(db))
+        val = protocol.db_to_raw(db)
+        _shadow_gain = protocol.raw_to_db(val)
+        _mirror.set_byte(protocol.MASTER_GAIN, val)
 
 @log_exceptions
+@tracing.traced("write_mute")
 def _write_mute(toggle: bool = True):
+    global _gain_before_mute
+    if _caps.mute == dc.MUTE_GAIN:
+        # 0x17 이 없는 모델: gain 을 바닥으로 내렸다가 이전 값으로 복원
+        if toggle:
+            _gain_before_mute = _shadow_gain
+            _write_gain(_caps.gain_min)
+        elif _gain_before_mute is not None:
+            _write_gain(_gain_before_mute)
+            _gain_before_mute = None
+        return
+    t = tracing.now()
+    with _lock:
+        tracing.mark("lock.wait", t)
+        _safe_write(protocol.mute_request(toggle))    # True: mute, False: unmute
+        _mirror.set_byte(protocol.MASTER_GAIN + 1, 0x01 if toggle else 0x00)
+
+_gain_before_mute = None              # MUTE_GAIN 모델에서 mute 직전 gain
+
+# ─── Output channels (float 레지스터: 0x14 읽기 / 0x13 0x80 쓰기)
+# (이름, gain 주소, mute 주소) - 2x4HD 출력 1~4 기준. mute 값은 1=mute, 2=unmute (int32)
+OUTPUT_CHANNELS = (
+    ("Out 1", 0x0030, 0x0034),
+    ("Out 2", 0x0031, 0x0035),
+    ("Out 3", 0x0032, 0x0036),
+    ("Out 4", 0x0033, 0x0037),
+)
+CH_GAIN_MIN, CH_GAIN_MAX = -72.0, 12.0
+_channel_cache = [[None, None] for _ in OUTPUT_CHANNELS]   # [gain, muted] 마지막 확인값
+
+def _write_reg_frame(addr: int, value: bytes) -> bytes:
+    return PAD(_frame(0x13, 0x80, addr >> 8, addr & 0xFF, *value))
+
+@log_exceptions
+def _read_words(addr: int, count: int) -> list[bytes]:
+    """연속 float 레지스터 count 개를 한 번에 읽음 (4바이트 LE 원시값 리스트)"""
+    with _lock:
+        r = _exchange(PAD(_frame(0x14, addr >> 8, addr & 0xFF, count)),
+                      _reply_match(0x14, addr), 0x14, addr)
+        if r is None:
+            raise RuntimeError("REGISTER read timeout")
+        return [r[4 + 4*i: 8 + 4*i] for i in range(count)]
+
+@log_exceptions
+def _write_frames(frames: list[bytes]):
+    """여러 프레임을 락 한 번 안에서 순서대로 - 간격은 WriteGuard 토큰 버킷이 조절"""
+    if not frames:
+        return
+    with _lock:
+        for f in frames:
+            _safe_write(f)
+
+@_routed
+@log_exceptions
+def read_channels() -> list[tuple[float, bool]]:
+    """출력 채널별 (gain dB, muted) - gain/mute 블록을 각각 한 번씩 읽음"""
+    if not _caps.supports(dc.READ_FLOAT):
+        raise RuntimeError(f"{_caps.name}: output channel registers are not readable")
+    n = len(OUTPUT_CHANNELS)
+    gains = _read_words(OUTPUT_CHANNELS[0][1], n)
+    mutes = _read_words(OUTPUT_CHANNELS[0][2], n)
+    out = []
+    for i in range(n):
+        g = round(struct.unpack("<f", gains[i])[0], 1)
+        m = struct.unpack("<i", mutes[i])[0] == 1
+        _channel_cache[i][:] = [g, m]
+        _mirror.set_word(OUTPUT_CHANNELS[i][1], gains[i])
+        _mirror.set_word(OUTPUT_CHANNELS[i][2], mutes[i])
+        out.append((g, m))
+    return out
+
+@_routed
+@log_exceptions
+def get_channels() -> list[tuple[float, bool]]:
+    """미러에 채널 값이 모두 있으면 버스 왕복 없이 반환, 아니면 read_channels()"""
+    if all(g is not None and m is not None for g, m in _channel_cache):
+        return [(g, m) for g, m in _channel_cache]
+    return read_channels()
+
+@_routed
+@log_exceptions
+def set_channels(changes: dict):
+    """
+    changes: {채널 index: (gain dB 또는 None, muted 또는 None)}
+    캐시와 같은 값은 건너뛰고 나머지를 하나의 배치로 전송
+    """
+    frames, updates = _channel_frames(changes)
+    _write_frames(frames)
+    _commit_channels(updates)
+    logger.debug("Channel batch: %d frame(s)", len(frames))
+
+def _channel_frames(changes: dict) -> tuple[list, list]:
+    """캐시 대비 달라진 채널 값만 프레임으로 (frames, 캐시 갱신 목록)"""
+    frames, updates = [], []
+    if not _caps.supports(dc.WRITE_FLOAT):
+        if changes:
+            logger.info("%s: output channel writes not supported - skipped", _caps.name)
+        return frames, updates
+    for i, (gain, muted) in sorted(changes.items()):
+        _, gain_addr, mute_addr = OUTPUT_CHANNELS[i]
+        cached = _channel_cache[i]
+        if gain is not None:
+            gain = max(min(round(float(gain) * 2) / 2, CH_GAIN_MAX), CH_GAIN_MIN)
+            if gain != cached[0]:
+                frames.append(_write_reg_frame(gain_addr, struct.pack("<f", gain)))
+                updates.append((i, 0, gain))
+        if muted is not None and bool(muted) != cached[1]:
+            frames.append(_write_reg_frame(mute_addr, struct.pack("<i", 1 if muted else 2)))
+            updates.append((i, 1, bool(muted)))
+    return frames, updates
+
+def _commit_channels(updates: list):
+    for i, k, v in updates:
+        _channel_cache[i][k] = v
+        if k == 0:
+            _mirror.set_word(OUTPUT_CHANNELS[i][1], struct.pack("<f", v))
+        else:
+            _mirror.set_word(OUTPUT_CHANNELS[i][2], struct.pack("<i", 1 if v else 2))
+
+# ─── Device mirror (읽기 가능한 설정/상태 레지스터 복제본 + 시리얼별 스냅샷)
+MIRROR_REGISTERS = (
+    [(dm.SPACE_MEM, dm.MASTER_STATUS + i) for i in range(4)]     # preset, source, volume, mute
+    + [(dm.SPACE_FLOAT, ch[k]) for k in (1, 2) for ch in OUTPUT_CHANNELS]
+)
+_mirror = dm.DeviceMirror(MIRROR_REGISTERS)
+
+@log_exceptions
+def _read_memory(addr: int, size: int) -> bytes:
+    """0x05 메모리 읽기: addr 부터 size 바이트"""
+    with _lock:
+        r = _exchange(protocol.memory_request(addr, size),
+                      _reply_match(0x05, addr), 0x05, addr)
+        if r is None:
+            raise RuntimeError("MEMORY read timeout")
+        return r[4:4 + size]
+
+def _attach_mirror(info: dict | None):
+    """기기 시리얼별 스냅샷을 열고 채널 캐시/shadow gain 을 미러 값으로 채움"""
+    global _shadow_gain
+    serial = (info or {}).get('serial_number') or f"{device_id:08X}"
+    need_probe = _select_caps(info, serial)
+    try:
+        _mirror.attach(CACHE_DIR, serial)
+    except OSError as e:
+        logger.warning("Mirror snapshot unavailable: %s", e)
+    for i, (_, gain_addr, mute_addr) in enumerate(OUTPUT_CHANNELS):
+        g, m = _mirror.get_float(gain_addr), _mirror.get_int(mute_addr)
+        _channel_cache[i][:] = [None if g is None else round(g, 1),
+                                None if m is None else m == 1]
+    vol = _mirror.get_byte(dm.MASTER_STATUS + 2)
+    if _shadow_gain is None and vol is not None:
+        _shadow_gain = protocol.raw_to_db(vol)
+    if need_probe:
+        _executor.submit(_probe_caps, device_path, info, serial)
+    _executor.submit(sync_mirror)
+
+# ─── 모델별 기능 프로파일 (device_caps)
+_caps = dc.HD                         # 현재 기기 프로파일 - 읽기/쓰기 경로가 참조
+
+def _device_key(info: dict | None) -> tuple[int, int, int]:
+    return device_id >> 16, device_id & 0xFFFF, int((info or {}).get('release_number') or 0)
+
+def _select_caps(info: dict | None, serial: str) -> bool:
+    """레지스트리 → 시리얼별 프로브 캐시 순으로 프로파일 선택, 둘 다 없으면 True (프로브 필요)"""
+    global _caps
+    vid, pid, fw = _device_key(info)
+    prof = dc.lookup(vid, pid, fw) or dc.load_probe(CACHE_DIR, serial, vid, pid, fw)
+    _caps = prof or dc.UNKNOWN
+    _write_guard.set_max_rate(_caps.max_write_rate)
+    logger.info("Device profile: %s (%04X:%04X fw %04X)", _caps.name, vid, pid, fw)
+    return prof is None
+
+def _probe_read(frame: bytes, match, code: int, addr: int) -> bool:
     with _lock:
-        b = 0x01 if toggle else 0x00  # True:0x01 (mute), False:0x00 (unmute)
-        cmd = bytes([0x03, 0x17, b, CHK(0x03, 0x17, b)])
-        _safe_write(PAD(cmd))
+        try:
+            return _exchange(PAD(frame), match, code, addr) is not None
+        except hid.HIDException:
+            return False
+
+def _probe_caps(path, info: dict | None, serial: str):
+    """_executor 에서 한 번: 읽기 전용 요청으로 지원 레지스터 확인 → 시리얼별 캐시에 저장"""
+    global _caps
+    if path != device_path:                 # 그 사이 다른 기기로 교체됨
+        return
+    vid, pid, fw = _device_key(info)
+    st = dm.MASTER_STATUS
+    reads = set()
+    if _probe_read(_frame(0x05, st >> 8, st & 0xFF, 4),
+                   _reply_match(0x05, st), 0x05, st):
+        reads.add(dc.READ_STATUS)
+    addr = OUTPUT_CHANNELS[0][1]
+    if _probe_read(_frame(0x14, addr >> 8, addr & 0xFF, 1),
+                   _reply_match(0x14, addr), 0x14, addr):
+        reads |= {dc.READ_FLOAT, dc.WRITE_FLOAT}
+    prof = dc.UNKNOWN.replace(name=f"miniDSP {vid:04X}:{pid:04X}", reads=reads, probed=True)
+    _caps = prof
+    try:
+        dc.save_probe(CACHE_DIR, serial, vid, pid, fw, prof)
+    except OSError as e:
+        logger.warning("Probe result not cached: %s", e)
+    logger.info("Probed %s: %s", serial, prof)
+
+@_routed
+@log_exceptions
+def get_caps() -> dict:
+    """현재 기기의 기능 프로파일"""
+    return _caps.to_dict()
+
+@_routed
+@log_exceptions
+def sync_mirror() -> bool:
+    """
+    한 번의 일괄 패스로 미러 전체를 갱신 (마스터 상태 블록 + 채널 gain/mute 블록)
+    요청 간격은 _safe_write 의 WriteGuard 가 조절 - _executor 에서 한 작업으로 실행
+    """
+    if _caps.supports(dc.READ_STATUS):
+        status = _read_memory(dm.MASTER_STATUS, 4)
+        for i, b in enumerate(status):
+            _mirror.set_byte(dm.MASTER_STATUS + i, b)
+    if _caps.supports(dc.READ_FLOAT):
+        read_channels()
+    _mirror.flush()
+    logger.debug("Mirror synced (%d registers)", len(MIRROR_REGISTERS))
+    return _mirror.complete
+
+def get_mirror() -> dm.DeviceMirror:
+    return _mirror
 
 class Event(Enum):
     KB_VOL         = auto()
@@ -217,9 +816,11 @@ class VolumeState:
             _write_mute(toggle=False)
         self.digital_muted = False
 
+    @tracing.traced("show_osd")
     @log_exceptions
     def show_osd(self, val):
         """OSD 콜백 호출 (val이 'MUTE'일 수도 있음)"""
+        tracing.handoff()
         _gain_cb(val)
 
     @log_exceptions
@@ -307,9 +908,14 @@ class VolumeState:
         self.show_osd(self.saved_gain)  # 12번: 저장된 볼륨정보만 OSD에 보여주기
         self._skip_save_only = True
 
+    @tracing.traced("handle_event")
     @log_exceptions
     def handle_event(self, event, payload=None):
         logger.debug("Handling event %s (payload=%s)", event.name, payload)
+        fr.record(fr.STATE, event.value,
+                  self.keyboard_muted | (self.digital_muted << 1),
+                  self._ignore_poll_count,
+                  payload if isinstance(payload, (int, float)) else 0.0)
 
         # ─── 분기용 상태 결정
         if event in (Event.KB_VOL, Event.KB_MUTE_TOGGLE):
@@ -365,15 +971,15 @@ class VolumeState:
 
 # ─── _poll_loop
 @log_exceptions
-def _poll_loop(interval: float):
-    global prev_db, prev_raw
+def _poll_loop(poller):
+    global prev_db, prev_raw, _warm_start
 
-    logger.info("Poll loop started (interval=%.1f s)", interval)
+    logger.info("Poll loop started (interval=%.3f s)", poller.interval)
 
     # ─── 1) 남은 IN 리포트 완전 플러시
     while True:
         try:
-            buf = _dev.read(65, 5)
+            buf = _dev.read(65, _rtt.flush_ms)
         except Exception:
             logger.debug("Flushed pending IN reports: exception on read")
             break
@@ -381,47 +987,102 @@ def _poll_loop(interval: float):
             logger.debug("No pending IN reports (buffer empty)")
             break
 
+    # ─── 2') 캐시나 직전 실행의 유효 상태가 있으면 즉시 시작 - 첫 실측치는 메인 루프에서 조용히 동기화
+    reconcile = prev_db is not None
+    if reconcile and _warm_start:
+        logger.info("Warm start from cache: %.1f dB (saved_gain=%s)", prev_db, state.saved_gain)
+        state.show_osd(prev_db)
+        _warm_start = False
+    elif reconcile:
+        logger.info("Resuming poll from %.1f dB", prev_db)
+
     # ─── 2) 짧게 대기 후 안정된 첫 “유효치” 대기
-    time.sleep(interval)
-    while True:
+    while not reconcile:
+        if poller.pause():
+            return
+        if not _caps.supports(dc.READ_STATUS):
+            logger.info("%s has no status reads - polling stopped", _caps.name)
+            return
         try:
             db, dig, raw = _read_gain_raw()
+        except (CircuitOpenError, hid.HIDException) as e:
+            logger.warning("Device unavailable (%s) - reconnecting", e)
+            if _clock.wait(poller.stopping, _write_guard.open_time):
+                return
+            _reopen_device()
+            continue
         except RuntimeError as e:
             logging.warning("Initial GAIN read timeout: %s", e)
-            time.sleep(interval)
-            continue
-
-        if db == 0.0:
-            # (DEBUG) 노이즈 판정: 0.0 dB
-            logger.debug("Skipped noise report: db=0.0 dB")
-            time.sleep(interval)
             continue
 
         logger.debug("Initial valid gain read: %.1f dB (raw=%s)", db, raw)
-        break
 
-    # ─── 3) 첫 유효치를 initial 값으로 설정하고 OSD 표시
-    prev_db = db
-    prev_raw = raw
-    state.saved_gain = db
-    logging.info("Setting initial saved_gain = %.1f dB", db)
-    state.show_osd(db)
+        # ─── 3) 첫 유효치를 initial 값으로 설정하고 OSD 표시
+        prev_db = db
+        prev_raw = raw
+        state.saved_gain = db
+        state.digital_muted = bool(dig)     # 기동 시 이미 뮤트 상태여도 토글 이벤트로 보지 않음
+        logging.info("Setting initial saved_gain = %.1f dB", db)
+        _publish_state(db, dig)
+        state.show_osd(db)
+        break
 
     # ─── 4) 본격 폴링 루프
-    while not _stop_poll.is_set():
-        time.sleep(interval)
+    last = None
+    pending = None                      # 확인 창: 아직 이벤트로 내보내지 않은 (db, dig)
+    while not poller.pause():
+        if not _caps.supports(dc.READ_STATUS):      # 프로브 결과가 늦게 도착한 경우
+            logger.info("%s has no status reads - polling stopped", _caps.name)
+            break
+        now = _clock.perf()
+        if last is not None:
+            _poll_period.add(now - last)
+        last = now
         try:
             db, dig, raw = _read_gain_raw()
+        except (CircuitOpenError, hid.HIDException) as e:
+            # 기기가 응답하지 않음: 브레이커 시간만큼 쉬고 핸들 재생성
+            logger.warning("Device unavailable (%s) - reconnecting", e)
+            if _clock.wait(poller.stopping, _write_guard.open_time):
+                break
+            _reopen_device()
+            continue
         except RuntimeError as e:
             logger.warning("Initial GAIN read timeout: %s", e)
             continue
         except Exception as e:
             logger.info("Exiting poll loop: %s", e)
+            fr.record(fr.ERROR, 1)
             break
 
-        # 노이즈로 간주되는 0.0 dB 리포트 건너뛰기
-        if db == 0.0:
-            logger.debug("Skipped noise report (0.0 dB)")
+        # 확인 창: 큰 gain 점프나 뮤트 변화는 다음 읽기에서 다시 보일 때만 반영 (한 주기 지연)
+        # 웜 스타트 동기화나 내부 명령 직후(ignore)는 제외
+        if not reconcile and state._ignore_poll_count == 0 and _needs_confirm(db, dig):
+            if pending is None or not _confirms(pending, db, dig):
+                if pending is not None:
+                    _report_stats["unconfirmed"] += 1
+                logger.debug("Pending confirmation: %.1f dB -> %.1f dB (dig=%s)", prev_db, db, dig)
+                pending = (db, bool(dig))
+                continue
+        elif pending is not None:
+            _report_stats["unconfirmed"] += 1
+            logger.debug("Dropped unconfirmed report: %.1f dB (dig=%s)", *pending)
+        pending = None
+
+        # 외부 구독자(HTTP/SSE 등)에게 실제 변화만 전달
+        _publish_state(db, dig)
+
+        # 웜 스타트 후 첫 실측치: 이벤트 없이 캐시값을 실제 상태로 교체
+        if reconcile:
+            reconcile = False
+            state.keyboard_muted = (db <= MUTE_THRESHOLD)
+            state.digital_muted  = bool(dig)
+            if not state.keyboard_muted and not state.digital_muted:
+                state.saved_gain = db
+            if db != prev_db:
+                logger.info("Reconciled cached gain %.1f dB -> %.1f dB", prev_db, db)
+                state.show_osd(db)
+            prev_db, prev_raw = db, raw
             continue
 
         # 내부 명령으로 인한 변화는 무시
@@ -449,12 +1110,14 @@ def _poll_loop(interval: float):
             # prev_raw, raw 를 포맷 문자열에 넣어 줍니다
         if toggled:
             logger.info("RC_MUTE_TOGGLE event: prev_raw=%s -> raw=%s", prev_raw, raw)
+            tracing.begin()
             state.handle_event(Event.RC_MUTE_TOGGLE)
 
         elif db != prev_db:
             logger.info("RC_VOL event: %.1f dB -> %.1f dB", prev_db, db)
             # “이전” keyboard/digital mute 상태를 handle_event에 전달
             state.prev_kb, state.prev_dig = old_kb, old_dig
+            tracing.begin()
             state.handle_event(Event.RC_VOL, db)
 
         # 다음 사이클을 위해 저장
@@ -462,18 +1125,124 @@ def _poll_loop(interval: float):
         prev_raw = raw
         logger.debug("Updated prev_db=%.1f, prev_raw=%s", prev_db, prev_raw)
 
+RC_CONFIRM_DB = 3.0                   # 이보다 큰 gain 점프는 다음 읽기로 확인
+
+def _needs_confirm(db: float, dig) -> bool:
+    return bool(dig) != state.digital_muted or abs(db - prev_db) > RC_CONFIRM_DB
+
+def _confirms(pending: tuple, db: float, dig) -> bool:
+    """두 번째 읽기가 후보와 같은 뮤트 상태, 가까운 gain 이면 확인 (리모컨을 누르고 있는 중에도)"""
+    return pending[1] == bool(dig) and abs(db - pending[0]) <= RC_CONFIRM_DB
+
+class Poller:
+    """
+    폴링 스레드 하나를 감독
+    • start()/stop() 은 멱등 - stop 은 스레드가 끝날 때까지 join
+    • interval 은 실행 중에 바꿀 수 있음 (스레드 재시작 없이 대기 중인 주기부터 적용)
+    • 다시 시작할 때 유효한 상태가 있으면 초기 읽기 단계를 건너뜀 (_poll_loop)
+    """
+    THREAD_NAME = "minidsp-poll"
+
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self.starts = 0
+        self.stopping = threading.Event()
+        self._wake = threading.Event()
+        self._lock = threading.RLock()
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def pause(self) -> bool:
+        """폴링 스레드에서 호출: 한 주기 대기 - 멈춰야 하면 True"""
+        _clock.wait(self._wake, self.interval)
+        self._wake.clear()
+        return self.stopping.is_set()
+
+    def set_interval(self, interval: float):
+        self.interval = float(interval)
+        self._wake.set()
+
+    def start(self, interval: float | None = None) -> bool:
+        with self._lock:
+            if interval is not None:
+                self.set_interval(interval)
+            if self.running:
+                if not self.stopping.is_set():
+                    return False
+                self._thread.join()         # 멈추는 중인 이전 스레드가 끝난 뒤 새로 시작
+            self.stopping.clear()
+            self._wake.clear()
+            _poll_period.reset()
+            self._thread = threading.Thread(target=_poll_loop, args=(self,),
+                                            name=self.THREAD_NAME, daemon=True)
+            self._thread.start()
+            self.starts += 1
+            return True
+
+    def stop(self, timeout: float = 2.0):
+        with self._lock:
+            t = self._thread
+            if t is None:
+                return
+            self.stopping.set()
+            self._wake.set()
+            if t is not threading.current_thread():
+                t.join(timeout)
+            if t.is_alive():
+                logger.warning("Poll thread still busy after %.1f s", timeout)
+            else:
+                self._thread = None
+
+    def restart(self):
+        with self._lock:
+            self.stop()
+            self.start()
+
+_poll_period = LatencyStats()         # 실제 폴링 주기 (간격 + 읽기 시간)
+_swap_time   = LatencyStats()         # set_device 의 I/O 중단 시간
+_poller = Poller()
+
+@_routed
 @log_exceptions
 def start_polling(interval: float):
-    """프로그램 시작 시 호출: 백그라운드 폴링 스레드를 띄웁니다."""
-    _stop_poll.clear()
-    thread = threading.Thread(target=_poll_loop, args=(interval,), daemon=True)
-    thread.start()
-    return thread
+    """폴링 시작 (이미 돌고 있으면 간격만 바꿈)"""
+    _poller.start(interval)
+
+@_routed
+@log_exceptions
+def set_poll_interval(interval: float):
+    """폴링 간격 변경 - 스레드는 그대로"""
+    _poller.set_interval(interval)
+    logger.info("Polling interval changed to %.3f s", interval)
+
+@_routed
+@log_exceptions
+def restart_polling():
+    """기기 교체 후 호출: 이전 스레드를 join 하고 새로 시작 (상태가 있으면 초기 읽기 생략)"""
+    _poller.restart()
 
+@_routed
+@log_exceptions
+def get_poll_stats() -> dict:
+    pollers = sum(t.name == Poller.THREAD_NAME for t in threading.enumerate())
+    return dict(_poll_period.snapshot(), interval=_poller.interval,
+                threads=pollers, starts=_poller.starts)
+
+@_routed
+@log_exceptions
+def reset_poll_stats():
+    _poll_period.reset()
+    for k in _report_stats:
+        _report_stats[k] = 0
+
+@_routed
 @log_exceptions
 def stop_polling():
-    """프로그램 종료 시 호출: 스레드를 멈추라고 신호를 보냅니다."""
-    _stop_poll.set()
+    """프로그램 종료 시 호출: 폴링 스레드를 멈추고 끝날 때까지 기다립니다."""
+    _poller.stop()
 
 # ─── State & Callbacks
 _paused      = False
@@ -484,32 +1253,243 @@ _shift_enabled = True
 prev_db = None
 prev_raw = None
 prev_dig = None
-WHEEL_DELTA   = 120    # Windows 1 노치 기본 델타
-STEP_DB       = 0.5    # 한 노치당 볼륨 변화량(dB)
-_accumulated  = 0      # 부분 델타 누적값
-_stop_poll = threading.Event()
+STEP_DB       = 0.5    # 한 노치당 볼륨 변화량(dB) - 기기 그리드
+
+# ─── Step curves: (구간 시작 dB, 구간 내 1노치 스텝 dB) - 낮은 볼륨은 크게, 0 dB 근처는 촘촘히
+STEP_CURVES = {
+    "fine":     [(-127.0, 0.5)],
+    "adaptive": [(-127.0, 3.0), (-60.0, 2.0), (-40.0, 1.0), (-20.0, 0.5)],
+    "coarse":   [(-127.0, 5.0), (-60.0, 3.0), (-30.0, 1.5), (-10.0, 0.5)],
+}
+# 가속: 같은 방향 이벤트가 ACCEL_WINDOW 안에 연속되면 streak 증가 → 배수 테이블 참조
+ACCEL_WINDOW = 0.15
+ACCEL_TABLE  = (1, 1, 2, 2, 3, 4, 6)
+
+def _build_step_table(curve) -> tuple:
+    """0.5 dB 그리드(인덱스 0=0 dB … 254=-127 dB)별 1노치 스텝을 미리 계산"""
+    table = []
+    for idx in range(255):
+        db = -STEP_DB * idx
+        step_db = curve[0][1]
+        for start, size in curve:
+            if db >= start:
+                step_db = size
+        table.append(step_db)
+    return tuple(table)
+
+_STEP_TABLES = {name: _build_step_table(c) for name, c in STEP_CURVES.items()}
+_step_table  = _STEP_TABLES["fine"]
+_accel_enabled = False
+_accel_last  = (0, 0.0)   # (방향, 마지막 이벤트 시각)
+_accel_streak = 0
 state = VolumeState()
 
 @log_exceptions
 def set_gain_callback(fn):
     global _gain_cb; _gain_cb = fn
 
+# ─── State listeners (폴링 루프가 감지한 변화를 외부로 전달)
+_state_listeners = []
+_last_state      = None   # 마지막으로 발행한 (db, dig)
+
+@log_exceptions
+def add_state_listener(fn):
+    """fn(snapshot: dict) - 폴링 스레드에서 호출되므로 짧게 끝내야 함"""
+    if fn not in _state_listeners:
+        _state_listeners.append(fn)
+
+@log_exceptions
+def remove_state_listener(fn):
+    if fn in _state_listeners:
+        _state_listeners.remove(fn)
+
+@log_exceptions
+def get_state() -> dict:
+    """마지막 폴링 결과 + 내부 플래그 스냅샷"""
+    if _engine is not None:
+        return _engine.snapshot()
+    db, dig = _last_state if _last_state else (None, False)
+    return {
+        "gain":           db,
+        "keyboard_muted": state.keyboard_muted,
+        "digital_muted":  bool(dig),
+        "saved_gain":     state.saved_gain,
+        "paused":         _paused,
+        "device_path":    device_path.decode(errors='replace') if isinstance(device_path, bytes) else device_path,
+        "device_id":      device_id,
+    }
+
+@log_exceptions
+def _publish_state(db: float, dig) -> None:
+    global _last_state
+    cur = (db, bool(dig))
+    if cur == _last_state:
+        return
+    _last_state = cur
+    _notify_state(get_state())
+    _schedule_cache_save()
+
+def _notify_state(snap: dict):
+    for fn in list(_state_listeners):
+        try:
+            fn(snap)
+        except Exception:
+            logger.exception("State listener %r failed", fn)
+
+# ─── Shared-memory export (다른 프로세스가 IPC 없이 읽는 최신 스냅샷)
+_shm_writer = None
+
+@log_exceptions
+def start_shared_state():
+    global _shm_writer
+    if _shm_writer is not None:
+        return
+    from shared_state import StateWriter
+    _shm_writer = StateWriter()
+    if _last_state is not None:
+        _shm_writer.publish(get_state())
+    add_state_listener(_shm_writer.publish)
+
+@log_exceptions
+def stop_shared_state():
+    global _shm_writer
+    if _shm_writer is None:
+        return
+    remove_state_listener(_shm_writer.publish)
+    _shm_writer.close()
+    _shm_writer = None
+
+# ─── Tracing (입력 → HID write → OSD 구간 기록, Chrome trace 로 내보내기)
+@log_exceptions
+def set_tracing(flag: bool):
+    tracing.enable(flag)
+    if _engine is not None:
+        _engine.call("set_tracing", bool(flag))
+
+@_routed
+def get_trace_spans() -> tuple[int, list]:
+    """(span 을 기록한 프로세스 pid, span 목록) - 엔진 모드에서는 엔진 자식 프로세스 쪽"""
+    return os.getpid(), tracing.spans()
+
+@log_exceptions
+def export_trace(path: str) -> int:
+    """span 버퍼를 Chrome trace-event JSON 으로 저장 (엔진 프로세스 span 포함) → 이벤트 수"""
+    if _engine is None:
+        return tracing.export_chrome(path)
+    pid, spans = get_trace_spans()
+    return tracing.export_chrome(path, spans, pid)
+
+# ─── 샘플링 프로파일러 (profiler)
+@_routed
+@log_exceptions
+def start_profiler(seconds: float, tag: str = "") -> str:
+    """seconds 동안 (엔진이 있는 프로세스의) 모든 스레드를 샘플링 → LOG_DIR 에 저장될 경로 (확장자 제외)"""
+    return profiler.start(seconds, LOG_DIR, tag)
+
+@log_exceptions
+def profile(seconds: float) -> list[str]:
+    """이 프로세스(GUI/훅/폴링/I/O)를, 엔진이 별도 프로세스면 그쪽도 함께 프로파일 → 경로들"""
+    if _engine is None:
+        return [start_profiler(seconds)]
+    return [profiler.start(seconds, LOG_DIR, "gui"), start_profiler(seconds, "engine")]
+
+# ─── Out-of-process engine (GUI 프로세스 쪽)
+@log_exceptions
+def start_engine(path=None, interval: float = 0.1) -> bool:
+    """기기 엔진을 별도 프로세스로 시작 - 이후 @_routed 호출은 그쪽에서 실행"""
+    global _engine
+    from engine_host import EngineClient
+    curve = next(n for n, t in _STEP_TABLES.items() if t is _step_table)
+    # 엔진 시작 전에 GUI 쪽에서 설정된 값을 첫 연결 때 재생
+    replay = {"set_scenes": (_scenes,), "set_step_curve": (curve,),
+              "enable_acceleration": (_accel_enabled,), "pause_hotkeys": (_paused,),
+              "set_tracing": (tracing.enabled,)}
+    _engine = EngineClient(path, interval, on_gain=lambda v: _gain_cb(v),
+                           on_state=_notify_state, replay=replay)
+    return _engine.start()
+
+@log_exceptions
+def stop_engine():
+    global _engine
+    engine, _engine = _engine, None
+    if engine is not None:
+        engine.stop()
+
+def engine_mode() -> str:
+    return "in-process" if _engine is None else f"out-of-process (restarts={_engine.restarts})"
+
+# ─── Warm-start state cache (마지막 기기/게인/뮤트/saved_gain)
+CACHE_DIR   = os.path.join(BASE_DIR, 'cache')
+STATE_CACHE = os.path.join(CACHE_DIR, 'state.json')
+CACHE_SAVE_DELAY = 1.0        # 연속 변화는 묶어서 한 번만 저장 (s)
+_warm_start = False
+_cache_timer = None
+
+@log_exceptions
+def load_state_cache():
+    """시작 시 호출: 캐시를 VolumeState/폴링 기준값에 반영하고 마지막 기기 경로를 반환"""
+    global _warm_start, prev_db, _shadow_gain, _last_state
+    try:
+        with open(STATE_CACHE, encoding='utf-8') as f:
+            data = json.load(f)
+        gain = float(data['gain'])
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.info("No usable state cache: %s", e)
+        return None
+    state.keyboard_muted = bool(data.get('keyboard_muted', False))
+    state.digital_muted  = bool(data.get('digital_muted', False))
+    state.saved_gain     = data.get('saved_gain', gain)
+    prev_db = _shadow_gain = gain
+    _last_state = (gain, state.digital_muted)
+    _warm_start = True
+    path = data.get('device_path')
+    return path.encode() if path else None
+
+@log_exceptions
+def save_state_cache():
+    """원자적 저장: 임시 파일에 쓴 뒤 os.replace"""
+    if _last_state is None:
+        return
+    snap = get_state()
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = STATE_CACHE + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({k: snap[k] for k in
+                   ('device_path', 'gain', 'keyboard_muted', 'digital_muted', 'saved_gain')}, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, STATE_CACHE)
+    _mirror.flush()
+
+def _schedule_cache_save():
+    global _cache_timer
+    if _cache_timer is not None and _cache_timer.is_alive():
+        return
+    _cache_timer = threading.Timer(CACHE_SAVE_DELAY, save_state_cache)
+    _cache_timer.daemon = True
+    _cache_timer.start()
+
 @log_exceptions
 def enable_media_keys(flag: bool):
     global _media_enabled; _media_enabled = bool(flag)
+    _compile_hotkeys()
 
 @log_exceptions
 def enable_alt_keys(flag: bool):
     global _alt_enabled; _alt_enabled = bool(flag)
+    _compile_hotkeys()
 
 @log_exceptions
 def enable_shift_keys(flag: bool):
     global _shift_enabled; _shift_enabled = bool(flag)
+    _compile_hotkeys()
 
+@_routed
 @log_exceptions
 def pause_hotkeys(flag: bool):
     global _paused; _paused = bool(flag)
 
+@_routed
 @log_exceptions
 def step(delta):
     # 일시정지 중이면 무시
@@ -518,6 +1498,61 @@ def step(delta):
     # 일시정지 중이면 아무 작업도 하지 않음
     state.handle_event(Event.KB_VOL, delta)
 
+@_routed
+@log_exceptions
+def set_step_curve(name: str):
+    global _step_table
+    _step_table = _STEP_TABLES[name]
+
+@_routed
+@log_exceptions
+def enable_acceleration(flag: bool):
+    global _accel_enabled; _accel_enabled = bool(flag)
+
+@log_exceptions
+def _notches_to_db(notches: int, t: float, start: float | None = None) -> float:
+    """노치 수 → dB 변화량 (스텝 테이블 + 이벤트 속도 가속). start 생략 시 shadow gain 기준"""
+    global _accel_last, _accel_streak
+    sign = 1 if notches > 0 else -1
+    last_sign, last_t = _accel_last
+    if _accel_enabled and sign == last_sign and t - last_t < ACCEL_WINDOW:
+        _accel_streak = min(_accel_streak + 1, len(ACCEL_TABLE) - 1)
+    else:
+        _accel_streak = 0
+    _accel_last = (sign, t)
+
+    count = abs(notches) * ACCEL_TABLE[_accel_streak]
+    if start is None:
+        start = _shadow_gain if _shadow_gain is not None else (state.saved_gain or -60.0)
+    level = start
+    for _ in range(count):
+        idx = min(max(int(round(-2 * level)), 0), 254)
+        level = max(min(level + sign * _step_table[idx], 0.0), -127.0)
+        if level in (0.0, -127.0):
+            break
+    return level - start
+
+@_routed
+@log_exceptions
+def step_notches(notches: int, t: float | None = None):
+    """핫키/휠 입력용: 노치 단위를 현재 스텝 커브/가속으로 변환해 step()"""
+    step_events([(notches, _perf() if t is None else t)])
+
+@_routed
+@log_exceptions
+def step_events(events: list):
+    """병합된 (notches, t) 묶음을 한 번의 step() 으로 - 가속은 이벤트마다 반영"""
+    if _paused or not events:
+        return
+    start = _shadow_gain if _shadow_gain is not None else (state.saved_gain or -60.0)
+    level = start
+    for notches, t in events:
+        if notches:
+            level += _notches_to_db(notches, t, level)
+    if level != start:
+        step(level - start)
+
+@_routed
 @log_exceptions
 def toggle_mute():
     # 일시정지 중이면 무시
@@ -526,21 +1561,144 @@ def toggle_mute():
     # 일시정지 중이면 아무 작업도 하지 않음
     state.handle_event(Event.KB_MUTE_TOGGLE)
 
+@_routed
+@log_exceptions
+def set_gain(db: float):
+    """절대 gain(dB) 지정 - 원격 제어용 (핫키 일시정지와 무관)"""
+    db = max(min(float(db), 0.0), -127.0)
+    if state.keyboard_muted or state.digital_muted:
+        state.saved_gain = db   # 음소거 해제 시 이 값으로 복원
+    state.handle_event(Event.KB_VOL, db - state.current_gain())
+
+@_routed
+@log_exceptions
+def set_mute(flag: bool | None):
+    """음소거 상태를 지정값으로 맞춤 (None 이면 토글) - 이미 같은 상태면 아무것도 안 함"""
+    muted = state.keyboard_muted or state.digital_muted
+    if flag is None or bool(flag) != muted:
+        state.handle_event(Event.KB_MUTE_TOGGLE)
+
+@_routed
+@log_exceptions
+def adjust_gain(delta: float):
+    """상대 gain 변경 - 원격 제어용 (핫키 일시정지와 무관)"""
+    state.handle_event(Event.KB_VOL, float(delta))
+
+# ─── Scenes (이름 있는 프리셋: 캐시된 기기 상태와 비교해 다른 레지스터만 전송)
+# scene = {"name": str, "gain": dB, "mute": bool, "channels": {index: [gain, muted]}, "fade": s}
+FADE_STEP_S = 0.03
+_scenes: list[dict] = []
+
+@log_exceptions
+def set_scenes(scenes: list[dict]):
+    """장면 목록 교체 - 앞의 9개는 Alt+1…9 에 바인딩"""
+    global _scenes
+    _scenes = list(scenes)
+    _compile_hotkeys()
+    if _engine is not None:                 # 바인딩 테이블은 여기, 장면 적용은 엔진 쪽
+        _engine.call("set_scenes", _scenes)
+
+@_routed
+@log_exceptions
+def capture_scene(name: str) -> dict:
+    """현재 기기 상태를 장면으로 (채널 캐시가 비었으면 한 번 읽음)"""
+    db, dig = _last_state if _last_state else (state.current_gain(), state.digital_muted)
+    if state.keyboard_muted and state.saved_gain is not None:
+        db = state.saved_gain
+    if _caps.supports(dc.READ_FLOAT) and any(c[0] is None for c in _channel_cache):
+        read_channels()
+    # 아직 모르는 채널(캐시에 None)은 빼고 저장 - 적용할 때 그 채널은 건드리지 않음
+    return {"name": name, "gain": db, "mute": bool(dig),
+            "channels": {i: list(c) for i, c in enumerate(_channel_cache) if None not in c},
+            "fade": 0.0}
+
+@_routed
+@log_exceptions
+def apply_scene(index: int):
+    """
+    장면 적용: 달라진 레지스터만 한 번의 순서 있는 배치로.
+    뮤트는 켤 때는 맨 앞, 끌 때는 맨 뒤 (중간 상태가 들리지 않도록).
+    적용 중엔 폴링 이벤트를 막고, OSD 는 끝난 뒤 한 번만 표시.
+    """
+    global _shadow_gain
+    if not 0 <= index < len(_scenes):
+        return
+    scene = _scenes[index]
+    logger.info("Applying scene %r", scene.get("name"))
+    cur_gain = _shadow_gain if _shadow_gain is not None else state.current_gain()
+    cur_mute = state.digital_muted
+    tgt_gain = scene.get("gain")
+    tgt_mute = scene.get("mute")
+    if _caps.mute != dc.MUTE_DIGITAL:
+        tgt_mute = None                     # 0x17 없는 모델 - 장면의 gain 만 적용
+    if tgt_gain is not None:
+        tgt_gain = max(min(round(float(tgt_gain) * 2) / 2, 0.0), -127.0)
+
+    ch_changes = {int(i): tuple(v) for i, v in (scene.get("channels") or {}).items()
+                  if int(i) < len(OUTPUT_CHANNELS)}
+    if (ch_changes and _caps.supports(dc.READ_FLOAT)
+            and any(_channel_cache[i][0] is None for i in ch_changes)):
+        read_channels()
+    ch_frames, ch_updates = _channel_frames(ch_changes)
+
+    frames = []
+    mute_on  = tgt_mute is True and not cur_mute
+    mute_off = tgt_mute is False and cur_mute
+    if mute_on:
+        frames.append(protocol.mute_request(True))
+    frames += ch_frames
+    fade_from = None
+    if tgt_gain is not None and tgt_gain != cur_gain:
+        frames.append(protocol.gain_request(tgt_gain))
+        fade_from = cur_gain
+    if mute_off:
+        frames.append(protocol.mute_request(False))
+
+    if not frames:
+        logger.debug("Scene %r already active", scene.get("name"))
+        return
+    with state.suspend_polling():
+        fade = float(scene.get("fade") or 0.0)
+        if fade > 0 and fade_from is not None and not mute_on and not cur_mute:
+            # 페이드: 중간 gain 만 개별 전송, 마지막 값은 아래 배치에 포함
+            n = max(1, int(fade / FADE_STEP_S))
+            for k in range(1, n):
+                _write_gain(fade_from + (tgt_gain - fade_from) * k / n)
+                _clock.sleep(FADE_STEP_S)
+        _write_frames(frames)
+        _commit_channels(ch_updates)
+        if tgt_gain is not None:
+            _shadow_gain = tgt_gain
+            state.saved_gain = tgt_gain
+            state.keyboard_muted = tgt_gain <= MUTE_THRESHOLD
+        if tgt_mute is not None:
+            state.digital_muted = bool(tgt_mute)
+    state.show_osd(-127.0 if state.digital_muted else (_shadow_gain if _shadow_gain is not None else cur_gain))
+
 # ─── Win32 Hooks
 user32 = ctypes.windll.user32
 WH_KEYBOARD_LL, WH_GETMESSAGE = 13, 3
 WM_KEYDOWN, WM_SYSKEYDOWN = 0x0100, 0x0104
 WM_APPCOMMAND = 0x0319
 
-VK_LALT = 0xA4
-VK_F10, VK_F11, VK_F12 = 0x79, 0x7A, 0x7B
-VK_VOL_MUTE, VK_VOL_DOWN, VK_VOL_UP = 0xAD, 0xAE, 0xAF
-APP_UP, APP_DOWN, APP_MUTE = 10, 9, 8
-
 WH_MOUSE_LL, WM_MOUSEWHEEL, WM_MOUSEHWHEEL, VK_SHIFT, WM_MBUTTONDOWN = 14, 0x020A, 0x020E, 0x10, 0x0207
 
 user32.CallNextHookEx.argtypes = [ctypes.c_void_p, ctypes.c_int, wt.WPARAM, wt.LPARAM]
 user32.CallNextHookEx.restype  = wt.LRESULT
+user32.GetAsyncKeyState.argtypes = [ctypes.c_int]
+user32.GetAsyncKeyState.restype  = ctypes.c_short
+
+_MOD_VKS = tuple(hotkeys.MOD_VKS.items())
+
+def _probe_mods() -> int:
+    """지금 실제로 눌린 수정키 비트마스크 (hook_ring 이 추적값과 다를 때 교정용)"""
+    mods = 0
+    for vk, bit in _MOD_VKS:
+        if user32.GetAsyncKeyState(vk) < 0:
+            mods |= bit
+    return mods
+
+hook_ring.set_mod_probe(_probe_mods)
 
 class MSLLHOOKSTRUCT(ctypes.Structure):
     _fields_ = [
@@ -560,55 +1718,110 @@ class KBDLLHOOKSTRUCT(ctypes.Structure):
         ('dwExtraInfo', wt.ULONG_PTR),
     ]
 
-_left_alt_down = False
-_hook_kb = hook_msg = None
+# ─── Hook → worker event ring
+# 훅 콜백은 구조체에서 필드만 꺼내 hook_ring.on_* 로 넘김 - 디코딩·링·병합은 hook_ring (Win32 무관)
+_perf = time.perf_counter
+# ─── 컴파일된 바인딩 테이블 (훅은 테이블 인덱싱만, enable 플래그·장면 수는 컴파일 시 반영)
+_bindings = list(hotkeys.DEFAULT_BINDINGS)
+_bind_table, _bind_actions = hotkeys.compile_bindings(_bindings)
+hook_ring.set_table(_bind_table)
+
+def _compile_hotkeys():
+    global _bind_table, _bind_actions
+    groups = [g for g, on in (("media", _media_enabled), ("alt", _alt_enabled),
+                              ("shift", _shift_enabled), ("custom", True)) if on]
+    table, actions = hotkeys.compile_bindings(_bindings, groups, len(_scenes))
+    _bind_actions = actions
+    _bind_table = table
+    hook_ring.set_table(table)        # 훅은 다음 이벤트부터 새 테이블 사용 (재설치 불필요)
+
+@log_exceptions
+def set_bindings(bindings: list[dict]):
+    """바인딩 교체 - 잘못된 항목이 있으면 ValueError 로 거부 (기존 테이블 유지)"""
+    global _bindings
+    groups = [g for g, on in (("media", _media_enabled), ("alt", _alt_enabled),
+                              ("shift", _shift_enabled), ("custom", True)) if on]
+    hotkeys.compile_bindings(bindings, groups, len(_scenes))   # 검증
+    _bindings = [dict(b) for b in bindings]
+    _compile_hotkeys()
+
+@log_exceptions
+def get_bindings() -> list[dict]:
+    return [dict(b) for b in _bindings]
+
+first_hotkey_t = None                 # 첫 핫키 처리 시각 (perf_counter) - 콜드 스타트 측정용
+
+@_routed
+@tracing.traced("run_ops")
+def _run_ops(ops):
+    for op, arg in ops:
+        if op == hook_ring.OP_VOL:
+            step_events(arg)
+        elif op == hook_ring.OP_STEP:
+            step(arg)
+        elif op == hook_ring.OP_MUTE:
+            toggle_mute()
+        elif op == hook_ring.OP_SCENE and not _paused:
+            apply_scene(arg - 1)
+
+def _hook_worker():
+    """링 소비자: 실행 중에 쌓인 이벤트는 다음 drain 에서 자동 병합"""
+    global first_hotkey_t
+    while not _hook_stop.is_set():
+        hook_ring.signal.wait()
+        hook_ring.signal.clear()
+        t0 = _perf()
+        oldest = hook_ring.oldest_t() if tracing.enabled else None
+        if oldest is not None:
+            tracing.begin("hook.queue", int(oldest * 1e9))
+        ops = hook_ring.drain(_bind_actions)
+        if ops:
+            try:
+                _executor.submit(tracing.bind(_run_ops), ops).result()
+            except Exception:
+                logger.exception("Hook worker batch failed")
+                continue
+            done = _perf()
+            _key_latency.add(done - t0)
+            if first_hotkey_t is None:
+                first_hotkey_t = done
+                logger.info("First hotkey handled")
+
+_hook_stop   = threading.Event()
+_hook_thread = None
+_key_latency = LatencyStats()         # 훅 워커 깨어남 → 기기 쓰기 완료
 
 @log_exceptions
+def get_hook_stats() -> dict:
+    return {**hook_ring.stats(),
+            **{f"key_{k}": v for k, v in _key_latency.snapshot().items()}}
+
+_hook_kb = _hook_msg = _hook_mouse = None
+
 def _kb_proc(nCode, wParam, lParam):
-    global _left_alt_down
     if nCode == 0:
-        k = ctypes.cast(lParam, ctypes.POINTER(KBDLLHOOKSTRUCT)).contents
-        vk = k.vkCode
-        if vk == VK_LALT:
-            _left_alt_down = (wParam in (WM_KEYDOWN, WM_SYSKEYDOWN))
-        elif _alt_enabled and _left_alt_down and wParam in (WM_KEYDOWN, WM_SYSKEYDOWN):
-            if   vk == VK_F11: _executor.submit(step, +0.5);   return 1
-            elif vk == VK_F10: _executor.submit(step, -0.5);    return 1
-            elif vk == VK_F12: _executor.submit(toggle_mute);   return 1
+        vk = KBDLLHOOKSTRUCT.from_address(lParam).vkCode & 0xFF
+        if hook_ring.on_key(vk, wParam == WM_KEYDOWN or wParam == WM_SYSKEYDOWN):
             return 1
-        if _media_enabled and wParam == WM_KEYDOWN:
-            if   vk == VK_VOL_UP:   _executor.submit(step, +0.5);   return 1
-            elif vk == VK_VOL_DOWN: _executor.submit(step, -0.5);    return 1
-            elif vk == VK_VOL_MUTE: _executor.submit(toggle_mute);   return 1
     return user32.CallNextHookEx(None, nCode, wParam, lParam)
 
-@log_exceptions
 def _msg_proc(nCode, wParam, lParam):
-    if nCode == 0 and _media_enabled:
-        msg = ctypes.cast(lParam, ctypes.POINTER(wt.MSG)).contents
-        if msg.message == WM_APPCOMMAND:
-            cmd = (msg.lParam >> 16) & 0xFFF
-            if   cmd == APP_UP:   _executor.submit(step, +0.5);   return 1
-            elif cmd == APP_DOWN: _executor.submit(step, -0.5);    return 1
-            elif cmd == APP_MUTE: _executor.submit(toggle_mute);   return 1
+    if nCode == 0:
+        msg = wt.MSG.from_address(lParam)
+        if msg.message == WM_APPCOMMAND and hook_ring.on_appcmd((msg.lParam >> 16) & 0xFFF):
+            return 1
     return user32.CallNextHookEx(None, nCode, wParam, lParam)
 
-@log_exceptions
 def _mouse_proc(nCode, wParam, lParam):
-    if nCode == 0 and _shift_enabled:
-        if wParam == WM_MBUTTONDOWN and user32.GetAsyncKeyState(VK_SHIFT) < 0:
-            _executor.submit(toggle_mute)
-            return 1
-        if wParam in (WM_MOUSEWHEEL, WM_MOUSEHWHEEL) and user32.GetAsyncKeyState(VK_SHIFT) < 0:
-            ms    = ctypes.cast(lParam, ctypes.POINTER(MSLLHOOKSTRUCT)).contents
-            delta = ctypes.c_short(ms.mouseData >> 16).value
-            notches = delta // WHEEL_DELTA
-            if notches > 0:
-                _executor.submit(step, +0.5 * notches)
-            elif notches < 0:
-                _executor.submit(step, -0.5 * abs(notches))
-            return 1
-    return user32.CallNextHookEx(None, nCode, wParam, lParam)    
+    if nCode == 0:
+        if wParam == WM_MBUTTONDOWN:
+            if hook_ring.on_button(hotkeys.KEY_MBUTTON):
+                return 1
+        elif wParam == WM_MOUSEWHEEL or wParam == WM_MOUSEHWHEEL:
+            delta = ctypes.c_short(MSLLHOOKSTRUCT.from_address(lParam).mouseData >> 16).value
+            if hook_ring.on_wheel(delta):
+                return 1
+    return user32.CallNextHookEx(None, nCode, wParam, lParam)
 
 _KBPROC  = ctypes.WINFUNCTYPE(ctypes.c_int, ctypes.c_int, wt.WPARAM, wt.LPARAM)(_kb_proc)
 _MSGPROC = ctypes.WINFUNCTYPE(ctypes.c_int, ctypes.c_int, wt.WPARAM, wt.LPARAM)(_msg_proc)
@@ -616,21 +1829,37 @@ _MOUSEPROC = ctypes.WINFUNCTYPE(ctypes.c_int, ctypes.c_int, wt.WPARAM, wt.LPARAM
 
 @log_exceptions
 def install_keyboard_hooks():
-    global _hook_kb, _hook_msg, _hook_mouse
+    global _hook_kb, _hook_msg, _hook_mouse, _hook_thread
+    _compile_hotkeys()
+    hook_ring.reset_mods()                # 훅이 빠져 있던 동안의 key-up 은 못 봤음
+    if _hook_thread is None or not _hook_thread.is_alive():
+        _hook_stop.clear()
+        _hook_thread = threading.Thread(target=_hook_worker, name="hook-worker", daemon=True)
+        _hook_thread.start()
     _hook_kb  = user32.SetWindowsHookExW(WH_KEYBOARD_LL, _KBPROC, None, 0)
     _hook_msg = user32.SetWindowsHookExW(WH_GETMESSAGE, _MSGPROC, None, 0)
     _hook_mouse = user32.SetWindowsHookExW(WH_MOUSE_LL, _MOUSEPROC, None, 0)
+    logger.info("Keyboard hooks installed")
 
 # ─── Cleanup
 @log_exceptions
 def _cleanup():
+    stop_engine()
     stop_polling()
+    _hook_stop.set(); hook_ring.signal.set()
     try: user32.UnhookWindowsHookEx(_hook_kb)
     except: pass
     try: user32.UnhookWindowsHookEx(_hook_msg)
     except: pass
     try: user32.UnhookWindowsHookEx(_hook_mouse)
     except: pass
-    _dev.close()
+    try: save_state_cache()
+    except: pass
+    try: stop_shared_state()
+    except: pass
+    _mirror.close()
+    fr.close_recorder()
+    if _dev is not None:
+        _dev.close()
 
 atexit.register(_cleanup)
\ No newline at end of file
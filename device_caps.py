@@ -0,0 +1,101 @@
+# device_caps.py
+# -*- coding: utf-8 -*-
+"""
+miniDSP Gain Helper - Device Capabilities
+===================================
+• (VID, PID, 펌웨어) → 기능 프로파일: 읽을 수 있는 레지스터, gain 범위/스텝, mute 방식, 안전한 최대 쓰기 속도
+• 레지스트리에 없는 기기는 한 번만 프로브(읽기 전용) → cache/caps-<serial>.json 에 저장
+  - 같은 시리얼이라도 펌웨어(bcdDevice)가 바뀌면 다시 프로브
+• 펌웨어 = hid.enumerate() 의 release_number (bcdDevice)
+"""
+import json, os, re, time
+
+READ_STATUS = "status"                # 0x05 @ 0xFFD8..DB (preset, source, volume, mute)
+READ_FLOAT  = "float"                 # 0x14 float 레지스터 (출력 채널 gain/mute)
+WRITE_FLOAT = "float_write"           # 0x13 0x80
+
+MUTE_DIGITAL = "digital"              # 0x17 명령
+MUTE_GAIN    = "gain"                 # 0x17 없음 - gain 을 바닥값으로 내려서 흉내
+
+
+class Profile:
+    FIELDS = ("name", "reads", "gain_min", "gain_max", "gain_step", "mute", "max_write_rate", "probed")
+
+    def __init__(self, name: str, reads=(READ_STATUS, READ_FLOAT, WRITE_FLOAT),
+                 gain_min: float = -127.0, gain_max: float = 0.0, gain_step: float = 0.5,
+                 mute: str = MUTE_DIGITAL, max_write_rate: float = 250.0, probed: bool = False):
+        self.name = name
+        self.reads = frozenset(reads)
+        self.gain_min, self.gain_max, self.gain_step = gain_min, gain_max, gain_step
+        self.mute = mute
+        self.max_write_rate = max_write_rate
+        self.probed = probed
+
+    def supports(self, what: str) -> bool:
+        return what in self.reads
+
+    def replace(self, **kw) -> "Profile":
+        d = self.to_dict()
+        d.update(kw)
+        return Profile(**d)
+
+    def to_dict(self) -> dict:
+        d = {k: getattr(self, k) for k in self.FIELDS}
+        d["reads"] = sorted(self.reads)
+        return d
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "Profile":
+        return cls(**{k: d[k] for k in cls.FIELDS if k in d})
+
+    def __repr__(self):
+        return f"Profile({self.name!r}, reads={sorted(self.reads)}, mute={self.mute!r}, rate={self.max_write_rate})"
+
+
+HD = Profile("miniDSP 2x4 HD")
+
+# 레지스트리에 없는 기기: 프로브 전/후 기본값 (쓰기 속도는 보수적으로)
+UNKNOWN = Profile("Unknown miniDSP", max_write_rate=50.0)
+
+# (VID, PID, (펌웨어 최소, 최대) 또는 None, 프로파일) - 위에서부터 첫 일치
+REGISTRY = [
+    (0x2752, 0x0011, None, HD),
+    (0x2752, 0x0044, None, HD.replace(name="miniDSP 2x4 HD (Dirac)")),
+    (0x2752, 0x003F, None, HD.replace(name="miniDSP 2x4 HD (Dirac)")),
+    # 0x04D8 구형 기기는 모델/펌웨어별 차이가 커서 프로브 결과를 사용
+]
+
+
+def lookup(vid: int, pid: int, firmware: int = 0) -> Profile | None:
+    for v, p, fw, prof in REGISTRY:
+        if v == vid and p == pid and (fw is None or fw[0] <= firmware <= fw[1]):
+            return prof
+    return None
+
+
+# ─── 프로브 결과 캐시 (시리얼별)
+def _cache_path(cache_dir: str, serial: str) -> str:
+    safe = re.sub(r"[^0-9A-Za-z_-]", "_", serial or "unknown")
+    return os.path.join(cache_dir, f"caps-{safe}.json")
+
+
+def load_probe(cache_dir: str, serial: str, vid: int, pid: int, firmware: int) -> Profile | None:
+    """같은 기기·펌웨어로 프로브한 결과가 있으면 그 프로파일"""
+    try:
+        with open(_cache_path(cache_dir, serial), encoding="utf-8") as f:
+            data = json.load(f)
+        if (data["vid"], data["pid"], data["firmware"]) != (vid, pid, firmware):
+            return None
+        return Profile.from_dict(data["profile"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def save_probe(cache_dir: str, serial: str, vid: int, pid: int, firmware: int, profile: Profile):
+    os.makedirs(cache_dir, exist_ok=True)
+    path = _cache_path(cache_dir, serial)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"vid": vid, "pid": pid, "firmware": firmware, "probed_at": time.time(),
+                   "profile": profile.to_dict()}, f, indent=1)
+    os.replace(tmp, path)
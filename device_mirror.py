@@ -0,0 +1,123 @@
+# device_mirror.py
+# -*- coding: utf-8 -*-
+"""
+miniDSP Gain Helper - Device Mirror
+===================================
+• 기기의 읽기 가능한 설정/상태 레지스터를 메모리에 복제 (레지스터별 dirty 추적)
+• 기기 시리얼별 메모리 맵 스냅샷 파일 (cache/mirror-<serial>.bin)
+  - 고정 슬롯 레이아웃이라 flush 는 dirty 슬롯만 pack_into
+• 재연결·새 기능은 버스 대신 미러를 먼저 참조
+"""
+import mmap, os, re, struct
+
+SPACE_MEM, SPACE_FLOAT = 0, 1         # 0x05 메모리(바이트) / 0x14 float 레지스터(4 bytes)
+MASTER_STATUS = 0xFFD8                # preset, source, volume, mute
+
+MAGIC   = b"MDMR"
+VERSION = 1
+HEADER  = struct.Struct("<4sHHI")     # magic, version, 레코드 수, 레이아웃 해시
+SLOT    = struct.Struct("<BBH4s")     # space, valid, addr, value
+
+
+def _layout_hash(registers) -> int:
+    h = 0
+    for space, addr in registers:
+        h = (h * 131 + (space << 16 | addr)) & 0xFFFFFFFF
+    return h
+
+
+class DeviceMirror:
+    def __init__(self, registers: list[tuple[int, int]]):
+        self.registers = list(registers)
+        self._index = {r: i for i, r in enumerate(self.registers)}
+        self._values: list[bytes | None] = [None] * len(self.registers)
+        self.dirty: set[tuple[int, int]] = set()
+        self._mm = None
+        self.path = None
+
+    # ─── 값 접근
+    def get(self, space: int, addr: int) -> bytes | None:
+        i = self._index.get((space, addr))
+        return None if i is None else self._values[i]
+
+    def set(self, space: int, addr: int, value: bytes):
+        """값이 바뀐 경우에만 dirty 표시 (미등록 레지스터는 무시)"""
+        key = (space, addr)
+        i = self._index.get(key)
+        if i is None:
+            return
+        value = bytes(value[:4]).ljust(4, b"\x00")
+        if self._values[i] != value:
+            self._values[i] = value
+            self.dirty.add(key)
+
+    def get_byte(self, addr: int) -> int | None:
+        v = self.get(SPACE_MEM, addr)
+        return None if v is None else v[0]
+
+    def set_byte(self, addr: int, value: int):
+        self.set(SPACE_MEM, addr, bytes([value & 0xFF]))
+
+    def get_float(self, addr: int) -> float | None:
+        v = self.get(SPACE_FLOAT, addr)
+        return None if v is None else struct.unpack("<f", v)[0]
+
+    def get_int(self, addr: int) -> int | None:
+        v = self.get(SPACE_FLOAT, addr)
+        return None if v is None else struct.unpack("<i", v)[0]
+
+    def set_word(self, addr: int, value: bytes):
+        self.set(SPACE_FLOAT, addr, value)
+
+    @property
+    def complete(self) -> bool:
+        return all(v is not None for v in self._values)
+
+    # ─── 스냅샷 파일
+    def attach(self, cache_dir: str, serial: str):
+        """시리얼별 스냅샷을 열고 레이아웃이 같으면 값을 불러옴"""
+        self.close()
+        os.makedirs(cache_dir, exist_ok=True)
+        safe = re.sub(r"[^0-9A-Za-z_-]", "_", serial or "unknown")
+        self.path = os.path.join(cache_dir, f"mirror-{safe}.bin")
+        size = HEADER.size + SLOT.size * len(self.registers)
+        lhash = _layout_hash(self.registers)
+
+        with open(self.path, "r+b" if os.path.exists(self.path) else "w+b") as f:
+            old = f.read()
+            fresh = (len(old) != size or old[:4] != MAGIC
+                     or HEADER.unpack_from(old, 0)[3] != lhash)
+            if fresh:
+                f.truncate(0)
+                f.truncate(size)
+            self._mm = mmap.mmap(f.fileno(), size)
+
+        if fresh:
+            HEADER.pack_into(self._mm, 0, MAGIC, VERSION, len(self.registers), lhash)
+            self.dirty.update(r for r, v in zip(self.registers, self._values) if v is not None)
+            return
+        for i, reg in enumerate(self.registers):
+            space, valid, addr, value = SLOT.unpack_from(self._mm, HEADER.size + i * SLOT.size)
+            if valid and (space, addr) == reg and self._values[i] is None:
+                self._values[i] = value
+
+    def flush(self):
+        """dirty 슬롯만 스냅샷에 기록"""
+        if self._mm is None or not self.dirty:
+            return
+        # pop 은 원자적 - flush 중에 바뀐 레지스터는 다시 dirty 로 남음
+        while self.dirty:
+            key = self.dirty.pop()
+            i = self._index[key]
+            SLOT.pack_into(self._mm, HEADER.size + i * SLOT.size,
+                           key[0], 1, key[1], self._values[i])
+        self._mm.flush()
+
+    def close(self):
+        if self._mm is not None:
+            try:
+                self.flush()
+                self._mm.close()
+            except (ValueError, OSError):
+                pass
+            self._mm = None
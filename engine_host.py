@@ -0,0 +1,267 @@
+# engine_host.py
+# -*- coding: utf-8 -*-
+"""
+miniDSP Gain Helper - Engine Process
+===================================
+• --engine process: 기기 엔진(_dev, _poll_loop, VolumeState)을 별도 프로세스에서 실행
+  - GUI 프로세스에는 훅/OSD/트레이만 남음 → Qt 작업(테마 전환, 메뉴 스캔, OSD 페인팅)이
+    폴링 주기나 키→쓰기 지연에 GIL 로 끼어들지 않음
+• 채널: multiprocessing.connection (Windows 이름 있는 파이프 / 그 외 AF_UNIX), authkey 인증
+  GUI → 엔진: ("init", path, interval) / ("call", id, name, args) / ("stop",)
+  엔진 → GUI: ("ret", id, ok, value) / ("gain", v) / ("state", snap)
+• 엔진이 죽으면 감독 스레드가 백오프 후 재시작하고 설정 호출(REPLAY)을 다시 보냄
+• Qt 를 import 하지 않음 - 자식은 python engine_host.py <address> 로 실행
+"""
+import itertools, logging, os, secrets, subprocess, sys, threading, time
+from concurrent.futures import Future
+from multiprocessing.connection import Client, Listener
+
+logger = logging.getLogger('minidsp')
+
+KEY_ENV      = "MINIDSP_ENGINE_KEY"
+CALL_TIMEOUT = 5.0
+CONNECT_TIMEOUT = 15.0
+BACKOFF_MIN, BACKOFF_MAX = 0.5, 10.0
+STABLE_AFTER = 30.0                   # 이만큼 살아 있었으면 백오프 초기화 (s)
+
+# 재시작 후 다시 보낼 설정 호출 (이름별 마지막 인자만 유지)
+REPLAY = ("set_step_curve", "enable_acceleration", "set_scenes", "pause_hotkeys", "set_tracing")
+
+
+class EngineClient:
+    """GUI 쪽 프록시: core3 의 @_routed 함수가 call() 로 엔진에 전달"""
+
+    def __init__(self, path=None, interval: float = 0.1, on_gain=None, on_state=None,
+                 replay: dict | None = None):
+        self.path, self.interval = path, interval
+        self.on_gain = on_gain or (lambda v: None)
+        self.on_state = on_state or (lambda s: None)
+        self.restarts = 0
+        self._state = None
+        self._conn = None
+        self._proc = None
+        self._ids = itertools.count(1)
+        self._pending: dict[int, Future] = {}
+        self._replay: dict[str, tuple] = dict(replay or {})
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # ─── 수명
+    def start(self, wait: float = CONNECT_TIMEOUT) -> bool:
+        self._thread = threading.Thread(target=self._supervise, name="engine-supervisor", daemon=True)
+        self._thread.start()
+        return self._ready.wait(wait)
+
+    def stop(self, timeout: float = 3.0):
+        self._stop.set()
+        conn = self._conn
+        if conn is not None:
+            try:
+                with self._send_lock:
+                    conn.send(("stop",))
+            except (OSError, EOFError):
+                pass
+        proc = self._proc
+        if proc is not None:
+            try:
+                proc.wait(timeout)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    @property
+    def alive(self) -> bool:
+        return self._ready.is_set()
+
+    # ─── 호출
+    def call(self, name: str, *args, timeout: float = CALL_TIMEOUT):
+        if name == "swap_device":
+            self.path = args[0]
+        elif name in ("start_polling", "set_poll_interval"):
+            self.interval = args[0]
+        elif name in REPLAY:
+            self._replay[name] = args
+        fut = Future()
+        with self._lock:
+            cid = next(self._ids)
+            self._pending[cid] = fut
+            conn = self._conn
+        if conn is None:
+            self._pending.pop(cid, None)
+            raise RuntimeError("device engine is not running")
+        try:
+            with self._send_lock:
+                conn.send(("call", cid, name, args))
+        except (OSError, EOFError) as e:
+            self._pending.pop(cid, None)
+            raise RuntimeError(f"device engine unavailable: {e}") from e
+        try:
+            return fut.result(timeout)
+        except TimeoutError:
+            self._pending.pop(cid, None)       # 늦게 온 응답은 _receive 가 버림
+            raise
+
+    def snapshot(self) -> dict:
+        return dict(self._state or {})
+
+    # ─── 감독 / 수신
+    def _spawn(self):
+        key = secrets.token_bytes(16)
+        listener = Listener(authkey=key)
+        env = dict(os.environ, **{KEY_ENV: key.hex(), "MINIDSP_LOG_NAME": "engine"})
+        self._proc = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), str(listener.address)], env=env)
+        # 자식이 연결 전에 죽거나 멈추면 accept 를 깨움
+        proc, deadline = self._proc, time.monotonic() + CONNECT_TIMEOUT
+        connected = threading.Event()
+
+        def watchdog():
+            while not connected.is_set():
+                if proc.poll() is not None or time.monotonic() > deadline:
+                    try:
+                        Client(listener.address, authkey=key).close()
+                    except OSError:
+                        pass
+                    return
+                time.sleep(0.1)
+        threading.Thread(target=watchdog, daemon=True).start()
+        try:
+            conn = listener.accept()
+        finally:
+            connected.set()
+            listener.close()
+        if proc.poll() is not None:
+            conn.close()
+            raise RuntimeError(f"engine exited during startup (code {proc.returncode})")
+        return conn
+
+    def _supervise(self):
+        backoff = BACKOFF_MIN
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                conn = self._spawn()
+                conn.send(("init", self.path, self.interval))
+                for name, args in self._replay.items():
+                    conn.send(("call", 0, name, args))
+                self._conn = conn
+                self._ready.set()
+                logger.info("Device engine running (pid %d)", self._proc.pid)
+                self._receive(conn)
+            except Exception:
+                logger.exception("Device engine failed")
+            finally:
+                self._ready.clear()
+                self._conn = None
+                self._fail_pending()
+            if self._proc is not None and self._proc.poll() is None and not self._stop.is_set():
+                self._proc.kill()
+            if self._stop.is_set():
+                break
+            if time.monotonic() - started > STABLE_AFTER:
+                backoff = BACKOFF_MIN
+            self.restarts += 1
+            logger.warning("Device engine stopped - restarting in %.1f s", backoff)
+            if self._stop.wait(backoff):
+                break
+            backoff = min(BACKOFF_MAX, backoff * 2)
+
+    def _receive(self, conn):
+        while True:
+            try:
+                msg = conn.recv()
+            except (EOFError, OSError):
+                return
+            kind = msg[0]
+            if kind == "ret":
+                _, cid, ok, value = msg
+                fut = self._pending.pop(cid, None)
+                if fut is None:
+                    continue
+                if ok:
+                    fut.set_result(value)
+                else:
+                    fut.set_exception(value)
+            elif kind == "gain":
+                self.on_gain(msg[1])
+            elif kind == "state":
+                self._state = msg[1]
+                self.on_state(msg[1])
+
+    def _fail_pending(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for fut in pending.values():
+            fut.set_exception(RuntimeError("device engine restarted"))
+
+
+# ─── 자식 프로세스
+def _engine_main(address: str):
+    import core3 as core
+    import flight_recorder as fr
+
+    conn = Client(address, authkey=bytes.fromhex(os.environ.pop(KEY_ENV)))
+    send_lock = threading.Lock()
+
+    def send(msg):
+        try:
+            with send_lock:
+                conn.send(msg)
+        except (OSError, EOFError):
+            pass
+
+    def reply(cid, fut):
+        if not cid:
+            return
+        exc = fut.exception()
+        if exc is None:
+            send(("ret", cid, True, fut.result()))
+            return
+        try:
+            send(("ret", cid, False, exc))
+        except Exception:
+            send(("ret", cid, False, RuntimeError(str(exc))))
+
+    fr.open_recorder(core.LOG_DIR, name="flight-engine")
+    core.set_gain_callback(lambda v: send(("gain", v)))
+    core.add_state_listener(lambda snap: send(("state", snap)))
+
+    while True:
+        try:
+            msg = conn.recv()
+        except (EOFError, OSError):
+            break                              # GUI 가 사라짐 → 같이 종료
+        kind = msg[0]
+        if kind == "init":
+            _, path, interval = msg
+            cached = core.load_state_cache()
+            core.open_device(path or cached)
+            core.start_polling(interval)
+            send(("state", core.get_state()))
+        elif kind == "call":
+            _, cid, name, args = msg
+            fn = getattr(core, name)
+            if name in core.ENGINE_DIRECT:
+                fut = Future()
+                try:
+                    fut.set_result(fn(*args))
+                except Exception as e:
+                    fut.set_exception(e)
+                reply(cid, fut)
+            else:
+                # HID 작업은 엔진 안에서도 _executor 하나로 직렬화
+                core._executor.submit(fn, *args).add_done_callback(
+                    lambda f, cid=cid: reply(cid, f))
+        elif kind == "stop":
+            break
+    core.stop_polling()
+    conn.close()
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    _engine_main(sys.argv[1])
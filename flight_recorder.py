@@ -0,0 +1,126 @@
+# flight_recorder.py
+# -*- coding: utf-8 -*-
+"""
+miniDSP Gain Helper - Flight Recorder
+===================================
+• 고정 크기 메모리 맵 링 파일에 바이너리 이벤트 레코드를 항상 기록
+• 핫패스는 struct.pack_into 한 번 (시스템 콜 없음) - 프로세스가 죽어도 페이지 캐시에 남음
+• 시작 시 이전 실행의 링은 *.prev.ring 으로 보존
+• 디코더: python flight_recorder.py [logs/flight.ring]
+"""
+import itertools, mmap, os, struct, sys, time
+from datetime import datetime
+
+MAGIC    = b"MDFR"
+VERSION  = 1
+# magic, version, rec_size, capacity, pid, start_epoch, start_perf_ns, last_seq
+HEADER   = struct.Struct("<4sHHIIdqQ")
+HDR_SIZE = 64
+SEQ_OFF  = HEADER.size - 8
+# seq, t_ns(perf_counter_ns), kind, code, a, b, v
+RECORD   = struct.Struct("<QqHHiid4x")
+DEFAULT_CAPACITY = 1 << 17              # 131072 레코드 × 40 B ≈ 5 MB
+
+# ─── 레코드 종류
+HOOK, HID_TX, HID_RX, STATE, TIMEOUT, ERROR, BREAKER, RECONNECT, POLL = range(1, 10)
+KIND_NAMES = {
+    HOOK: "HOOK", HID_TX: "HID_TX", HID_RX: "HID_RX", STATE: "STATE",
+    TIMEOUT: "TIMEOUT", ERROR: "ERROR", BREAKER: "BREAKER",
+    RECONNECT: "RECONNECT", POLL: "POLL",
+}
+
+
+def frame_words(data: bytes) -> tuple[int, int]:
+    """HID 프레임 앞 8바이트(report id 제외)를 레코드의 a, b 필드로 압축"""
+    if data[:1] == b"\x00":
+        data = data[1:]
+    head = bytes(data[:8]).ljust(8, b"\x00")
+    return (int.from_bytes(head[:4], "little", signed=True),
+            int.from_bytes(head[4:], "little", signed=True))
+
+
+class FlightRecorder:
+    """단일 파일 링 버퍼 - 여러 스레드에서 record() 호출 가능 (슬롯 번호는 itertools.count)"""
+    def __init__(self, path: str, capacity: int = DEFAULT_CAPACITY):
+        self.path = path
+        self.capacity = capacity
+        self._seq = itertools.count(1)
+        self._perf_ns = time.perf_counter_ns
+
+        size = HDR_SIZE + capacity * RECORD.size
+        with open(path, "w+b") as f:
+            f.truncate(size)
+            self._mm = mmap.mmap(f.fileno(), size)
+        HEADER.pack_into(self._mm, 0, MAGIC, VERSION, RECORD.size, capacity,
+                         os.getpid(), time.time(), self._perf_ns(), 0)
+
+    def record(self, kind: int, code: int = 0, a: int = 0, b: int = 0, v: float = 0.0):
+        seq = next(self._seq)
+        RECORD.pack_into(self._mm, HDR_SIZE + (seq % self.capacity) * RECORD.size,
+                         seq, self._perf_ns(), kind, code, a, b, v)
+        struct.pack_into("<Q", self._mm, SEQ_OFF, seq)
+
+    def close(self):
+        try:
+            self._mm.flush()
+            self._mm.close()
+        except (ValueError, OSError):
+            pass
+
+
+# ─── 모듈 수준 진입점: 열기 전에는 no-op
+def _noop(kind, code=0, a=0, b=0, v=0.0):
+    pass
+
+record   = _noop
+_current = None
+
+def open_recorder(log_dir: str, name: str = "flight", capacity: int = DEFAULT_CAPACITY) -> FlightRecorder:
+    """이전 링을 *.prev.ring 으로 옮기고 새 링을 연 뒤 record 를 활성화"""
+    global record, _current
+    path = os.path.join(log_dir, f"{name}.ring")
+    if os.path.exists(path):
+        os.replace(path, os.path.join(log_dir, f"{name}.prev.ring"))
+    _current = FlightRecorder(path, capacity)
+    record = _current.record
+    return _current
+
+def close_recorder():
+    global record, _current
+    record = _noop
+    if _current is not None:
+        _current.close()
+        _current = None
+
+
+# ─── 디코더
+def decode(path: str):
+    """링 파일 → 시간순 텍스트 라인"""
+    with open(path, "rb") as f:
+        buf = f.read()
+    magic, ver, rec_size, capacity, pid, epoch, perf0, last = HEADER.unpack_from(buf, 0)
+    if magic != MAGIC or rec_size != RECORD.size:
+        raise ValueError(f"not a flight recorder ring: {path}")
+    yield f"# pid={pid} started={datetime.fromtimestamp(epoch):%Y-%m-%d %H:%M:%S} last_seq={last}"
+
+    recs = []
+    for i in range(capacity):
+        rec = RECORD.unpack_from(buf, HDR_SIZE + i * rec_size)
+        if rec[0]:
+            recs.append(rec)
+    recs.sort()
+    for seq, t_ns, kind, code, a, b, v in recs:
+        ts = datetime.fromtimestamp(epoch + (t_ns - perf0) / 1e9)
+        name = KIND_NAMES.get(kind, f"K{kind}")
+        if kind in (HID_TX, HID_RX):
+            detail = (a.to_bytes(4, "little", signed=True) + b.to_bytes(4, "little", signed=True)).hex(" ")
+        else:
+            detail = f"code={code} a={a} b={b} v={v:g}"
+        yield f"{ts:%H:%M:%S.%f} #{seq:<8} {name:<9} {detail}"
+
+
+if __name__ == "__main__":
+    target = sys.argv[1] if len(sys.argv) > 1 else os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "logs", "flight.ring")
+    for line in decode(target):
+        print(line)
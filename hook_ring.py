@@ -0,0 +1,184 @@
+# hook_ring.py
+# -*- coding: utf-8 -*-
+"""
+miniDSP Gain Helper - Hook Event Ring
+===================================
+• 저수준 훅 콜백의 디코딩 부분 전부 - Win32/ctypes 를 import 하지 않음 (Linux 에서 벤치: bench_hooks.py)
+  - core3 의 _kb_proc / _msg_proc / _mouse_proc 는 구조체에서 필드만 꺼내 on_* 로 넘김
+  - 수정키 비트 추적 + 조밀한 바인딩 테이블 인덱싱 (hotkeys.compile_bindings)
+  - 추적한 수정키로 바인딩이 맞으면 실제 키 상태(set_mod_probe, core3: GetAsyncKeyState)로 한 번 더 확인
+    → 보안 데스크톱/잠금 화면/훅 타임아웃으로 key-up 을 놓쳐 수정키가 눌린 채 남아도
+      다음 일치 때 바로잡히고, 수정키 없는 휠/키는 삼키지 않고 그대로 통과
+  - 휠: 고해상도 부분 델타를 누적해 노치 단위로
+• 디코딩된 이벤트는 (바인딩 id, count, t) 레코드로 고정 크기 링에 넣고 워커를 깨우기만 함
+  - 단일 생산자(훅 스레드) / 단일 소비자(hook-worker) - 슬롯을 먼저 쓰고 head 를 나중에 올림
+• drain(): 링을 비우며 바인딩 id → 작업 목록 (연속된 볼륨 이벤트는 병합)
+"""
+import threading, time
+
+import flight_recorder as fr
+import hotkeys
+
+OP_VOL, OP_STEP, OP_MUTE, OP_SCENE = 1, 2, 3, 4      # 워커 쪽 작업 종류
+RING_SIZE = 256                      # 2의 거듭제곱
+RING_MASK = RING_SIZE - 1
+WHEEL_DELTA = 120                    # Windows 1 노치 기본 델타
+
+_act  = bytearray(RING_SIZE)
+_cnt  = [0]   * RING_SIZE
+_t    = [0.0] * RING_SIZE
+_head = 0                            # 훅 스레드만 증가
+_tail = 0                            # 워커만 증가
+_dropped = 0
+signal = threading.Event()           # 워커 깨우기
+_perf = time.perf_counter
+
+# ─── 디코딩 상태 (훅 스레드 전용)
+_table = [0] * (hotkeys.N_KEYS * hotkeys.N_MODS)
+_mods = 0                            # 현재 눌린 수정키 비트마스크 (hotkeys.MOD_*)
+_accumulated = 0                     # 휠 부분 델타 누적값
+_mod_vk = bytearray(256)             # 수정키 vk → 비트
+for _vk, _bit in hotkeys.MOD_VKS.items():
+    _mod_vk[_vk] = _bit
+_mod_probe = None                    # () → 실제로 눌린 수정키 비트마스크 (없으면 추적값을 그대로 믿음)
+
+
+def set_table(table: list):
+    """컴파일된 바인딩 테이블 교체 - 훅은 다음 이벤트부터 새 테이블 사용 (재설치 불필요)"""
+    global _table
+    _table = table
+
+
+def set_mod_probe(probe):
+    global _mod_probe
+    _mod_probe = probe
+
+
+def reset_mods():
+    """수정키 추적 초기화 - 훅을 다시 걸 때 / 세션·데스크톱 전환 때"""
+    global _mods, _accumulated
+    _mods = 0
+    _accumulated = 0
+
+
+def _lookup(key: int) -> int:
+    """key 의 바인딩 id - 수정키가 눌린 것으로 추적 중이면 실제 상태로 다시 맞춰 봄"""
+    global _mods
+    bid = _table[(key << 4) | _mods]
+    if bid and _mods and _mod_probe is not None:
+        mods = _mod_probe()
+        if mods != _mods:            # 놓친 key-up/down - 추적값을 실제 상태로 교정
+            _mods = mods
+            bid = _table[(key << 4) | mods]
+    return bid
+
+
+def push(act: int, cnt: int):
+    global _head, _dropped
+    h = _head
+    if h - _tail >= RING_SIZE:       # 워커가 밀림 - 새 이벤트 버림
+        _dropped += 1
+        return
+    i = h & RING_MASK
+    fr.record(fr.HOOK, act, cnt)
+    _act[i] = act
+    _cnt[i] = cnt
+    _t[i]   = _perf()
+    _head = h + 1
+    if not signal.is_set():
+        signal.set()
+
+
+# ─── 훅 콜백 디코딩: True 면 이벤트를 삼킴 (다음 훅으로 넘기지 않음)
+def on_key(vk: int, down: bool) -> bool:
+    global _mods
+    bit = _mod_vk[vk]
+    if bit:
+        _mods = (_mods | bit) if down else (_mods & ~bit)
+    elif down:
+        bid = _lookup(vk)
+        if bid:
+            push(bid, 1)
+            return True
+    return False
+
+
+def on_appcmd(cmd: int) -> bool:
+    """WM_APPCOMMAND 코드 (lParam 상위 워드의 하위 12비트)"""
+    bid = _lookup(hotkeys.KEY_APPCMD + cmd) if cmd < 32 else 0
+    if bid:
+        push(bid, 1)
+        return True
+    return False
+
+
+def on_button(key: int) -> bool:
+    """마우스 버튼 의사 키 (hotkeys.KEY_MBUTTON)"""
+    bid = _lookup(key)
+    if bid:
+        push(bid, 1)
+        return True
+    return False
+
+
+def on_wheel(delta: int) -> bool:
+    """휠 델타 (부호 있는 16비트, 한 노치 = WHEEL_DELTA)"""
+    global _accumulated
+    bid = _lookup(hotkeys.KEY_WHEEL_UP if delta > 0 else hotkeys.KEY_WHEEL_DOWN)
+    if not bid:
+        return False
+    # 고해상도 휠의 부분 델타는 누적 후 노치 단위로 변환
+    if (_accumulated > 0 and delta < 0) or (_accumulated < 0 and delta > 0):
+        _accumulated = 0             # 방향이 바뀌면 반대쪽 잔여분은 버림 (되돌리자마자 한 노치 튀지 않도록)
+    _accumulated += delta
+    notches = int(_accumulated / WHEEL_DELTA)
+    _accumulated -= notches * WHEEL_DELTA
+    if notches:
+        push(bid, abs(notches))
+    return True
+
+
+# ─── 소비자 쪽
+def drain(actions: list) -> list:
+    """
+    링을 비우며 바인딩 id 를 작업으로 변환 (actions: compile_bindings 의 id → (action, arg)).
+    연속된 볼륨 이벤트는 하나로 병합:
+    [(OP_VOL, [(notches, t)...]), (OP_STEP, dB), (OP_MUTE, None), (OP_SCENE, n), ...]
+    """
+    global _tail
+    ops = []
+    tail, head = _tail, _head
+    while tail != head:
+        i = tail & RING_MASK
+        bid, cnt, t = _act[i], _cnt[i], _t[i]
+        tail += 1
+        if bid >= len(actions):
+            continue
+        action, arg = actions[bid]
+        if action == "volume_up" or action == "volume_down":
+            sign = 1 if action == "volume_up" else -1
+            if arg is None:                     # 스텝 커브 + 가속
+                ev = (sign * cnt, t)
+                if ops and ops[-1][0] == OP_VOL:
+                    ops[-1][1].append(ev)
+                else:
+                    ops.append((OP_VOL, [ev]))
+            elif ops and ops[-1][0] == OP_STEP:  # 고정 스텝 (dB)
+                ops[-1] = (OP_STEP, ops[-1][1] + sign * arg * cnt)
+            else:
+                ops.append((OP_STEP, sign * arg * cnt))
+        elif action == "mute":
+            ops.append((OP_MUTE, None))
+        elif action == "scene":
+            ops.append((OP_SCENE, arg))
+    _tail = tail
+    return ops
+
+
+def oldest_t():
+    """아직 drain 되지 않은 가장 오래된 이벤트 시각 (perf_counter) - 비었으면 None"""
+    return _t[_tail & RING_MASK] if _tail != _head else None
+
+
+def stats() -> dict:
+    return {"pending": _head - _tail, "dropped": _dropped, "capacity": RING_SIZE}
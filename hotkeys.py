@@ -0,0 +1,112 @@
+# hotkeys.py
+# -*- coding: utf-8 -*-
+"""
+miniDSP Gain Helper - Hotkey Bindings
+===================================
+• 바인딩 정의: {"mods": [...], "key": "F11", "action": "volume_up", "arg": ..., "group": "alt"}
+• 로드 시점에 (키 << 4 | 수정키 비트마스크) 로 인덱싱되는 조밀한 테이블로 컴파일
+  → 훅에서는 이벤트당 리스트 인덱싱 한 번
+• 키: 가상키(0x00-0xFF) + 마우스 휠/휠클릭 + WM_APPCOMMAND 의사 키
+"""
+
+# ─── 수정키 비트 ("alt" 는 왼쪽 Alt 만 - 오른쪽 Alt 는 AltGr 로 쓰이는 배열이 있음)
+MOD_ALT, MOD_CTRL, MOD_SHIFT, MOD_WIN = 0x1, 0x2, 0x4, 0x8
+MOD_BITS  = {"alt": MOD_ALT, "ctrl": MOD_CTRL, "shift": MOD_SHIFT, "win": MOD_WIN}
+N_MODS    = 16
+MODS_ANY  = "any"                         # 수정키와 무관하게 동작 (미디어 키 등)
+
+# 수정키 가상키 → 비트 (훅이 눌림/뗌을 추적)
+MOD_VKS = {
+    0xA4: MOD_ALT,                        # VK_LMENU
+    0xA2: MOD_CTRL, 0xA3: MOD_CTRL,       # VK_LCONTROL / VK_RCONTROL
+    0x10: MOD_SHIFT, 0xA0: MOD_SHIFT, 0xA1: MOD_SHIFT,
+    0x5B: MOD_WIN, 0x5C: MOD_WIN,
+}
+
+# ─── 의사 키
+KEY_WHEEL_UP, KEY_WHEEL_DOWN, KEY_MBUTTON = 0x100, 0x101, 0x102
+KEY_APPCMD = 0x110                        # + WM_APPCOMMAND 코드 (0-31)
+N_KEYS     = 0x130
+
+KEY_NAMES = {f"F{n}": 0x6F + n for n in range(1, 25)}
+KEY_NAMES.update({chr(c): c for c in range(ord("A"), ord("Z") + 1)})
+KEY_NAMES.update({str(n): 0x30 + n for n in range(10)})
+KEY_NAMES.update({
+    "VOLUME_MUTE": 0xAD, "VOLUME_DOWN": 0xAE, "VOLUME_UP": 0xAF,
+    "MEDIA_NEXT": 0xB0, "MEDIA_PREV": 0xB1, "MEDIA_STOP": 0xB2, "MEDIA_PLAY": 0xB3,
+    "PAGE_UP": 0x21, "PAGE_DOWN": 0x22, "END": 0x23, "HOME": 0x24,
+    "LEFT": 0x25, "UP": 0x26, "RIGHT": 0x27, "DOWN": 0x28,
+    "INSERT": 0x2D, "DELETE": 0x2E, "PAUSE": 0x13, "SCROLL_LOCK": 0x91,
+    "WHEEL_UP": KEY_WHEEL_UP, "WHEEL_DOWN": KEY_WHEEL_DOWN, "MBUTTON": KEY_MBUTTON,
+    "APP_VOLUME_MUTE": KEY_APPCMD + 8, "APP_VOLUME_DOWN": KEY_APPCMD + 9,
+    "APP_VOLUME_UP": KEY_APPCMD + 10,
+})
+
+# ─── 동작
+ACTIONS = ("volume_up", "volume_down", "mute", "scene")
+GROUPS  = ("media", "alt", "shift", "custom")
+
+DEFAULT_BINDINGS = [
+    {"mods": ["alt"],   "key": "F11",             "action": "volume_up",   "group": "alt"},
+    {"mods": ["alt"],   "key": "F10",             "action": "volume_down", "group": "alt"},
+    {"mods": ["alt"],   "key": "F12",             "action": "mute",        "group": "alt"},
+    {"mods": MODS_ANY,  "key": "VOLUME_UP",       "action": "volume_up",   "group": "media"},
+    {"mods": MODS_ANY,  "key": "VOLUME_DOWN",     "action": "volume_down", "group": "media"},
+    {"mods": MODS_ANY,  "key": "VOLUME_MUTE",     "action": "mute",        "group": "media"},
+    {"mods": MODS_ANY,  "key": "APP_VOLUME_UP",   "action": "volume_up",   "group": "media"},
+    {"mods": MODS_ANY,  "key": "APP_VOLUME_DOWN", "action": "volume_down", "group": "media"},
+    {"mods": MODS_ANY,  "key": "APP_VOLUME_MUTE", "action": "mute",        "group": "media"},
+    {"mods": ["shift"], "key": "WHEEL_UP",        "action": "volume_up",   "group": "shift"},
+    {"mods": ["shift"], "key": "WHEEL_DOWN",      "action": "volume_down", "group": "shift"},
+    {"mods": ["shift"], "key": "MBUTTON",         "action": "mute",        "group": "shift"},
+] + [
+    {"mods": ["alt"], "key": str(n), "action": "scene", "arg": n, "group": "alt"}
+    for n in range(1, 10)
+]
+
+
+def mod_mask(mods) -> int:
+    return sum(MOD_BITS[m.lower()] for m in mods)
+
+def format_binding(b: dict) -> str:
+    mods = b.get("mods") or []
+    if mods == MODS_ANY:
+        return b["key"]
+    return "+".join([m.capitalize() for m in mods] + [b["key"]])
+
+def compile_bindings(bindings: list[dict], enabled_groups=GROUPS, n_scenes: int = 9):
+    """
+    → (table, actions)
+    table[(key << 4) | mods] = 바인딩 id (0 = 없음)
+    actions[id] = (action, arg)  (arg: volume 은 고정 스텝 dB 또는 None, scene 은 번호)
+    잘못된 항목은 ValueError - 부분 적용하지 않음
+    """
+    table = [0] * (N_KEYS * N_MODS)
+    actions = [None]
+    # 수정키가 명시된 바인딩이 MODS_ANY 보다 우선하도록 뒤에서 덮어씀
+    ordered = sorted(bindings, key=lambda b: b.get("mods") != MODS_ANY)
+    for b in ordered:
+        key = KEY_NAMES.get(str(b.get("key", "")).upper())
+        if key is None:
+            raise ValueError(f"unknown key: {b.get('key')!r}")
+        action = b.get("action")
+        if action not in ACTIONS:
+            raise ValueError(f"unknown action: {action!r}")
+        if b.get("group", "custom") not in enabled_groups:
+            continue
+        arg = b.get("arg")
+        if action == "scene":
+            arg = int(arg or 1)
+            if arg > n_scenes:
+                continue
+        elif arg is not None:
+            arg = abs(float(arg))
+        if len(actions) > 255:
+            raise ValueError("too many bindings (max 255)")
+        actions.append((action, arg))
+        bid = len(actions) - 1
+        mods = b.get("mods") or []
+        masks = range(N_MODS) if mods == MODS_ANY else (mod_mask(mods),)
+        for m in masks:
+            table[(key << 4) | m] = bid
+    return table, actions
@@ -6,23 +6,35 @@ miniDSP Gain Helper - GUI
 • 트레이 아이콘, 툴팁, 창 아이콘 모두 APP_NAME 사용
 • 미디어키 / Alt / Shift 단축키 토글
 • 메뉴아이템 Pause/Resume/Light Mode/Dark Mode/About
-• 예정: 단축키 지정, 입력소스 선택, 프리셋 선택, 볼륨프리셋&단축키지정 3개(음악, 영화 등...)
+• 장면(볼륨 프리셋) 저장/적용 - Alt+1…9
+• 트레이 아이콘/툴팁에 현재 gain·mute 레벨 표시
+• 모든 설정은 config.toml (--config) - 파일을 고치면 바뀐 항목만 즉시 반영
+• 트레이 "Profile 30 s" / --profile SECONDS : 스레드별 샘플링 프로파일 → logs/profile-*
+• 예정: 단축키 지정, 입력소스 선택, 프리셋 선택
 • 
 """
 from __future__ import annotations
-import sys, logging, argparse, os, ctypes, platform, re
+import time
+STARTUP_T0 = time.perf_counter()                    # 콜드 스타트 측정 기준점 (무거운 import 이전)
+import sys, logging, argparse, os, ctypes, json
 import core3 as core
-from ctypes import wintypes
+import flight_recorder as fr
+import config
+import profiler
+import hotkeys
 from pathlib import Path
 from volume_osd import VolumeOSD
+from tray_icon import TrayLevelIndicator
 from core3 import log_exceptions, logger
 from theme_manager import ThemeManager, set_window_dark_titlebar
-from PySide6.QtCore   import QSettings, Qt, QTimer, QObject, Signal, QCoreApplication, QFile, QTextStream, qInstallMessageHandler, QtMsgType, QPoint
-from PySide6.QtGui    import QPalette, QColor, QIcon, QAction, QGuiApplication, QActionGroup, QFont, QShortcut, QKeySequence, QPainter
+from PySide6.QtCore   import QSettings, Qt, QTimer, QObject, Signal
+from PySide6.QtGui    import QIcon, QAction, QGuiApplication, QActionGroup, QShortcut, QKeySequence
 from PySide6.QtWidgets import (
-    QApplication, QWidget, QMenu, QMenuBar, QStyleFactory, QLabel, QStyle,
-    QVBoxLayout, QFormLayout, QCheckBox, QComboBox, QSystemTrayIcon, 
-    QDialog, QTextEdit, QStyle, QSizePolicy, QMainWindow, QProxyStyle, QMessageBox
+    QApplication, QWidget, QMenu, QMenuBar, QLabel, QStyle,
+    QVBoxLayout, QFormLayout, QGridLayout, QGroupBox, QCheckBox, QComboBox,
+    QDoubleSpinBox, QSystemTrayIcon, QDialog, QTextEdit, QSizePolicy,
+    QMainWindow, QProxyStyle, QInputDialog, QTableWidget, QTableWidgetItem,
+    QHBoxLayout, QPushButton, QDialogButtonBox, QMessageBox, QHeaderView
 )
 
 # argparse 로 --debug 옵션 받기
@@ -31,6 +43,23 @@ parser.add_argument(
     '--debug', action='store_true',
     help='Enable debug logging (overrides MINIDSP_DEBUG env var)'
 )
+parser.add_argument(
+    '--http', metavar='[HOST:]PORT', default=None,
+    help='Serve GET /state, POST /gain, POST /mute and SSE /events (default host: 127.0.0.1)'
+)
+parser.add_argument(
+    '--engine', choices=('inproc', 'process'), default=None,
+    help='Run the device engine (USB I/O, polling, volume state) in this process or a separate one '
+         '(default: [startup] engine in the config file, else inproc)'
+)
+parser.add_argument(
+    '--config', metavar='PATH', default=os.path.join(core.BASE_DIR, 'config.toml'),
+    help='TOML settings file, watched and re-applied on change (created on first run)'
+)
+parser.add_argument(
+    '--profile', metavar='SECONDS', type=float, default=None,
+    help='Record a sampling profile of all threads for SECONDS after startup (written to logs/)'
+)
 args = parser.parse_args()
 
 # 1) CLI --debug 우선, 없으면 환경변수
@@ -50,6 +79,8 @@ class IRBridge(QObject):
 APP_NAME  = "miniDSP Gain Helper"
 APP_VERSION = "0.1.0"
 ICON_PATH = Path(__file__).with_suffix('.ico')
+PROFILE_SECONDS = 30.0                              # 트레이 "Profile" 메뉴의 샘플링 시간
+profiler.IDLE_FUNCS.add(("main.py", "main"))        # app.exec() 대기 = Qt 이벤트 루프 유휴
     
 class MenuBarStyle(QProxyStyle):
     def pixelMetric(self, metric, option=None, widget=None):
@@ -116,8 +147,211 @@ class AboutDialog(QDialog):
             # 계산된 좌상단으로 이동
             self.move(dlg_frame.topLeft())
 
+@log_exceptions
+def _resident_mb() -> float | None:
+    """현재 프로세스 Working Set(MB) - 트레이 전용 상태의 메모리 확인용"""
+    if sys.platform == "win32":
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [("cb", ctypes.c_ulong), ("PageFaultCount", ctypes.c_ulong),
+                        ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                        ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+        pmc = PROCESS_MEMORY_COUNTERS()
+        pmc.cb = ctypes.sizeof(pmc)
+        if ctypes.windll.psapi.GetProcessMemoryInfo(
+                ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(pmc), pmc.cb):
+            return pmc.WorkingSetSize / (1024*1024)
+        return None
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    except ImportError:
+        return None
+
+# ─── Diagnostics 대화상자 (USB 쓰기 경로 카운터)
+class DiagnosticsDialog(QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Diagnostics")
+        self.setModal(True)
+        layout = QVBoxLayout(self)
+        self.text = QTextEdit()
+        self.text.setReadOnly(True)
+        self.text.setMinimumSize(280, 180)
+        layout.addWidget(self.text)
+
+        # 지연 비교용: GUI 스레드에 인위적인 부하 (테마 전환/OSD 페인팅 흉내)
+        row = QHBoxLayout()
+        self.cb_load = QCheckBox("Simulate GUI load")
+        self.cb_load.toggled.connect(self._toggle_load)
+        btn_reset = QPushButton("Reset latency")
+        btn_reset.clicked.connect(self._reset_latency)
+        row.addWidget(self.cb_load)
+        row.addWidget(btn_reset)
+        layout.addLayout(row)
+        self._load_timer = QTimer(self, interval=10, timeout=self._burn)
+
+        self._timer = QTimer(self, interval=500, timeout=self._refresh)
+        self._timer.start()
+        self._refresh()
+
+    def _toggle_load(self, on: bool):
+        if on:
+            self._load_timer.start()
+        else:
+            self._load_timer.stop()
+
+    def _burn(self):
+        t = time.perf_counter() + 0.008
+        while time.perf_counter() < t:
+            pass
+
+    @log_exceptions
+    def _reset_latency(self):
+        core._key_latency.reset()
+        core.reset_poll_stats()
+
+    @log_exceptions
+    def _refresh(self):
+        caps = core.get_caps()
+        lines = [f"[Device] {caps['name']}{' (probed)' if caps['probed'] else ''}",
+                 f"  {'reads':<14}{', '.join(caps['reads']) or '-'}",
+                 f"  {'gain':<14}{caps['gain_min']}..{caps['gain_max']} / {caps['gain_step']} dB",
+                 f"  {'mute':<14}{caps['mute']}",
+                 "[USB write]"]
+        for k, v in core.get_write_stats().items():
+            lines.append(f"  {k:<14}{v}")
+        lines.append(f"[Engine] {core.engine_mode()}")
+        for k, v in core.get_poll_stats().items():
+            lines.append(f"  {'poll_' + k:<14}{v}")
+        swap = core.get_swap_stats()
+        if swap["n"]:
+            lines.append(f"  {'swap_max_ms':<14}{swap['max_ms']}")
+        lines.append("[Round trip]")
+        for k, v in core.get_rtt_stats().items():
+            lines.append(f"  {k:<14}{v}")
+        lines.append("[Reports]")
+        for k, v in core.get_report_stats().items():
+            lines.append(f"  {k:<14}{v}")
+        lines.append("[Hook ring]")
+        for k, v in core.get_hook_stats().items():
+            lines.append(f"  {k:<14}{v}")
+        lines.append("[Startup]")
+        tray = getattr(self.parent(), 'tray_app', None)
+        if tray and tray.ready_ms is not None:
+            lines.append(f"  {'tray ready':<14}{tray.ready_ms:.0f} ms")
+        if core.first_hotkey_t is not None:
+            lines.append(f"  {'first hotkey':<14}{(core.first_hotkey_t - STARTUP_T0)*1000:.0f} ms")
+        rss = _resident_mb()
+        if rss is not None:
+            lines.append(f"  {'resident':<14}{rss:.1f} MB")
+        self.text.setPlainText("\n".join(lines))
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        parent = self.parent()
+        if parent and hasattr(parent, 'theme_mgr'):
+            set_window_dark_titlebar(int(self.winId()), parent.theme_mgr.current == 'dark')
+
+# ─── Hotkeys 대화상자 (바인딩 편집 → 훅 재설치 없이 테이블만 재컴파일)
+class HotkeysDialog(QDialog):
+    COLS = ("Modifiers", "Key", "Action", "Arg", "Group")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Hotkeys")
+        self.setModal(True)
+        layout = QVBoxLayout(self)
+
+        self.table = QTableWidget(0, len(self.COLS))
+        self.table.setHorizontalHeaderLabels(self.COLS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setMinimumSize(460, 300)
+        layout.addWidget(self.table)
+
+        row_btns = QHBoxLayout()
+        row_btns.addWidget(QPushButton("Add", clicked=lambda: self._add_row({})))
+        row_btns.addWidget(QPushButton("Remove", clicked=self._remove_row))
+        row_btns.addWidget(QPushButton("Defaults", clicked=lambda: self._load(hotkeys.DEFAULT_BINDINGS)))
+        row_btns.addStretch(1)
+        layout.addLayout(row_btns)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+        self._load(core.get_bindings())
+
+    def _load(self, bindings: list[dict]):
+        self.table.setRowCount(0)
+        for b in bindings:
+            self._add_row(b)
+
+    def _add_row(self, b: dict):
+        r = self.table.rowCount()
+        self.table.insertRow(r)
+        mods = b.get("mods") or []
+        self.table.setItem(r, 0, QTableWidgetItem(mods if mods == hotkeys.MODS_ANY else "+".join(mods)))
+        key = QComboBox(editable=True)
+        key.addItems(sorted(hotkeys.KEY_NAMES))
+        key.setCurrentText(b.get("key", "F9"))
+        self.table.setCellWidget(r, 1, key)
+        action = QComboBox()
+        action.addItems(hotkeys.ACTIONS)
+        action.setCurrentText(b.get("action", "volume_up"))
+        self.table.setCellWidget(r, 2, action)
+        arg = b.get("arg")
+        self.table.setItem(r, 3, QTableWidgetItem("" if arg is None else str(arg)))
+        group = QComboBox()
+        group.addItems(hotkeys.GROUPS)
+        group.setCurrentText(b.get("group", "custom"))
+        self.table.setCellWidget(r, 4, group)
+
+    def _remove_row(self):
+        r = self.table.currentRow()
+        if r >= 0:
+            self.table.removeRow(r)
+
+    def bindings(self) -> list[dict]:
+        out = []
+        for r in range(self.table.rowCount()):
+            mods_text = (self.table.item(r, 0).text() if self.table.item(r, 0) else "").strip().lower()
+            arg_text = (self.table.item(r, 3).text() if self.table.item(r, 3) else "").strip()
+            b = {
+                "mods":   hotkeys.MODS_ANY if mods_text == hotkeys.MODS_ANY
+                          else [m.strip() for m in mods_text.split("+") if m.strip()],
+                "key":    self.table.cellWidget(r, 1).currentText().strip().upper(),
+                "action": self.table.cellWidget(r, 2).currentText(),
+                "group":  self.table.cellWidget(r, 4).currentText(),
+            }
+            if arg_text:
+                b["arg"] = float(arg_text) if b["action"] != "scene" else int(arg_text)
+            out.append(b)
+        return out
+
+    def accept(self):
+        try:
+            bindings = self.bindings()
+            core.set_bindings(bindings)
+        except (ValueError, KeyError) as e:
+            QMessageBox.warning(self, "Hotkeys", f"Invalid binding: {e}")
+            return
+        tray = getattr(self.parent(), 'tray_app', None)
+        if tray:
+            tray.store_bindings(bindings)
+        super().accept()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        parent = self.parent()
+        if parent and hasattr(parent, 'theme_mgr'):
+            set_window_dark_titlebar(int(self.winId()), parent.theme_mgr.current == 'dark')
+
 #=============================
 class MainWindow(QMainWindow):
+    channelsLoaded = Signal(list)   # 워커 스레드 → GUI: [(gain, muted), ...]
     @log_exceptions
     def _show_window(self):
         self.showNormal()
@@ -125,9 +359,10 @@ class MainWindow(QMainWindow):
         self.activateWindow()
 
     @log_exceptions
-    def __init__(self, osd: VolumeOSD):
+    def __init__(self, osd: VolumeOSD, tray: TrayApp):
         super().__init__()
-        self.theme_mgr = ThemeManager(QApplication.instance())
+        self.theme_mgr = tray.theme_mgr
+        self.config = tray.config
 
         # ─── GUI 실시간 확인용 
         self._reload_qss_sc = QShortcut(QKeySequence("F5"), self,activated=lambda: self.theme_mgr.reload_qss(window=self))
@@ -145,36 +380,12 @@ class MainWindow(QMainWindow):
         # ─── (2) 드래그용 변수
         self._drag_pos = None
 
-        # ─── (4) 공통 액션 정의
-        self.action_show  = QAction("Show", self, triggered=self._show_window)
-        pause_group = QActionGroup(self)
-        pause_group.setExclusive(True)
-        self.pause_act  = QAction("Pause",  self, checkable=True)
-        self.resume_act = QAction("Resume", self, checkable=True)
-        pause_group.addAction(self.pause_act)
-        pause_group.addAction(self.resume_act)
-        self.resume_act.setChecked(True)
-        action_exit = QAction("Exit",   self, triggered=QApplication.quit)
-
-        self.pause_act.triggered.connect(lambda _: (core.pause_hotkeys(True), self._refresh_info()))
-        self.resume_act.triggered.connect(lambda _: (core.pause_hotkeys(False), self._refresh_info()))
-        
-        # ─── (5) 트레이 아이콘 & 메뉴
-        icon = QIcon(str(ICON_PATH)) if ICON_PATH.exists() else self.style().standardIcon(QStyle.SP_ComputerIcon)
-        self.setWindowIcon(icon)
-        self.tray = QSystemTrayIcon(icon, self)
-        self.tray.setToolTip(APP_NAME)
-
-        tray_menu = QMenu()
-        tray_menu.setAttribute(Qt.WA_StyledBackground, True)
-        tray_menu.addActions([self.action_show, self.pause_act, self.resume_act])
-        tray_menu.addSeparator()
-        tray_menu.addAction(action_exit)
-        self.tray.setContextMenu(tray_menu)
-        self.tray.show()
-        self.tray.activated.connect(
-            lambda reason: self._show_window() if reason == QSystemTrayIcon.Trigger else None
-        )
+        # ─── (4) 공통 액션: 트레이와 공유
+        self.tray_app   = tray
+        self.pause_act  = tray.pause_act
+        self.resume_act = tray.resume_act
+        action_exit     = tray.exit_act
+        self.setWindowIcon(tray.icon)
 
         # ─── (6) 메뉴바 생성·스타일·액션 추가
         # QMenuBar를 MainWindow(self)를 부모로 생성하고, 바로 메뉴바로 설정
@@ -194,6 +405,8 @@ class MainWindow(QMainWindow):
         file_menu.setAttribute(Qt.WA_StyledBackground, True)
         file_menu.addActions([self.pause_act, self.resume_act])
         file_menu.addSeparator()
+        file_menu.addAction("Hotkeys…", self._show_hotkeys_dialog)
+        file_menu.addSeparator()
         file_menu.addAction(action_exit)
 
         # Theme 메뉴
@@ -218,8 +431,11 @@ class MainWindow(QMainWindow):
         self.light_act.triggered.connect(lambda: self.theme_mgr.apply("light", window=self))
         self.dark_act.triggered.connect(lambda: self.theme_mgr.apply("dark",  window=self))       
 
+        self.menu_bar.addMenu(tray.scenes_menu)
+
         help_menu = self.menu_bar.addMenu("&Help")
         help_menu.setAttribute(Qt.WA_StyledBackground, True)
+        help_menu.addAction("Diagnostics", self._show_diagnostics_dialog)
         help_menu.addAction("About", self._show_about_dialog)
 
         # 상태 메시지 메뉴 - QSS 폰트색상을 위해 변경 테스트
@@ -313,10 +529,81 @@ class MainWindow(QMainWindow):
         form.addRow(lbl_dev, self.cb_device)
         layout.addLayout(form)      
 
-        # 7-6) 남은 공간 채우기
+        # 7-6) Step curve / Acceleration (QFormLayout)
+        form = QFormLayout()
+        lbl_curve = QLabel("Step curve:")
+        self.cb_curve = QComboBox()
+        self.cb_curve.setFixedWidth(130)
+        self.cb_curve.setFixedHeight(25)
+        for label, name in [("Fine (0.5 dB)", "fine"),
+                            ("Adaptive", "adaptive"),
+                            ("Coarse", "coarse")]:
+            self.cb_curve.addItem(label, name)
+        self.cb_curve.currentIndexChanged.connect(self._on_curve_changed)
+        form.addRow(lbl_curve, self.cb_curve)
+        layout.addLayout(form)
+        self.cb_accel = QCheckBox("Accelerate on fast repeat",
+                                  checked=False,
+                                  toggled=self._on_accel_toggled)
+        layout.addWidget(self.cb_accel)
+
+        # 7-7) 출력 채널 gain / mute
+        ch_box  = QGroupBox("Output channels")
+        ch_grid = QGridLayout(ch_box)
+        ch_grid.setContentsMargins(6, 4, 6, 4)
+        self.ch_gain, self.ch_mute = [], []
+        for i, (name, _, _) in enumerate(core.OUTPUT_CHANNELS):
+            sb = QDoubleSpinBox(decimals=1, singleStep=0.5, suffix=" dB",
+                                minimum=core.CH_GAIN_MIN, maximum=core.CH_GAIN_MAX)
+            sb.setKeyboardTracking(False)
+            sb.setEnabled(False)                # 첫 읽기 전에는 비활성
+            cb = QCheckBox("Mute")
+            cb.setEnabled(False)
+            sb.valueChanged.connect(lambda v, i=i: self._queue_channel(i, gain=v))
+            cb.toggled.connect(lambda m, i=i: self._queue_channel(i, muted=m))
+            ch_grid.addWidget(QLabel(name), i, 0)
+            ch_grid.addWidget(sb, i, 1)
+            ch_grid.addWidget(cb, i, 2)
+            self.ch_gain.append(sb)
+            self.ch_mute.append(cb)
+        layout.addWidget(ch_box)
+
+        # 여러 채널 변경은 잠깐 모았다가 하나의 배치로 전송
+        self._ch_pending: dict[int, list] = {}
+        self._ch_timer = QTimer(self, singleShot=True, interval=120, timeout=self._flush_channels)
+        self.channelsLoaded.connect(self._on_channels_loaded)
+        core._executor.submit(self._load_channels)
+
+        # 7-8) 남은 공간 채우기
         layout.addStretch(1)
         self.setCentralWidget(central)  # 중앙 위젯으로 설정
-        self.setFixedSize(250, 290)     # 주석처리하면 알아서 맞춰짐
+        self.setFixedSize(250, 500)     # 주석처리하면 알아서 맞춰짐
+
+        # 위젯 초기값은 설정 파일 값 (core 에는 TrayApp 이 이미 적용)
+        self._sync_from_config(config.flatten(self.config.data))
+
+    # ─── 설정 파일 → 위젯 (시그널 막고 표시만 갱신)
+    @log_exceptions
+    def _sync_from_config(self, changes: dict):
+        checks = {"hotkeys.media": self.cb_media, "hotkeys.alt": self.cb_alt,
+                  "hotkeys.shift": self.cb_shift, "volume.acceleration": self.cb_accel}
+        combos = {"polling.interval": (self.cb_poll, lambda v: v),
+                  "volume.step_curve": (self.cb_curve, lambda v: v),
+                  "device.path": (self.cb_device, lambda v: v.encode())}
+        for key, v in changes.items():
+            if key in checks:
+                w = checks[key]
+                w.blockSignals(True)
+                w.setChecked(v)
+                w.blockSignals(False)
+            elif key in combos and v != "":
+                w, conv = combos[key]
+                idx = w.findData(conv(v))
+                if idx >= 0:
+                    w.blockSignals(True)
+                    w.setCurrentIndex(idx)
+                    w.blockSignals(False)
+        self._refresh_info()
 
     # ─── 핫키 토글
     @log_exceptions
@@ -329,8 +616,66 @@ class MainWindow(QMainWindow):
         core.enable_media_keys(self.cb_media.isChecked())
         core.enable_alt_keys(self.cb_alt.isChecked())
         core.enable_shift_keys(self.cb_shift.isChecked())
+        self.config.set("hotkeys.media", self.cb_media.isChecked())
+        self.config.set("hotkeys.alt", self.cb_alt.isChecked())
+        self.config.set("hotkeys.shift", self.cb_shift.isChecked())
         self._refresh_info() # 상태(Active/Paused) 갱신
 
+    @log_exceptions
+    def _on_curve_changed(self, index: int):
+        name = self.cb_curve.itemData(index)
+        core.set_step_curve(name)
+        self.config.set("volume.step_curve", name)
+
+    @log_exceptions
+    def _on_accel_toggled(self, flag: bool):
+        core.enable_acceleration(flag)
+        self.config.set("volume.acceleration", flag)
+
+    # ─── 출력 채널
+    @log_exceptions
+    def _load_channels(self):
+        """워커 스레드에서 실행: 채널 값(미러 우선)을 GUI 로 전달"""
+        try:
+            self.channelsLoaded.emit(core.get_channels())
+        except RuntimeError as e:
+            logger.warning("Channel read failed: %s", e)
+
+    @log_exceptions
+    def _on_channels_loaded(self, values: list):
+        for i, (gain, muted) in enumerate(values):
+            for w, setter, v in ((self.ch_gain[i], self.ch_gain[i].setValue, gain),
+                                 (self.ch_mute[i], self.ch_mute[i].setChecked, muted)):
+                w.blockSignals(True)
+                setter(v)
+                w.blockSignals(False)
+                w.setEnabled(True)
+
+    @log_exceptions
+    def _queue_channel(self, i: int, gain=None, muted=None):
+        slot = self._ch_pending.setdefault(i, [None, None])
+        if gain is not None:
+            slot[0] = gain
+        if muted is not None:
+            slot[1] = muted
+        self._ch_timer.start()
+
+    @log_exceptions
+    def _flush_channels(self):
+        changes = {i: tuple(v) for i, v in self._ch_pending.items()}
+        self._ch_pending.clear()
+        core._executor.submit(core.set_channels, changes)
+
+    @log_exceptions
+    def _show_hotkeys_dialog(self):
+        dlg = HotkeysDialog(self)
+        dlg.exec()
+
+    @log_exceptions
+    def _show_diagnostics_dialog(self):
+        dlg = DiagnosticsDialog(self)
+        dlg.exec()
+
     @log_exceptions
     def _show_about_dialog(self):
         dlg = AboutDialog(self)
@@ -348,20 +693,15 @@ class MainWindow(QMainWindow):
 
     @log_exceptions
     def _on_poll_interval_changed(self, index: int):
-        """콤보박스에서 폴링 간격을 바꾸면, 백그라운드 폴링을 재시작."""
+        """콤보박스에서 폴링 간격을 바꾸면, 실행 중인 폴링 스레드에 바로 반영."""
         interval = self.cb_poll.itemData(index)
-        core.stop_polling()             # 기존 폴링 중지
-        core.start_polling(interval)    # 새 간격으로 시작
-        # 상태 라벨이나 로그에 찍어줌
-        logger.info(f"Polling interval changed to {interval:.3f} s")
+        core.set_poll_interval(interval)
+        self.config.set("polling.interval", interval)
 
     @log_exceptions
     def _on_device_changed(self, index: int):
-        path = self.cb_device.itemData(index)
-        core.set_device(path)                           # core 쪽 디바이스 교체
-        core.stop_polling()                             # 폴링 스레드 재시작
-        core.start_polling(self.cb_poll.currentData())
-        self._refresh_info()                            # 상태바 갱신
+        # 진행 중 I/O 를 비우고 핸들 교체 + 폴링 재개 (I/O 워커에서) - 끝나면 TrayApp 이 설정 저장
+        self.tray_app.switch_device(self.cb_device.itemData(index))
 
     @log_exceptions
     def showEvent(self, event):
@@ -383,24 +723,294 @@ class MainWindow(QMainWindow):
         frame_geom.moveCenter(center_point)
         self.move(frame_geom.topLeft())
 
+#=============================
+class TrayApp(QObject):
+    """트레이 우선 시작: 트레이/공통 액션만 먼저 만들고 MainWindow 는 처음 열 때 생성"""
+    sceneCaptured = Signal(dict)    # 워커 스레드 → GUI
+    configChanged = Signal(dict)    # 설정 감시 스레드 → GUI: {키: 새 값}
+    deviceSwitched = Signal(bytes, str)  # I/O 워커 → GUI: (경로, 오류 - 성공이면 "")
+    @log_exceptions
+    def __init__(self, app: QApplication, osd: VolumeOSD, cfg: config.ConfigFile):
+        super().__init__(app)
+        self.osd = osd
+        self.window: MainWindow | None = None
+        self.ready_ms = None
+        self.config = cfg
+        cfg.on_change = self.configChanged.emit
+        self.configChanged.connect(self._apply_config)
+
+        # 테마(팔레트/QSS)는 OSD·트레이 메뉴에도 필요하므로 먼저 적용
+        self.theme_mgr = ThemeManager(app)
+        self.theme_mgr.apply(cfg.get("gui.theme"))
+        self.theme_mgr.themeChanged.connect(lambda mode: cfg.set("gui.theme", mode))
+
+        # ─── 공통 액션 정의
+        self.action_show = QAction("Show", self, triggered=self.show_window)
+        pause_group = QActionGroup(self)
+        pause_group.setExclusive(True)
+        self.pause_act  = QAction("Pause",  self, checkable=True)
+        self.resume_act = QAction("Resume", self, checkable=True)
+        pause_group.addAction(self.pause_act)
+        pause_group.addAction(self.resume_act)
+        self.resume_act.setChecked(True)
+        self.exit_act = QAction("Exit", self, triggered=QApplication.quit)
+
+        self.pause_act.triggered.connect(lambda _: self._set_paused(True))
+        self.resume_act.triggered.connect(lambda _: self._set_paused(False))
+
+        # ─── 트레이 아이콘 & 메뉴
+        self.icon = QIcon(str(ICON_PATH)) if ICON_PATH.exists() else app.style().standardIcon(QStyle.SP_ComputerIcon)
+        self.tray = QSystemTrayIcon(self.icon, self)
+        self.tray.setToolTip(APP_NAME)
+        # 상태가 들어오면 gain/mute 레벨 아이콘으로 교체 (테마·DPI별 아틀라스)
+        self.level = TrayLevelIndicator(self.tray, self.theme_mgr, APP_NAME, self)
+        core.add_state_listener(self.level.on_state)
+
+        # ─── 장면(프리셋) 메뉴 - 트레이와 MainWindow 메뉴바에서 공유
+        self.scenes = list(cfg.get("scenes"))
+        self.scenes_menu = QMenu("&Scenes")
+        self.scenes_menu.setAttribute(Qt.WA_StyledBackground, True)
+        self.sceneCaptured.connect(self._on_scene_captured)
+        self.deviceSwitched.connect(self._on_device_switched)
+
+        self.tray_menu = QMenu()
+        self.tray_menu.setAttribute(Qt.WA_StyledBackground, True)
+        self.tray_menu.addActions([self.action_show, self.pause_act, self.resume_act])
+        self.tray_menu.addSeparator()
+        self.tray_menu.addMenu(self.scenes_menu)
+        self.tray_menu.addSeparator()
+        # ─── 지연 추적 (입력 → HID write → OSD) - Perfetto 로 여는 JSON 저장
+        self.trace_act = QAction("Record trace", self, checkable=True)
+        tracing_on = os.getenv('MINIDSP_TRACE', '0') == '1' or cfg.get("tracing.enabled")
+        self.trace_act.setChecked(tracing_on)
+        core.set_tracing(tracing_on)
+        self.trace_act.toggled.connect(self._set_tracing)
+        self.tray_menu.addAction(self.trace_act)
+        self.tray_menu.addAction("Save trace", self._save_trace)
+        self.tray_menu.addAction(f"Profile {PROFILE_SECONDS:.0f} s", lambda: self.start_profile(PROFILE_SECONDS))
+        self.tray_menu.addSeparator()
+        self.tray_menu.addAction(self.exit_act)
+        self.tray.setContextMenu(self.tray_menu)
+        self.tray.activated.connect(
+            lambda reason: self.show_window() if reason == QSystemTrayIcon.Trigger else None
+        )
+        # 기기/폴링은 main() 이 시작할 때 설정 값으로, 나머지는 여기서 한 번에
+        self._apply_config({k: v for k, v in config.flatten(cfg.data).items()
+                            if k.split(".")[0] not in ("device", "polling", "startup", "gui", "tracing")})
+        self.tray.show()
+        self.ready_ms = (time.perf_counter() - STARTUP_T0) * 1000
+        logger.info("Tray ready in %.0f ms", self.ready_ms)
+
+    # ─── 설정 파일
+    @log_exceptions
+    def _apply_config(self, changes: dict):
+        """바뀐 키만 해당 서브시스템에 반영 (기기 재오픈·훅 재설치 없음)"""
+        for key, v in changes.items():
+            try:
+                if key == "device.path":
+                    if v:
+                        self.switch_device(v.encode())  # 핸들만 교체, 폴링은 이어서
+                elif key == "polling.interval":
+                    core.set_poll_interval(v)           # 실행 중인 폴러의 다음 주기부터
+                elif key == "hotkeys.media":
+                    core.enable_media_keys(v)           # 바인딩 테이블만 다시 컴파일
+                elif key == "hotkeys.alt":
+                    core.enable_alt_keys(v)
+                elif key == "hotkeys.shift":
+                    core.enable_shift_keys(v)
+                elif key == "hotkeys.paused":
+                    (self.pause_act if v else self.resume_act).setChecked(True)
+                    core.pause_hotkeys(v)
+                elif key == "volume.step_curve":
+                    core.set_step_curve(v)
+                elif key == "volume.acceleration":
+                    core.enable_acceleration(v)
+                elif key == "gui.theme":
+                    self.theme_mgr.apply(v, window=self.window)
+                elif key == "tracing.enabled":
+                    self.trace_act.setChecked(v)
+                elif key == "scenes":
+                    self.scenes = list(v)
+                    self._rebuild_scenes()
+                elif key == "bindings":
+                    core.set_bindings(v)
+                elif key.startswith("startup."):
+                    logger.info("Config %s changed - takes effect after restart", key)
+            except (RuntimeError, ValueError, KeyError, TypeError) as e:
+                logger.warning("Config %s = %r not applied: %s", key, v, e)
+        if self.window is not None:
+            self.window._sync_from_config(changes)
+
+    # ─── 기기 교체 (GUI 스레드는 기다리지 않음)
+    @log_exceptions
+    def switch_device(self, path: bytes):
+        def done(f):                                    # I/O 워커에서 호출
+            exc = f.exception()
+            self.deviceSwitched.emit(path, "" if exc is None else str(exc) or type(exc).__name__)
+        core.set_device(path).add_done_callback(done)
+
+    @log_exceptions
+    def _on_device_switched(self, path: bytes, error: str):
+        if error:
+            logger.warning("Device %r not opened: %s", path, error)
+            self.tray.showMessage(APP_NAME, f"Device not opened: {error}", QSystemTrayIcon.Warning, 3000)
+            if self.window is not None:                 # 콤보박스를 설정에 남아 있는 기기로 되돌림
+                self.window._sync_from_config({"device.path": self.config.get("device.path")})
+            return
+        self.config.set("device.path", path.decode())
+        if self.window is not None:
+            self.window._refresh_info()                 # 상태바 갱신
+
+    # ─── 핫키 바인딩
+    @log_exceptions
+    def store_bindings(self, bindings: list[dict]):
+        self.config.set("bindings", bindings)
+
+    # ─── 장면
+    @log_exceptions
+    def _store_scenes(self):
+        try:
+            self.config.set("scenes", self.scenes)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning("Scenes not saved: %s", e)
+            self.tray.showMessage(APP_NAME, f"Scenes not saved: {e}", QSystemTrayIcon.Warning, 3000)
+        self.scenes = list(self.config.get("scenes"))
+        self._rebuild_scenes()
+
+    @log_exceptions
+    def _rebuild_scenes(self):
+        core.set_scenes(self.scenes)
+        menu = self.scenes_menu
+        menu.clear()
+        for i, sc in enumerate(self.scenes):
+            hint = f"\tAlt+{i+1}" if i < 9 else ""
+            menu.addAction(f"{sc['name']}{hint}",
+                           lambda i=i: core._executor.submit(core.apply_scene, i))
+        if self.scenes:
+            menu.addSeparator()
+        menu.addAction("Save current as scene…", self._capture_scene)
+        if self.scenes:
+            delete = menu.addMenu("Delete")
+            for i, sc in enumerate(self.scenes):
+                delete.addAction(sc['name'], lambda i=i: self._delete_scene(i))
+
+    @log_exceptions
+    def _capture_scene(self):
+        name, ok = QInputDialog.getText(self.window, "Save scene", "Scene name:")
+        if ok and name.strip():
+            fut = core._executor.submit(core.capture_scene, name.strip())
+            fut.add_done_callback(lambda f: f.exception() or self.sceneCaptured.emit(f.result()))
+
+    @log_exceptions
+    def _on_scene_captured(self, scene: dict):
+        self.scenes = [s for s in self.scenes if s['name'] != scene['name']] + [scene]
+        self._store_scenes()
+
+    @log_exceptions
+    def _delete_scene(self, index: int):
+        del self.scenes[index]
+        self._store_scenes()
+
+    @log_exceptions
+    def _save_trace(self):
+        path = os.path.join(core.LOG_DIR, time.strftime("trace-%Y%m%d-%H%M%S.json"))
+        n = core.export_trace(path)
+        self.tray.showMessage(APP_NAME, f"Saved {n} trace events to {path}",
+                              QSystemTrayIcon.Information, 3000)
+
+    @log_exceptions
+    def start_profile(self, seconds: float):
+        """모든 스레드 샘플링 시작 - 끝나면 저장 위치를 알림"""
+        try:
+            paths = core.profile(seconds)
+        except RuntimeError as e:
+            self.tray.showMessage(APP_NAME, str(e), QSystemTrayIcon.Warning, 3000)
+            return
+        self.tray.showMessage(APP_NAME, f"Profiling all threads for {seconds:.0f} s",
+                              QSystemTrayIcon.Information, 2000)
+        QTimer.singleShot(int(seconds * 1000) + 500, lambda: self.tray.showMessage(
+            APP_NAME, "Saved profile to\n" + "\n".join(p + ".txt" for p in paths),
+            QSystemTrayIcon.Information, 5000))
+
+    @log_exceptions
+    def _set_tracing(self, flag: bool):
+        core.set_tracing(flag)
+        self.config.set("tracing.enabled", flag)
+
+    @log_exceptions
+    def _set_paused(self, flag: bool):
+        core.pause_hotkeys(flag)
+        self.config.set("hotkeys.paused", flag)
+        if self.window is not None:
+            self.window._refresh_info()
+
+    @log_exceptions
+    def show_window(self):
+        """설정 창은 처음 열 때 생성 (메뉴/테마/기기 열거 비용을 시작 경로에서 제외)"""
+        if self.window is None:
+            t0 = time.perf_counter()
+            self.window = MainWindow(self.osd, self)
+            self.window.tray_app = self
+            logger.info("MainWindow built in %.0f ms", (time.perf_counter() - t0) * 1000)
+        self.window._show_window()
+
+@log_exceptions
+def _settings_migration() -> dict:
+    """config 파일이 없을 때 한 번: 이전 버전이 QSettings 에 저장한 테마/바인딩/장면을 옮김"""
+    settings = QSettings("MyCompany", "miniDSP Gain Helper")
+    out = {"gui": {"theme": settings.value("theme", "dark") or "dark"}}
+    for key in ("bindings", "scenes"):
+        try:
+            value = json.loads(settings.value(key, "") or "null")
+        except (TypeError, ValueError):
+            logger.warning("Invalid %s in settings - not migrated", key)
+            continue
+        if value:
+            out[key] = value
+    return out
+
 @log_exceptions
 def main():
+    fr.open_recorder(core.LOG_DIR)                  # 상시 플라이트 레코더 (이전 링은 *.prev.ring)
     app = QApplication(sys.argv)                    # QApplication, OSD, Bridge, MainWindow 순서로 생성    
     #app.setAttribute(Qt.AA_DontUseNativeMenuBar)   # macOS native 메뉴바 비활성화 (mac 필수: 확인필요)
+    app.setQuitOnLastWindowClosed(False)            # 창 없이 트레이만으로 동작
+    cfg = config.ConfigFile(args.config)
+    cfg.load(_settings_migration)                   # 시작 시 한 번 파싱 (없으면 QSettings 에서 옮겨 생성)
+    engine = args.engine or cfg.get("startup.engine")
+    http = args.http or cfg.get("startup.http") or None
     osd = VolumeOSD()
+    tray = TrayApp(app, osd, cfg)                   # 트레이를 가장 먼저 표시 (핫키/장면/테마 설정 적용)
     bridge = IRBridge()
     bridge.gainChanged.connect(osd.popup)           # 브리지로 OSD.popup을 호출 연결
     
     core.set_gain_callback(bridge.gainChanged.emit) # core에 콜백 등록 
-    core.enable_media_keys(True)                    # Media키
-    core.enable_alt_keys(True)                      # Alt키
-    core.enable_shift_keys(True)                    # Shift키
-    core.start_polling(0.1)                         # 0.1초 minidsp 모니터 시작
+    dev_path = cfg.get("device.path").encode() or None   # 비어 있으면 캐시된 마지막 기기
+    interval = cfg.get("polling.interval")
+    if engine == 'process':                         # 기기 엔진을 별도 프로세스로 (GIL 분리)
+        if debug:
+            os.environ['MINIDSP_DEBUG'] = '1'
+        core.start_engine(dev_path, interval)       # 엔진이 캐시를 읽고 폴링까지 시작
+    else:
+        cached = core.load_state_cache()            # 캐시된 마지막 기기/상태로 웜 스타트
+        core.open_device(dev_path or cached)
+    core.start_shared_state()                       # 공유 메모리 상태 게시 (외부 리더용)
+    tray.level.on_state(core.get_state())           # 웜 스타트 캐시 값으로 트레이 아이콘 먼저 표시
+    if engine != 'process':
+        core.start_polling(interval)                # minidsp 모니터 시작 (기본 0.1초)
     core.install_keyboard_hooks()                   # 키보드 훅 Alt키, Media키, Shift키
 
-    win = MainWindow(osd)
-    win.show()
-    
+    if http:                                        # 선택: 로컬 HTTP/SSE 제어 서버
+        from remote_api import RemoteServer, parse_bind
+        remote = RemoteServer(*parse_bind(http))
+        remote.start()
+        app.aboutToQuit.connect(remote.stop)
+
+    if args.profile:                                # 시작 직후부터 프로파일 (기동/초기 폴링 포함)
+        tray.start_profile(args.profile)
+
+    cfg.watch()                                     # 이후 파일 변경은 바뀐 키만 적용
+    app.aboutToQuit.connect(cfg.stop)
     app.aboutToQuit.connect(core.stop_polling)
     sys.exit(app.exec())
 
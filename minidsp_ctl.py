@@ -0,0 +1,211 @@
+# minidsp_ctl.py
+# -*- coding: utf-8 -*-
+"""
+miniDSP Gain Helper - Command Line Controller
+===================================
+• minidsp-ctl get | set DB | step DELTA | mute [on|off|toggle] | watch
+• Qt / core3 를 import 하지 않음 (core3 는 import 만으로 로그 정리·Win32 훅 준비를 함)
+  - 필요한 모듈만 지연 import: 헬퍼 경로는 socket 만 (urllib/http.client 는 import 만 40 ms 이상),
+    직접 경로는 hid + protocol/transport
+• 헬퍼가 실행 중이면 그쪽으로 전달 (VolumeState 로직·OSD 유지)
+  1) --url / MINIDSP_URL, 2) cache/remote.json (헬퍼의 --http 서버가 남긴 주소)
+  3) 공유 메모리 상태 블록 (get/watch 만 - HTTP 없이 실행 중인 헬퍼)
+  없으면 기기와 직접 통신 (헬퍼가 폴링 중이면 리모컨 변경처럼 반영됨)
+• 출력: 한 줄 JSON (watch 는 변화마다 한 줄 - 파이프용)
+"""
+import argparse, json, os, sys, time
+
+BASE_DIR  = os.path.dirname(os.path.abspath(__file__))
+DISCOVERY = os.path.join(BASE_DIR, "cache", "remote.json")     # remote_api.discovery_path()
+HTTP_TIMEOUT = 2.0
+
+
+def _emit(obj):
+    sys.stdout.write(json.dumps(obj) + "\n")
+    sys.stdout.flush()
+
+
+# ─── 헬퍼 (HTTP API)
+def _helper_url(explicit: str | None) -> str | None:
+    url = explicit or os.getenv("MINIDSP_URL")
+    if url:
+        return url.rstrip("/")
+    try:
+        with open(DISCOVERY, encoding="utf-8") as f:
+            return json.load(f)["url"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+class HelperClient:
+    """remote_api 용 최소 HTTP/1.1 클라이언트 (Connection: close)"""
+    def __init__(self, url: str):
+        self.url = url
+        hostport = url.split("://", 1)[-1].split("/", 1)[0]
+        host, _, port = hostport.rpartition(":")
+        self.addr = (host or hostport, int(port) if host else 80)
+
+    def _open(self, method: str, path: str, body: bytes = b"", stream: bool = False):
+        import socket
+        sock = socket.create_connection(self.addr, timeout=HTTP_TIMEOUT)
+        sock.sendall(f"{method} {path} HTTP/1.1\r\nHost: {self.addr[0]}\r\n"
+                     f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+                     f"Connection: close\r\n\r\n".encode() + body)
+        f = sock.makefile("rb")
+        sock.close()                        # 파일 객체가 소켓을 계속 참조
+        status = f.readline().split(b" ", 2)
+        if len(status) < 2:
+            raise ConnectionError("empty reply from helper")
+        while f.readline() not in (b"\r\n", b"\n", b""):
+            pass                            # 헤더 건너뜀
+        if stream:
+            sock.settimeout(None)           # 이벤트 사이 대기 (heartbeat 15 s)
+        return int(status[1]), f
+
+    def _call(self, method: str, path: str, body: dict | None = None) -> dict:
+        code, f = self._open(method, path, b"" if body is None else json.dumps(body).encode())
+        with f:
+            data = json.loads(f.read() or b"{}")
+        if code != 200:
+            raise RuntimeError(f"helper answered {code}: {data.get('error', '')}")
+        return data
+
+    def get(self):
+        return self._call("GET", "/state")
+
+    def set(self, db):
+        return self._call("POST", "/gain", {"db": db})
+
+    def step(self, delta):
+        return self._call("POST", "/gain", {"delta": delta})
+
+    def mute(self, flag):
+        return self._call("POST", "/mute", {"muted": flag})
+
+    def watch(self, interval):
+        """SSE /events → data 줄을 그대로 JSON 한 줄로"""
+        code, f = self._open("GET", "/events", stream=True)
+        if code != 200:
+            raise RuntimeError(f"helper answered {code}")
+        with f:
+            while line := f.readline():
+                if line.startswith(b"data:"):
+                    _emit(json.loads(line[5:]))
+
+
+# ─── 공유 메모리 (HTTP 없이 실행 중인 헬퍼: 읽기 전용)
+class SharedStateClient:
+    def __init__(self):
+        from shared_state import StateReader
+        self._reader = StateReader()
+        if self._reader.read() is None:
+            raise RuntimeError("helper has not published state yet")
+
+    def get(self):
+        return self._reader.read()
+
+    def watch(self, interval):
+        seq = None
+        while True:
+            snap = self._reader.read()
+            if snap is not None and snap["seq"] != seq:
+                seq = snap["seq"]
+                _emit(snap)
+            time.sleep(interval)
+
+
+# ─── 직접 (헬퍼 없음)
+class DirectClient:
+    def __init__(self):
+        from transport import HidTransport
+        self._t = HidTransport()
+
+    def get(self):
+        return self._t.status()
+
+    def set(self, db):
+        self._t.set_gain(db)
+        return self._t.status()
+
+    def step(self, delta):
+        return self.set(self._t.status()["gain"] + delta)
+
+    def mute(self, flag):
+        if flag is None:
+            flag = not self._t.status()["digital_muted"]
+        self._t.set_mute(flag)
+        return self._t.status()
+
+    def watch(self, interval):
+        last = None
+        while True:
+            snap = self._t.status()
+            if snap != last:
+                last = snap
+                _emit(snap)
+            time.sleep(interval)
+
+
+def _fallback(read_only: bool):
+    """헬퍼 HTTP 가 없을 때: 공유 메모리(읽기 명령만) → 직접"""
+    if read_only:
+        try:
+            return SharedStateClient()
+        except (OSError, ValueError, RuntimeError, ImportError):
+            pass
+    return DirectClient()
+
+
+def _run(client, args):
+    if args.cmd == "get":
+        _emit(client.get())
+    elif args.cmd == "set":
+        _emit(client.set(args.db))
+    elif args.cmd == "step":
+        _emit(client.step(args.delta))
+    elif args.cmd == "mute":
+        _emit(client.mute({"on": True, "off": False, "toggle": None}[args.mode]))
+    else:
+        client.watch(args.interval)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="minidsp-ctl", description="Control miniDSP master gain and mute")
+    parser.add_argument("--url", help="helper HTTP API (default: MINIDSP_URL or the running helper)")
+    parser.add_argument("--direct", action="store_true", help="talk to the device even if a helper is running")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("get", help="print the current state")
+    p = sub.add_parser("set", help="set gain in dB")
+    p.add_argument("db", type=float)
+    p = sub.add_parser("step", help="change gain by DELTA dB")
+    p.add_argument("delta", type=float)
+    p = sub.add_parser("mute", help="mute, unmute or toggle")
+    p.add_argument("mode", nargs="?", choices=("on", "off", "toggle"), default="toggle")
+    p = sub.add_parser("watch", help="print a JSON line on every change")
+    p.add_argument("--interval", type=float, default=0.1, help="poll interval without a helper (s)")
+    args = parser.parse_args(argv)
+
+    read_only = args.cmd in ("get", "watch")
+    try:
+        url = None if args.direct else _helper_url(args.url)
+        try:
+            # 헬퍼 우선 - 연결이 안 되면(남은 remote.json 등) 다음 경로로
+            if url is None:
+                raise ConnectionRefusedError
+            _run(HelperClient(url), args)
+        except ConnectionRefusedError:
+            if args.url:
+                raise
+            _run(DirectClient() if args.direct else _fallback(read_only), args)
+    except KeyboardInterrupt:
+        return 130
+    except BrokenPipeError:                 # watch | head 등
+        return 0
+    except (OSError, RuntimeError, ValueError, ImportError) as e:
+        print(f"minidsp-ctl: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+# profiler.py
+# -*- coding: utf-8 -*-
+"""
+miniDSP Gain Helper - Sampling Profiler
+===================================
+• 현장에서 CPU 사용이 올라갈 때 재시작/디버거 없이 켜는 시간 제한 샘플링 프로파일러
+• "profiler" 스레드가 interval 마다 sys._current_frames() 로 모든 스레드의 스택을 채집
+  (minidsp-poll, minidsp-io 워커, hook-worker, Qt MainThread, remote-api …) - 대상 코드 계측 없음
+• 끝나면 LOG_DIR 에 저장
+  - profile-<시각>[-tag].collapsed : "스레드;바깥;…;안쪽 횟수" (speedscope / flamegraph.pl 로 열기)
+  - profile-<시각>[-tag].txt       : 스레드별 샘플 수, busy 비율, 상위 함수 (self / inclusive)
+• busy = 맨 안쪽 프레임이 대기(threading/queue/selectors, Qt 이벤트 루프) 가 아닌 샘플
+  - C 확장 안에서 막힌 시간(hid read 등)은 그 호출 함수의 busy 로 잡힘
+"""
+import collections, os, sys, threading, time
+
+INTERVAL = 0.005                # 200 Hz
+MAX_SECONDS = 300.0
+TOP = 15
+
+# 맨 안쪽 프레임이 여기면 대기 중으로 봄
+IDLE_FILES = {"threading.py", "queue.py", "selectors.py",
+              "connection.py"}  # multiprocessing 파이프 대기 (엔진 프로세스 메인 스레드)
+IDLE_FUNCS = set()              # (파일 이름, 함수 이름) - 예: Qt 이벤트 루프를 돌리는 main.py:main
+
+_active = None
+_active_lock = threading.Lock()
+
+
+def _idle(label: str) -> bool:
+    """맨 안쪽 프레임 라벨 "func (file:line)" 이 대기 중인 곳인지"""
+    func, _, where = label.rpartition(" (")
+    name = where.rsplit(":", 1)[0]
+    return name in IDLE_FILES or (name, func) in IDLE_FUNCS
+
+
+class Sampler:
+    def __init__(self, seconds: float, base: str, interval: float = INTERVAL):
+        self.seconds = min(float(seconds), MAX_SECONDS)
+        self.base = base
+        self.interval = interval
+        self.counts = collections.Counter()         # (스레드 이름, 스택 튜플) → 샘플 수
+        self.samples = 0
+        self.elapsed = 0.0
+        self._labels = {}                           # code → "func (file:line)"
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+
+    @property
+    def running(self) -> bool:
+        return self._thread.is_alive()
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    # ─── 채집
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = \
+                f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+        return label
+
+    def _sample(self, me: int):
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == me:
+                continue
+            thread = names.get(ident, f"thread-{ident}")
+            stack = []
+            while frame is not None:
+                stack.append(self._label(frame.f_code))
+                frame = frame.f_back
+            self.counts[(thread, tuple(reversed(stack)))] += 1
+        self.samples += 1
+
+    def _run(self):
+        me = threading.get_ident()
+        t0 = time.perf_counter()
+        deadline = t0 + self.seconds
+        while not self._stop.is_set() and time.perf_counter() < deadline:
+            self._sample(me)
+            self._stop.wait(self.interval)
+        self.elapsed = time.perf_counter() - t0
+        self.write()
+
+    # ─── 저장
+    def collapsed(self) -> list[str]:
+        return [f"{';'.join((thread,) + stack)} {n}".replace("\n", " ")
+                for (thread, stack), n in sorted(self.counts.items())]
+
+    def summary(self) -> list[str]:
+        """스레드별 (busy 샘플이 많은 순) 상위 함수 - self 는 맨 안쪽, incl 은 스택 어디든"""
+        total, busy = collections.Counter(), collections.Counter()
+        own = collections.defaultdict(collections.Counter)
+        incl = collections.defaultdict(collections.Counter)
+        for (thread, stack), n in self.counts.items():
+            total[thread] += n
+            if _idle(stack[-1]):
+                continue
+            busy[thread] += n
+            own[thread][stack[-1]] += n
+            for label in set(stack):
+                incl[thread][label] += n
+        rate = self.samples / self.elapsed if self.elapsed else 0.0
+        lines = [f"{self.samples} samples in {self.elapsed:.1f} s ({rate:.0f} Hz), "
+                 f"{len(total)} threads", ""]
+        for thread in sorted(total, key=lambda t: (-busy[t], t)):
+            lines.append(f"[{thread}] {total[thread]} samples, "
+                         f"busy {busy[thread]} ({100 * busy[thread] / total[thread]:.0f}%)")
+            if not busy[thread]:
+                lines.append("")
+                continue
+            own_t, incl_t = own[thread], incl[thread]
+            lines.append(f"  {'self':>6} {'incl':>6}  function")
+            for label, n in own_t.most_common(TOP):
+                lines.append(f"  {n:>6} {incl_t[label]:>6}  {label}")
+            # 직접 CPU 를 쓰지는 않지만 많이 거쳐 간 호출자
+            rest = [(label, n) for label, n in incl_t.most_common(TOP) if label not in own_t]
+            for label, n in rest[:5]:
+                lines.append(f"  {'':>6} {n:>6}  {label}")
+            lines.append("")
+        return lines
+
+    def write(self):
+        os.makedirs(os.path.dirname(self.base) or ".", exist_ok=True)
+        with open(self.base + ".collapsed", "w", encoding="utf-8") as f:
+            f.write("\n".join(self.collapsed()) + "\n")
+        with open(self.base + ".txt", "w", encoding="utf-8") as f:
+            f.write("\n".join(self.summary()) + "\n")
+
+
+def start(seconds: float, out_dir: str, tag: str = "", interval: float = INTERVAL) -> str:
+    """seconds 동안 이 프로세스의 모든 스레드를 샘플링 (백그라운드) → 저장될 경로 (확장자 제외)"""
+    global _active
+    with _active_lock:
+        if _active is not None and _active.running:
+            raise RuntimeError("a profile is already being recorded")
+        name = time.strftime("profile-%Y%m%d-%H%M%S") + (f"-{tag}" if tag else "")
+        _active = Sampler(seconds, os.path.join(out_dir, name), interval)
+        _active.start()
+        return _active.base
+
+
+def running() -> bool:
+    return _active is not None and _active.running
+
+
+def stop():
+    """진행 중인 프로파일을 일찍 끝냄 (그때까지의 샘플은 저장)"""
+    if _active is not None:
+        _active.stop()
@@ -0,0 +1,118 @@
+# protocol.py
+# -*- coding: utf-8 -*-
+"""
+miniDSP Gain Helper - HID Protocol
+===================================
+• 프레임 형식: [len] + body + [checksum] (len 은 자기 자신 포함), 출력 리포트는 0x00 + 64바이트(0xFF 채움)
+• 요청 프레임 생성 / 응답 검증·매칭 / 상태 블록 해석만 - I/O·스레드·로깅 없음
+• 응답 검증: 길이 바이트 범위, 체크섬, 값 범위 (gain 0..254, mute 0/1) - 어긋나면 FrameError
+• core3 와 minidsp_ctl(Qt·core3 없이 실행되는 CLI)이 함께 사용
+"""
+
+VIDS = {0x2752, 0x04D8}         # minidsp 구형 기기 0x04D8
+PIDS = {0x0011, 0x0044, 0x003F} # 디락활성화 전/후
+
+MASTER_STATUS = 0xFFD8          # preset, source, volume, mute
+MASTER_GAIN   = 0xFFDA          # volume, mute
+GAIN_MIN, GAIN_MAX = -127.0, 0.0
+RAW_MAX = 254                   # -127 dB
+
+# FrameError.reason
+BAD_LENGTH, BAD_CHECKSUM, BAD_VALUE = "bad_length", "bad_checksum", "bad_value"
+
+CHK = lambda *b: sum(b) & 0xFF
+PAD = lambda p: b"\x00" + p.ljust(64, b"\xFF")
+
+
+def frame(*body: int) -> bytes:
+    """[len] + body + [checksum] 프레임 (len 은 자기 자신 포함)"""
+    data = bytes([len(body) + 1, *body])
+    return data + bytes([CHK(*data)])
+
+
+class FrameError(ValueError):
+    """응답 프레임이 손상되었거나 불가능한 값 - reason 은 BAD_* 중 하나"""
+    def __init__(self, reason: str, detail: str = ""):
+        super().__init__(f"{reason}: {detail}" if detail else reason)
+        self.reason = reason
+
+
+def check_frame(r: bytes) -> bytes:
+    """선행 0x00 을 뗀 응답 r 의 길이/체크섬 확인 → 프레임 부분 ([len] .. [checksum] 제외)"""
+    n = r[0] if r else 0
+    if n < 2 or n >= len(r):
+        raise FrameError(BAD_LENGTH, f"len byte {n} for {len(r)}-byte report")
+    if CHK(*r[:n]) != r[n]:
+        raise FrameError(BAD_CHECKSUM, f"{CHK(*r[:n]):02X} != {r[n]:02X}")
+    return bytes(r[:n])
+
+
+def is_minidsp(info: dict) -> bool:
+    return info['vendor_id'] in VIDS and info['product_id'] in PIDS
+
+
+# ─── gain / mute
+def db_to_raw(db: float) -> int:
+    """dB → 0x42 값 (0.5 dB 단위, 0 = 0 dB)"""
+    return int(round(-2 * max(min(db, GAIN_MAX), GAIN_MIN)))
+
+def raw_to_db(raw: int) -> float:
+    return 0.0 - 0.5 * raw          # raw 0 → 0.0 (-0.0 이 아니라 - OSD/JSON 표시용)
+
+def gain_request(db: float) -> bytes:
+    return PAD(frame(0x42, db_to_raw(db)))
+
+def mute_request(muted: bool) -> bytes:
+    return PAD(frame(0x17, 0x01 if muted else 0x00))
+
+
+# ─── 메모리 읽기 (0x05)
+def memory_request(addr: int, size: int) -> bytes:
+    return PAD(frame(0x05, addr >> 8, addr & 0xFF, size))
+
+def is_reply(r: bytes, code: int, addr: int) -> bool:
+    """응답 r(선행 0x00 제거 후)의 머리가 addr 에 대한 code(0x05 메모리 / 0x14 레지스터) 응답인지 (검증 전)"""
+    return len(r) > 4 and r[1] == code and (r[2] << 8 | r[3]) == addr
+
+def is_memory_reply(r: bytes, addr: int) -> bool:
+    return is_reply(r, 0x05, addr)
+
+def reply_match(code: int, addr: int, parse=check_frame, on_reject=None):
+    """
+    addr 에 대한 code 응답이면서 parse(r) 를 통과하는지 - 손상된 프레임은 건너뜀
+    on_reject(r, FrameError): 머리는 맞지만 검증에서 거절된 프레임 (호출자 쪽 통계/로그)
+    """
+    def match(r):
+        if not is_reply(r, code, addr):
+            return False
+        try:
+            parse(r)
+        except FrameError as e:
+            if on_reject is not None:
+                on_reject(r, e)
+            return False
+        return True
+    return match
+
+def memory_match(addr: int, parse=check_frame, on_reject=None):
+    return reply_match(0x05, addr, parse, on_reject)
+
+def parse_gain(r: bytes) -> tuple[int, bool]:
+    """MASTER_GAIN 응답 (volume, mute) → (raw, muted) - 손상/불가능한 값이면 FrameError"""
+    f = check_frame(r)
+    if len(f) < 6:
+        raise FrameError(BAD_LENGTH, f"{len(f) - 4} data bytes")
+    vol, mute = f[4], f[5]
+    if vol > RAW_MAX or mute > 1:
+        raise FrameError(BAD_VALUE, f"volume={vol} mute={mute}")
+    return vol, bool(mute)
+
+def parse_status(r: bytes) -> dict:
+    """MASTER_STATUS 4바이트 응답 → {"preset", "source", "gain", "digital_muted"}"""
+    f = check_frame(r)
+    if len(f) < 8:
+        raise FrameError(BAD_LENGTH, f"{len(f) - 4} data bytes")
+    preset, source, vol, mute = f[4:8]
+    if vol > RAW_MAX or mute > 1:
+        raise FrameError(BAD_VALUE, f"volume={vol} mute={mute}")
+    return {"preset": preset, "source": source, "gain": raw_to_db(vol), "digital_muted": bool(mute)}
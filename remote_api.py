@@ -0,0 +1,254 @@
+# remote_api.py
+# -*- coding: utf-8 -*-
+"""
+miniDSP Gain Helper - HTTP API
+===================================
+• 루프백(또는 지정 인터페이스)에서 동작하는 내장 HTTP 서버 (선택 사항)
+• GET /state, POST /gain, POST /mute → VolumeState 로 라우팅
+• GET /events : 폴링 루프가 감지한 변화를 SSE 로 푸시
+• asyncio 이벤트 루프 스레드 하나로 처리 - 대기 중인 구독자는 소켓 하나 비용
+• 실행 중에는 cache/remote.json 에 주소를 남김 → minidsp_ctl 이 찾아서 명령을 보냄
+"""
+import asyncio, json, math, os, threading
+import core3 as core
+import tracing
+from core3 import log_exceptions, logger
+
+MAX_BODY       = 4096      # POST 본문 최대 크기 (bytes)
+SSE_HEARTBEAT  = 15.0      # 프록시/브라우저 연결 유지용 코멘트 간격 (s)
+SSE_MAX_BUFFER = 64*1024   # 이보다 밀린 구독자는 끊음 (느린 클라이언트 보호)
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found",
+            405: "Method Not Allowed", 413: "Payload Too Large",
+            500: "Internal Server Error"}
+
+
+class RemoteServer:
+    """단일 스레드 asyncio HTTP/SSE 서버"""
+    @log_exceptions
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765):
+        self.host = host
+        self.port = port
+        self._loop    = None
+        self._server  = None
+        self._thread  = None
+        self._ready   = threading.Event()
+        self._subscribers: set[asyncio.StreamWriter] = set()
+
+    # ─── 수명 관리
+    @log_exceptions
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._ready.clear()
+        self._thread = threading.Thread(target=self._run, name="remote-api", daemon=True)
+        self._thread.start()
+        self._ready.wait(2.0)
+        core.add_state_listener(self._on_state)
+        self._write_discovery()
+
+    @log_exceptions
+    def stop(self):
+        core.remove_state_listener(self._on_state)
+        self._remove_discovery()
+        if self._loop and self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread:
+            self._thread.join(2.0)
+        self._thread = None
+
+    # ─── 주소 공개 (minidsp_ctl 용)
+    def _write_discovery(self):
+        if self._server is None:
+            return
+        host = "127.0.0.1" if self.host in ("", "0.0.0.0", "::") else self.host
+        try:
+            os.makedirs(core.CACHE_DIR, exist_ok=True)
+            with open(discovery_path(), "w", encoding="utf-8") as f:
+                json.dump({"pid": os.getpid(), "url": f"http://{host}:{self.port}"}, f)
+        except OSError as e:
+            logger.warning("Remote API address not published: %s", e)
+
+    def _remove_discovery(self):
+        try:
+            with open(discovery_path(), encoding="utf-8") as f:
+                mine = json.load(f).get("pid") == os.getpid()
+            if mine:
+                os.remove(discovery_path())
+        except (OSError, ValueError):
+            pass
+
+    @log_exceptions
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._server = self._loop.run_until_complete(
+                asyncio.start_server(self._handle_client, self.host, self.port)
+            )
+            self.port = self._server.sockets[0].getsockname()[1]     # port 0 → 실제 포트
+            logger.info("Remote API listening on http://%s:%d", self.host, self.port)
+            self._loop.call_later(SSE_HEARTBEAT, self._heartbeat)
+            self._ready.set()
+            self._loop.run_forever()
+        finally:
+            self._ready.set()
+            for w in list(self._subscribers):
+                w.close()
+            self._subscribers.clear()
+            if self._server:
+                self._server.close()
+            self._loop.close()
+
+    # ─── 폴링 스레드 → 이벤트 루프
+    def _on_state(self, snap: dict):
+        """폴링 스레드에서 호출: 이벤트 루프에 브로드캐스트만 예약"""
+        loop = self._loop
+        if loop is not None and loop.is_running() and self._subscribers:
+            loop.call_soon_threadsafe(self._broadcast, snap)
+
+    def _broadcast(self, snap: dict):
+        self._send_all(b"event: state\ndata: " + json.dumps(snap).encode() + b"\n\n")
+
+    def _heartbeat(self):
+        self._send_all(b": ping\n\n")
+        self._loop.call_later(SSE_HEARTBEAT, self._heartbeat)
+
+    def _send_all(self, chunk: bytes):
+        for w in list(self._subscribers):
+            if w.is_closing() or w.transport.get_write_buffer_size() > SSE_MAX_BUFFER:
+                self._subscribers.discard(w)
+                w.close()
+                continue
+            w.write(chunk)
+
+    # ─── HTTP 처리
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+            try:
+                method, target, headers = _parse_head(head)
+            except ValueError:
+                return                      # HTTP 요청이 아님 - 응답 없이 닫음
+            try:
+                length = int(headers.get("content-length", "0") or 0)
+            except ValueError:
+                length = -1
+            if length < 0:
+                return self._respond(writer, 400, {"error": "invalid Content-Length"})
+            if length > MAX_BODY:
+                return self._respond(writer, 413, {"error": "body too large"})
+            body = await reader.readexactly(length) if length else b""
+            path = target.split("?", 1)[0]
+
+            if path == "/events" and method == "GET":
+                await self._serve_events(reader, writer)
+                return
+            status, payload = await self._route(method, path, body)
+            self._respond(writer, status, payload)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except Exception:
+            logger.exception("Remote API request failed")
+            self._respond(writer, 500, {"error": "internal error"})
+        finally:
+            if writer not in self._subscribers:
+                writer.close()
+
+    async def _route(self, method: str, path: str, body: bytes):
+        if path == "/state":
+            if method != "GET":
+                return 405, {"error": "use GET"}
+            return 200, core.get_state()
+
+        if path in ("/gain", "/mute"):
+            if method != "POST":
+                return 405, {"error": "use POST"}
+            try:
+                req = json.loads(body or b"{}")
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                return 400, {"error": "invalid JSON"}
+            if not isinstance(req, dict):
+                return 400, {"error": "expected a JSON object"}
+
+            if path == "/gain":
+                key = "db" if "db" in req else "delta" if "delta" in req else None
+                if key is None:
+                    return 400, {"error": "expected 'db' or 'delta'"}
+                value = req[key]
+                if not _finite(value):
+                    return 400, {"error": f"'{key}' must be a finite number"}
+                fn, arg = (core.set_gain if key == "db" else core.adjust_gain), float(value)
+            else:
+                arg = req.get("muted")
+                if arg is not None and not isinstance(arg, bool):
+                    return 400, {"error": "'muted' must be true, false or null"}
+                fn = core.set_mute
+
+            tracing.begin()                 # 요청 하나 = trace 하나
+            fut = core._executor.submit(tracing.bind(fn), arg)
+
+            # HID I/O 는 핫키와 같은 워커에서 직렬화 - 이벤트 루프는 막지 않음
+            await asyncio.wrap_future(fut)
+            return 200, core.get_state()
+
+        return 404, {"error": "not found"}
+
+    async def _serve_events(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/event-stream\r\n"
+            b"Cache-Control: no-cache\r\n"
+            b"Connection: keep-alive\r\n\r\n"
+            b"event: state\ndata: " + json.dumps(core.get_state()).encode() + b"\n\n"
+        )
+        self._subscribers.add(writer)
+        try:
+            # 클라이언트가 끊을 때까지 대기만 함 (추가 비용 없음)
+            while await reader.read(1024):
+                pass
+        finally:
+            self._subscribers.discard(writer)
+            writer.close()
+
+    def _respond(self, writer: asyncio.StreamWriter, status: int, payload: dict):
+        data = json.dumps(payload).encode()
+        writer.write(
+            f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: close\r\n\r\n".encode() + data
+        )
+
+
+def _parse_head(head: bytes) -> tuple[str, str, dict]:
+    """요청 줄 + 헤더 → (method, target, {소문자 이름: 값}) - 요청 줄이 깨졌으면 ValueError"""
+    lines = head.decode("latin-1").split("\r\n")
+    method, target, _ = lines[0].split(" ", 2)
+    headers = {}
+    for ln in lines[1:]:
+        if ":" in ln:
+            k, v = ln.split(":", 1)
+            headers[k.strip().lower()] = v.strip()
+    return method, target, headers
+
+
+def _finite(value) -> bool:
+    """JSON 숫자이면서 유한한지 (bool 과 NaN/Infinity 는 거부)"""
+    if not isinstance(value, (int, float)) or isinstance(value, bool):
+        return False
+    try:
+        return math.isfinite(value)
+    except OverflowError:                   # float 로 못 바꾸는 큰 정수
+        return False
+
+
+def discovery_path() -> str:
+    return os.path.join(core.CACHE_DIR, "remote.json")
+
+
+@log_exceptions
+def parse_bind(value: str) -> tuple[str, int]:
+    """'8765' 또는 'HOST:PORT' → (host, port). 호스트 생략 시 루프백"""
+    host, _, port = value.rpartition(":")
+    return (host or "127.0.0.1"), int(port)
@@ -0,0 +1,126 @@
+# shared_state.py
+# -*- coding: utf-8 -*-
+"""
+miniDSP Gain Helper - Shared State
+===================================
+• 코어가 최신 상태(gain, mute 플래그, 기기 id, 시퀀스, 타임스탬프)를
+  이름 있는 공유 메모리 블록에 게시 - 다른 프로세스는 IPC 없이 바로 읽음
+• seqlock: 쓰는 중엔 seq 가 홀수, 읽기 전후 seq 가 같고 짝수면 일관된 스냅샷
+  - seq 는 8바이트 한 번에 읽고 씀 (struct 는 바이트 단위로 써서 자리올림 중간값이 보일 수 있음)
+• 리더는 core3/Qt 를 import 하지 않음 (오버레이·스트림덱 등에서 그대로 사용)
+
+    from shared_state import StateReader
+    with StateReader() as r:
+        print(r.read())
+"""
+import struct, sys, time
+from multiprocessing import shared_memory
+
+SHM_NAME = "minidsp_state"
+MAGIC    = b"MDSS"
+VERSION  = 1
+# magic, version, seq, gain, flags, device_id, timestamp
+LAYOUT   = struct.Struct("<4sH2xQdIId")
+SEQ_OFF  = 8
+SEQ_IDX  = SEQ_OFF // 8                     # seq 를 "Q" 배열로 본 인덱스 (정렬된 8바이트)
+BODY     = struct.Struct("<dIId")           # seq 뒤 본문
+BODY_OFF = 16
+SIZE     = 64
+
+FLAG_KB_MUTED, FLAG_DIG_MUTED, FLAG_PAUSED = 0x1, 0x2, 0x4
+
+SPIN_BEFORE_YIELD = 16                      # 이만큼 연속 실패하면 이후로는 매번 양보
+YIELD_S  = 0.0001
+
+
+class StateWriter:
+    """단일 게시자 (core 의 state listener 로 등록)"""
+    def __init__(self, name: str = SHM_NAME):
+        try:
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=SIZE)
+        except FileExistsError:
+            # 이전 실행이 비정상 종료로 남긴 블록 재사용
+            self._shm = shared_memory.SharedMemory(name=name)
+        self._buf = self._shm.buf
+        self._seqv = self._buf.cast("Q")
+        self._seq = 0
+        LAYOUT.pack_into(self._buf, 0, MAGIC, VERSION, 0, 0.0, 0, 0, 0.0)
+
+    def publish(self, snap: dict):
+        flags = ((FLAG_KB_MUTED if snap.get("keyboard_muted") else 0)
+                 | (FLAG_DIG_MUTED if snap.get("digital_muted") else 0)
+                 | (FLAG_PAUSED if snap.get("paused") else 0))
+        gain = snap.get("gain")
+        self._seq += 1                          # 홀수: 쓰는 중
+        self._seqv[SEQ_IDX] = self._seq
+        BODY.pack_into(self._buf, BODY_OFF,
+                       float("nan") if gain is None else gain,
+                       flags, snap.get("device_id") or 0, time.time())
+        self._seq += 1                          # 짝수: 완료
+        self._seqv[SEQ_IDX] = self._seq
+
+    def close(self):
+        self._seqv.release()
+        self._buf = None
+        self._shm.close()
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class StateReader:
+    """여러 리더가 동시에 읽어도 됨 - 읽기는 메모리 복사뿐"""
+    def __init__(self, name: str = SHM_NAME):
+        self._shm = shared_memory.SharedMemory(name=name)
+        if sys.platform != "win32":
+            # POSIX: 리더 종료 시 resource_tracker 가 블록을 unlink 하지 않도록
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(self._shm._name, "shared_memory")
+        self._buf = self._shm.buf
+        if bytes(self._buf[:4]) != MAGIC:
+            self._shm.close()
+            raise ValueError("shared state block has unexpected layout")
+        self._seqv = self._buf.cast("Q")
+
+    def read(self, spins: int = 1000) -> dict | None:
+        """일관된 스냅샷 반환 (게시된 적 없으면 None)"""
+        buf, seqv = self._buf, self._seqv
+        for i in range(spins):
+            if i >= SPIN_BEFORE_YIELD:
+                # 쓰는 쪽이 쓰는 도중 선점됐으면(코어가 하나뿐일 때 등) 스핀해도 끝나지 않음 - 양보
+                time.sleep(YIELD_S)
+            s1 = seqv[SEQ_IDX]
+            if s1 & 1:
+                continue
+            gain, flags, dev_id, ts = BODY.unpack_from(buf, BODY_OFF)
+            if seqv[SEQ_IDX] == s1:
+                if s1 == 0:
+                    return None
+                return {
+                    "seq":            s1 // 2,
+                    "gain":           None if gain != gain else gain,
+                    "keyboard_muted": bool(flags & FLAG_KB_MUTED),
+                    "digital_muted":  bool(flags & FLAG_DIG_MUTED),
+                    "paused":         bool(flags & FLAG_PAUSED),
+                    "device_id":      dev_id,
+                    "timestamp":      ts,
+                }
+        raise TimeoutError("writer kept the seqlock busy")
+
+    def close(self):
+        self._seqv.release()
+        self._buf = None
+        self._shm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_state(name: str = SHM_NAME) -> dict | None:
+    """한 번만 읽을 때 쓰는 편의 함수"""
+    with StateReader(name) as r:
+        return r.read()
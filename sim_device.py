@@ -0,0 +1,104 @@
+# sim_device.py
+# -*- coding: utf-8 -*-
+"""
+miniDSP Gain Helper - Simulated Device
+===================================
+• hid.Device 와 같은 write / read / close 인터페이스를 가진 가상 miniDSP
+• 마스터 gain(0x42), 디지털 뮤트(0x17), 메모리 읽기(0x05 @ 0xFFD8-0xFFDB),
+  float 읽기/쓰기(0x14 / 0x13 0x80) 지원 - 출력 채널 gain/mute 포함
+• MINIDSP_SIM=1 이면 core3.open_device() 가 실제 기기 대신 사용
+"""
+import collections, random, struct, threading
+
+SIM_PATH = b"sim://minidsp"
+SIM_INFO = {
+    'path': SIM_PATH, 'vendor_id': 0x2752, 'product_id': 0x0011,
+    'product_string': "miniDSP (simulated)", 'serial_number': "SIM0001",
+}
+
+
+def _frame(*body: int) -> bytes:
+    """[len] + body + [checksum] (len 은 자기 자신 포함)"""
+    data = bytes([len(body) + 1, *body])
+    return data + bytes([sum(data) & 0xFF])
+
+
+class SimulatedDevice:
+    """
+    busy_rate: write 가 '장치 바쁨' 예외를 낼 확률 (흐름 제어 검증용)
+    busy_exc : 그때 던질 예외 클래스 (보통 hid.HIDException)
+    blocking : False 면 read 가 응답이 없어도 기다리지 않음 (가상 시간에서 실행할 때)
+    """
+    def __init__(self, gain_val: int = 60, busy_rate: float = 0.0, busy_exc=OSError,
+                 blocking: bool = True):
+        self.gain_val = gain_val            # 0.5 dB 단위 (60 → -30 dB)
+        self.muted = False
+        self.preset, self.source = 0, 0
+        self.memory: dict[int, bytes] = {}  # float/int 레지스터 (4 bytes LE)
+        self.busy_rate = busy_rate
+        self.busy_exc = busy_exc
+        self.blocking = blocking
+        self.writes = 0
+        self.closed = False
+        self._in = collections.deque()
+        self._cv = threading.Condition()
+
+    # ─── 리모컨/노브 조작 흉내
+    def set_remote(self, db: float | None = None, muted: bool | None = None):
+        if db is not None:
+            self.gain_val = max(0, min(254, int(round(-2 * db))))
+        if muted is not None:
+            self.muted = bool(muted)
+
+    # ─── hid.Device 인터페이스
+    def write(self, data: bytes) -> int:
+        if self.closed:
+            raise self.busy_exc("device closed")
+        if self.busy_rate and random.random() < self.busy_rate:
+            raise self.busy_exc("write error 0x000003E5 (simulated busy)")
+        self.writes += 1
+        p = bytes(data)
+        if p[:1] == b"\x00":
+            p = p[1:]
+        n = p[0]
+        body = p[1:n]
+        self._handle(body)
+        return len(data)
+
+    def read(self, size: int, timeout: int | None = None) -> bytes:
+        with self._cv:
+            if not self._in and timeout and self.blocking:
+                self._cv.wait(timeout / 1000)
+            if not self._in:
+                return b""
+            return self._in.popleft()[:size]
+
+    def close(self):
+        self.closed = True
+
+    # ─── 명령 처리
+    def _reply(self, frame: bytes):
+        with self._cv:
+            self._in.append(frame.ljust(64, b"\x00"))
+            self._cv.notify()
+
+    def _handle(self, body: bytes):
+        cmd = body[0]
+        if cmd == 0x42:                                  # 마스터 gain
+            self.gain_val = body[1]
+        elif cmd == 0x17:                                # 디지털 뮤트
+            self.muted = bool(body[1])
+        elif cmd == 0x05:                                # 메모리 읽기
+            addr, size = (body[1] << 8) | body[2], body[3]
+            status = {0xFFD8: self.preset, 0xFFD9: self.source,
+                      0xFFDA: self.gain_val, 0xFFDB: int(self.muted)}
+            data = [status.get(addr + i, 0) for i in range(size)]
+            self._reply(_frame(0x05, body[1], body[2], *data))
+        elif cmd == 0x14:                                # float 읽기
+            addr = (body[1] << 8) | body[2]
+            count = body[3]
+            data = b"".join(self.memory.get(addr + i, struct.pack("<f", 0.0)) for i in range(count))
+            self._reply(_frame(0x14, body[1], body[2], *data))
+        elif cmd == 0x13 and body[1] == 0x80:            # float/int 쓰기
+            addr = (body[2] << 8) | body[3]
+            self.memory[addr] = bytes(body[4:8])
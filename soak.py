@@ -0,0 +1,376 @@
+# soak.py
+# -*- coding: utf-8 -*-
+"""
+miniDSP Gain Helper - Soak Harness
+===================================
+• 시뮬레이션 기기(sim_device) + 가상 시간(clock.VirtualClock)으로 core 를 몇 주 분량 실행
+  - 무작위 이벤트 주입: 핫키(훅 링 → hook-worker), 리모컨/노브(기기 쪽 값 변경), 기기 오류
+    (쓰기 실패 구간·분리/재연결), 폴링 재시작·간격 변경, 장면 적용, 선택: HTTP 요청
+  - --qt: offscreen Qt 에서 VolumeOSD 까지 (gain 콜백 → 시그널 → popup)
+• 주기적으로 RSS / 스레드 / 핸들 / Python 객체·Future 수 / executor·훅 큐 깊이 샘플링
+• 워밍업 이후 구간의 선형 추세(최소제곱 기울기)가 한도를 넘으면 실패 (종료 코드 1)
+• 리포트: logs/soak-YYYYmmdd-HHMMSS.json (샘플 전체 + 지표별 추세 + 판정)
+
+    MINIDSP_SIM 은 자동으로 켜짐 - 실제 기기·키보드 훅·캐시 파일은 건드리지 않음
+    python soak.py --hours 168                  # 가상 1주
+    python soak.py --clock real --hours 0.5 --qt --http 0
+"""
+import argparse, gc, json, os, random, sys, tempfile, threading, time, urllib.request
+from concurrent.futures import Future
+
+os.environ["MINIDSP_SIM"] = "1"
+os.environ.setdefault("MINIDSP_LOG_NAME", "soak")
+
+import core3 as core
+import hook_ring
+import clock
+
+# 워밍업 이후 측정 구간 전체에 걸친 추세 증가분 한도 (이보다 크면 누수로 판정)
+LIMITS = {
+    "rss_mb":         8.0,
+    "threads":        0.5,
+    "handles":        4.0,
+    "gc_objects":     5000.0,
+    "futures":        16.0,
+    "executor_queue": 4.0,
+    "hook_pending":   4.0,
+    "qt_objects":     8.0,
+}
+
+# 가상 초당 평균 이벤트 수
+RATES = {
+    "key":      2.0,
+    "remote":   0.2,
+    "busy":     0.002,
+    "unplug":   0.0005,
+    "interval": 0.001,
+    "restart":  0.001,
+    "scene":    0.01,
+    "http":     0.5,
+}
+
+
+# ─── 프로세스 자원
+def _rss_mb() -> float | None:
+    """현재 Working Set / RSS (MB) - 최대치가 아니라 현재 값"""
+    if sys.platform == "win32":
+        import ctypes
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [("cb", ctypes.c_ulong), ("PageFaultCount", ctypes.c_ulong),
+                        ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                        ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+        pmc = PROCESS_MEMORY_COUNTERS()
+        pmc.cb = ctypes.sizeof(pmc)
+        if ctypes.windll.psapi.GetProcessMemoryInfo(
+                ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(pmc), pmc.cb):
+            return pmc.WorkingSetSize / (1024*1024)
+        return None
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024*1024)
+    except (OSError, ValueError):
+        return None
+
+
+def _handles() -> int | None:
+    if sys.platform == "win32":
+        import ctypes
+        n = ctypes.c_ulong()
+        if ctypes.windll.kernel32.GetProcessHandleCount(
+                ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(n)):
+            return n.value
+        return None
+    try:
+        return len(os.listdir("/proc/self/fd"))
+    except OSError:
+        return None
+
+
+# ─── 추세
+def _slope(xs: list[float], ys: list[float]) -> float:
+    n = len(xs)
+    mx, my = sum(xs) / n, sum(ys) / n
+    sxx = sum((x - mx) ** 2 for x in xs)
+    if sxx == 0:
+        return 0.0
+    return sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / sxx
+
+
+def analyse(samples: list[dict], warmup: float) -> dict:
+    """지표별: 워밍업 이후 기울기(단위/가상 시간) × 구간 길이 = 추세 증가분 → 한도 비교"""
+    body = samples[int(len(samples) * warmup):]
+    out = {}
+    if len(body) < 3:
+        return out
+    for key, limit in LIMITS.items():
+        pts = [(s["t"] / 3600, s[key]) for s in body if s.get(key) is not None]
+        if len(pts) < 3:
+            continue
+        xs, ys = zip(*pts)
+        slope = _slope(xs, ys)
+        growth = slope * (xs[-1] - xs[0])
+        out[key] = {"first": ys[0], "last": ys[-1], "max": max(ys),
+                    "slope_per_h": round(slope, 4), "growth": round(growth, 3),
+                    "limit": limit, "ok": growth <= limit}
+    return out
+
+
+# ─── 하네스
+class Soak:
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.clock = clock.VirtualClock() if args.clock == "virtual" else clock.RealClock()
+        self.samples: list[dict] = []
+        self.counts = {k: 0 for k in RATES}
+        self.errors = 0
+        self.stalls = 0
+        self._pending: list[Future] = []
+        self._faults: list[tuple[float, str]] = []   # (복구 시각, 종류)
+        self.app = self.osd = None
+        self.remote = None
+
+    # ─── 준비 / 정리
+    def setup(self):
+        # 사용자 캐시/미러 스냅샷 대신 임시 디렉터리
+        core.CACHE_DIR = tempfile.mkdtemp(prefix="minidsp-soak-")
+        core.STATE_CACHE = os.path.join(core.CACHE_DIR, "state.json")
+        core.set_clock(self.clock)
+        if self.args.qt:
+            self._setup_qt()
+        core.open_device()
+        core.set_scenes([
+            {"name": "Quiet", "gain": -40.0, "mute": False, "channels": {}, "fade": 0.0},
+            {"name": "Loud",  "gain": -10.0, "mute": False, "channels": {}, "fade": 0.1},
+        ])
+        # 훅 워커만 시작 (Win32 훅은 설치하지 않음 - 이벤트는 여기서 링에 직접 넣음)
+        core._hook_stop.clear()
+        core._hook_thread = threading.Thread(target=core._hook_worker, name="hook-worker", daemon=True)
+        core._hook_thread.start()
+        # _bind_actions[0] 은 예약 슬롯(None) - 바인딩 id 는 1부터
+        self.bind_ids = {a: [i for i, (act, _) in enumerate(core._bind_actions[1:], 1) if act == a]
+                         for a in ("volume_up", "volume_down", "mute")}
+        core.start_polling(self.args.interval)
+        if self.args.http is not None:
+            from remote_api import RemoteServer
+            self.remote = RemoteServer("127.0.0.1", self.args.http)
+            self.remote.start()
+
+    def _setup_qt(self):
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PySide6.QtCore import QObject, Signal
+        from PySide6.QtWidgets import QApplication
+        from volume_osd import VolumeOSD
+        self._qobject = QObject
+
+        class Bridge(QObject):
+            gainChanged = Signal(float)
+
+        self.app = QApplication.instance() or QApplication([])
+        self.osd = VolumeOSD()
+        self._bridge = Bridge()
+        self._bridge.gainChanged.connect(self.osd.popup)
+        core.set_gain_callback(self._bridge.gainChanged.emit)
+
+    def teardown(self):
+        if self.remote is not None:
+            self.remote.stop()
+        core.stop_polling()
+        core._hook_stop.set()
+        hook_ring.signal.set()
+        core._hook_thread.join(2.0)
+        core._mirror.close()
+        if core._dev is not None:
+            core._dev.close()
+
+    # ─── 이벤트 주입
+    def _submit(self, fn, *args):
+        fut = core._executor.submit(fn, *args)
+        self._pending.append(fut)
+
+    def _inject(self, kind: str, now: float):
+        rng, dev = self.rng, core._dev
+        self.counts[kind] += 1
+        if kind == "key":
+            ids = self.bind_ids["mute" if rng.random() < 0.05 else rng.choice(("volume_up", "volume_down"))]
+            if ids:
+                hook_ring.push(rng.choice(ids), rng.randint(1, 3))
+        elif kind == "remote":
+            dev.set_remote(db=rng.uniform(-80.0, 0.0), muted=rng.random() < 0.1)
+        elif kind == "busy":
+            dev.busy_rate = rng.uniform(0.1, 0.8)
+            self._faults.append((now + rng.uniform(0.5, 5.0), "busy"))
+        elif kind == "unplug":
+            dev.closed = True
+            self._faults.append((now + rng.uniform(1.0, 30.0), "unplug"))
+        elif kind == "interval":
+            core.set_poll_interval(rng.choice((0.05, 0.1, 0.2, 0.5)))
+        elif kind == "restart":
+            core.restart_polling()
+        elif kind == "scene":
+            self._submit(core.apply_scene, rng.randrange(2))
+        elif kind == "http" and self.remote is not None:
+            body = json.dumps({"delta": rng.choice((-1.0, -0.5, 0.5, 1.0))}).encode()
+            req = urllib.request.Request(f"http://127.0.0.1:{self.remote.port}/gain", body,
+                                         {"Content-Type": "application/json"})
+            try:
+                with urllib.request.urlopen(req, timeout=5) as resp:
+                    resp.read()
+            except OSError:
+                self.errors += 1
+
+    def _heal(self, now: float):
+        keep = []
+        for t, kind in self._faults:
+            if t > now:
+                keep.append((t, kind))
+            elif kind == "busy":
+                core._dev.busy_rate = 0.0
+            else:
+                core._dev.closed = False
+        self._faults = keep
+
+    def _reap(self):
+        keep = []
+        for fut in self._pending:
+            if not fut.done():
+                keep.append(fut)
+            elif fut.exception() is not None:
+                self.errors += 1
+        self._pending = keep
+
+    # ─── 샘플링
+    def sample(self, now: float, wall0: float):
+        gc.collect()
+        objs = gc.get_objects()
+        s = {
+            "t": round(now, 3),
+            "wall": round(time.perf_counter() - wall0, 3),
+            "rss_mb": _rss_mb(),
+            "threads": threading.active_count(),
+            "handles": _handles(),
+            "gc_objects": len(objs),
+            "futures": sum(isinstance(o, Future) for o in objs),
+            "executor_queue": core._executor._work_queue.qsize(),
+            "hook_pending": core.get_hook_stats()["pending"],
+            "poll_threads": core.get_poll_stats()["threads"],
+            "writes": core._dev.writes,
+        }
+        del objs
+        if self.app is not None:
+            s["qt_objects"] = len(self.app.allWidgets()) + len(self.osd.findChildren(self._qobject))
+        self.samples.append(s)
+
+    # ─── 실행
+    def run(self) -> dict:
+        args = self.args
+        duration = args.hours * 3600
+        total_rate = sum(r for k, r in RATES.items() if k != "http" or args.http is not None)
+        kinds = [k for k in RATES if k != "http" or args.http is not None]
+        weights = [RATES[k] for k in kinds]
+        self.setup()
+        wall0 = time.perf_counter()
+        t0 = self.clock.monotonic()
+        next_event = t0 + self.rng.expovariate(total_rate)
+        next_sample = t0
+        moved = (t0, time.perf_counter())
+        try:
+            while True:
+                now = self.clock.monotonic() - t0
+                if self.clock.virtual:
+                    # 폴링 스레드가 멈춰 있으면(재시작 중·예외) 가상 시간도 멈춤 - 1초 넘으면 직접 진행
+                    if now + t0 != moved[0]:
+                        moved = (now + t0, time.perf_counter())
+                    elif time.perf_counter() - moved[1] > 1.0:
+                        self.stalls += 1
+                        self.clock.advance(args.interval)
+                        moved = (self.clock.monotonic(), time.perf_counter())
+                if now >= duration:
+                    break
+                # 폴링 스레드가 가상 시간을 앞당기므로 밀린 이벤트는 한 번에 (상한 있음)
+                for _ in range(64):
+                    if next_event - t0 > now:
+                        break
+                    self._inject(self.rng.choices(kinds, weights)[0], now)
+                    next_event += self.rng.expovariate(total_rate)
+                self._heal(now)
+                self._reap()
+                if now >= next_sample - t0:
+                    self.sample(now, wall0)
+                    next_sample += args.sample
+                    if args.verbose:
+                        s = self.samples[-1]
+                        print(f"{now/3600:8.2f} h  rss={s['rss_mb']}  threads={s['threads']}  "
+                              f"handles={s['handles']}  objs={s['gc_objects']}  writes={s['writes']}")
+                if self.app is not None:
+                    self.app.processEvents()
+                if self.clock.virtual:
+                    time.sleep(0.0005)          # 실시간 양보 - 가상 시간은 폴링 스레드가 진행
+                else:
+                    self.clock.sleep(0.005)
+        finally:
+            self.teardown()
+        return self.report(time.perf_counter() - wall0)
+
+    def report(self, wall: float) -> dict:
+        trends = analyse(self.samples, self.args.warmup)
+        # 폴링 스레드는 재시작·간격 변경과 무관하게 항상 하나
+        poll_threads = max((s["poll_threads"] for s in self.samples), default=0)
+        ok = bool(trends) and all(v["ok"] for v in trends.values()) and poll_threads <= 1
+        return {
+            "ok": ok,
+            "clock": self.args.clock,
+            "virtual_hours": self.args.hours,
+            "wall_s": round(wall, 1),
+            "seed": self.args.seed,
+            "qt": self.args.qt,
+            "events": self.counts,
+            "errors": self.errors,
+            "stalls": self.stalls,
+            "poll_threads_max": poll_threads,
+            "device_writes": self.samples[-1]["writes"] if self.samples else 0,
+            "poll": core.get_poll_stats(),
+            "reports": core.get_report_stats(),
+            "hook": core.get_hook_stats(),
+            "writes": core.get_write_stats(),
+            "trends": trends,
+            "samples": self.samples,
+        }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Soak core3 against a simulated device and check for resource growth")
+    parser.add_argument("--hours", type=float, default=24.0, help="run length in (virtual or real) hours")
+    parser.add_argument("--clock", choices=("virtual", "real"), default="virtual")
+    parser.add_argument("--interval", type=float, default=0.1, help="initial poll interval (s)")
+    parser.add_argument("--sample", type=float, default=60.0, help="sampling period in clock seconds")
+    parser.add_argument("--warmup", type=float, default=0.2, help="fraction of samples ignored for trends")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--qt", action="store_true", help="also drive an offscreen VolumeOSD")
+    parser.add_argument("--http", type=int, metavar="PORT", default=None,
+                        help="also serve and call the HTTP API (0 = any free port)")
+    parser.add_argument("--report", metavar="PATH", default=None)
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args()
+    if args.seed is None:
+        args.seed = random.randrange(1 << 30)
+
+    result = Soak(args).run()
+    path = args.report or os.path.join(core.LOG_DIR, time.strftime("soak-%Y%m%d-%H%M%S.json"))
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=1)
+
+    print(f"{'metric':<16}{'first':>10}{'last':>10}{'growth':>10}{'limit':>10}")
+    for key, t in result["trends"].items():
+        print(f"{key:<16}{t['first']:>10.1f}{t['last']:>10.1f}{t['growth']:>10.2f}{t['limit']:>10.1f}"
+              f"  {'ok' if t['ok'] else 'LEAK'}")
+    print(f"events={sum(result['events'].values())} errors={result['errors']} "
+          f"stalls={result['stalls']} device_writes={result['device_writes']} wall={result['wall_s']} s seed={args.seed}")
+    print(f"{'PASS' if result['ok'] else 'FAIL'} - report: {path}")
+    return 0 if result["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+# tests/simcore.py
+# -*- coding: utf-8 -*-
+"""
+테스트 공용: core3 를 시뮬레이션 기기(sim_device) + 가상 시간(clock.VirtualClock)으로
+• 캐시/미러 스냅샷은 테스트마다 임시 디렉터리 - 사용자 파일은 건드리지 않음
+• 폴링 스레드는 가상 시간으로 돌기 때문에 결과는 wait_until 로 (실시간) 기다림
+"""
+import os, shutil, sys, tempfile, time, unittest
+
+os.environ["MINIDSP_SIM"] = "1"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import core3 as core
+import clock
+
+
+def wait_until(cond, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if cond():
+            return True
+        time.sleep(0.001)
+    return cond()
+
+
+class SimCoreTest(unittest.TestCase):
+    interval = 0.1
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix="minidsp-test-")
+        core.CACHE_DIR = self.tmp
+        core.STATE_CACHE = os.path.join(self.tmp, "state.json")
+        core.state = core.VolumeState()
+        core.prev_db = core.prev_raw = core._last_state = core._shadow_gain = None
+        for c in core._channel_cache:
+            c[:] = [None, None]
+        self.clock = clock.VirtualClock()
+        core.set_clock(self.clock)
+        core.open_device()
+        self.dev = core._dev
+        core._executor.submit(lambda: None).result()    # open_device 가 예약한 미러 동기화까지
+        self.osd = []
+        core.set_gain_callback(self.osd.append)
+
+    def tearDown(self):
+        core.stop_polling()
+        core.set_gain_callback(lambda v: None)
+        core._mirror.close()
+        self.dev.close()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def start_polling(self):
+        """폴링 시작 + 첫 실측치(saved_gain)가 잡힐 때까지 대기"""
+        core.start_polling(self.interval)
+        self.assertTrue(wait_until(lambda: core.prev_db is not None), "poller never read the device")
+
+    def gain(self) -> float:
+        """기기 쪽 실제 gain (dB)"""
+        return -0.5 * self.dev.gain_val
@@ -0,0 +1,71 @@
+# tests/test_config.py
+# -*- coding: utf-8 -*-
+"""
+config._merge: 타입은 맞지만 범위/허용값을 벗어난 값(0, 음수, 모르는 문자열)은 경고 후 기본값 유지
+- 시작 시 읽기와 감시 스레드의 다시 읽기(reload) 모두
+"""
+import os, sys, tempfile, unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+from simcore import core
+
+
+class MergeRangeTest(unittest.TestCase):
+    def merge(self, raw: dict) -> dict:
+        with self.assertLogs("minidsp", "WARNING"):
+            return config._merge(raw)
+
+    def test_zero_and_negative_interval_keep_default(self):
+        for bad in (0, 0.0, -1, -0.5, float("nan")):
+            self.assertEqual(self.merge({"polling": {"interval": bad}})["polling"]["interval"],
+                             config.DEFAULTS["polling"]["interval"])
+
+    def test_valid_interval_is_taken(self):
+        self.assertEqual(config._merge({"polling": {"interval": 0.05}})["polling"]["interval"], 0.05)
+
+    def test_unknown_strings_keep_default(self):
+        data = self.merge({"volume": {"step_curve": "turbo"}, "startup": {"engine": "thread"},
+                           "gui": {"theme": "pink"}})
+        self.assertEqual(data["volume"]["step_curve"], "fine")
+        self.assertEqual(data["startup"]["engine"], "inproc")
+        self.assertEqual(data["gui"]["theme"], "dark")
+
+    def test_step_curve_names_match_core(self):
+        self.assertEqual(set(config.STEP_CURVES), set(core.STEP_CURVES))
+
+    def test_out_of_range_scene_and_binding_values_are_dropped(self):
+        data = self.merge({
+            "scenes": [{"name": "Loud", "gain": 6.0, "fade": -1.0}, {"name": "Quiet", "gain": -40}],
+            "bindings": [{"key": "F11", "mods": ["alt"], "action": "volume_up", "arg": 0},
+                         {"key": "F10", "mods": ["alt"], "action": "volume_down", "arg": -2.0},
+                         {"key": "1", "mods": ["alt"], "action": "scene", "arg": 0}],
+        })
+        self.assertEqual(data["scenes"], [{"name": "Loud"}, {"name": "Quiet", "gain": -40}])
+        self.assertTrue(all("arg" not in b for b in data["bindings"]))
+
+
+class ReloadRangeTest(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".toml")
+        os.close(fd)
+        self.addCleanup(os.remove, self.path)
+
+    def write(self, text: str):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def test_reload_rejects_zero_interval(self):
+        self.write("[polling]\ninterval = 0.2\n")
+        cfg = config.ConfigFile(self.path)
+        cfg.load()
+        self.assertEqual(cfg.get("polling.interval"), 0.2)
+        self.write("[polling]\ninterval = 0\n")
+        with self.assertLogs("minidsp", "WARNING"):
+            changes = cfg.reload()
+        self.assertEqual(changes, {"polling.interval": 0.1})
+        self.assertEqual(cfg.get("polling.interval"), 0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
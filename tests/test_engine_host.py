@@ -0,0 +1,60 @@
+# tests/test_engine_host.py
+# -*- coding: utf-8 -*-
+"""
+EngineClient.call: 응답 없이 타임아웃된 호출은 _pending 에 남지 않음
+엔진 모드 GUI 쪽: 훅이 쓰는 상태(장면 바인딩)는 GUI 프로세스에서도 갱신
+"""
+import os, sys, unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from engine_host import EngineClient
+from simcore import core
+import hotkeys
+
+
+class _SilentConn:
+    """보내기만 받고 응답은 하지 않는 엔진"""
+    def send(self, msg):
+        pass
+
+
+class CallTimeoutTest(unittest.TestCase):
+    def test_timed_out_call_is_forgotten(self):
+        client = EngineClient()
+        client._conn = _SilentConn()
+        for _ in range(3):
+            with self.assertRaises(TimeoutError):
+                client.call("get_state", timeout=0.01)
+        self.assertEqual(client._pending, {})
+
+
+class _RecordingEngine:
+    """호출만 기록하는 엔진 (core._engine 자리)"""
+    def __init__(self):
+        self.calls = []
+
+    def call(self, name, *args, timeout=None):
+        self.calls.append((name, args))
+
+
+class EngineModeGuiStateTest(unittest.TestCase):
+    def setUp(self):
+        self.engine = core._engine = _RecordingEngine()
+
+    def tearDown(self):
+        core._engine = None
+        core.set_scenes([])
+
+    def test_set_scenes_recompiles_gui_hotkeys_and_forwards(self):
+        scenes = [{"name": "Quiet", "gain": -40.0, "mute": False, "channels": {}, "fade": 0.0}]
+        core.set_scenes(scenes)
+        alt_1 = (hotkeys.KEY_NAMES["1"] << 4) | hotkeys.MOD_ALT
+        self.assertEqual(core._scenes, scenes)
+        self.assertNotEqual(core._bind_table[alt_1], 0)
+        self.assertEqual(self.engine.calls, [("set_scenes", (scenes,))])
+        core.set_scenes([])
+        self.assertEqual(core._bind_table[alt_1], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+# tests/test_hook_ring.py
+# -*- coding: utf-8 -*-
+"""
+hook_ring 디코딩: 휠 부분 델타 누적 (방향 전환 시 잔여분 버림), 놓친 수정키 key-up 교정
+"""
+import os, sys, unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import hook_ring
+import hotkeys
+
+VK_LSHIFT = 0xA0
+
+
+class WheelTest(unittest.TestCase):
+    def setUp(self):
+        table, self.actions = hotkeys.compile_bindings(hotkeys.DEFAULT_BINDINGS)
+        hook_ring.set_table(table)
+        hook_ring.reset_mods()
+        hook_ring.drain(self.actions)
+        self.saved_probe = hook_ring._mod_probe
+        self.held = hotkeys.MOD_SHIFT               # GetAsyncKeyState 대신: 실제로 눌린 수정키
+        hook_ring.set_mod_probe(lambda: self.held)
+        hook_ring.on_key(VK_LSHIFT, True)           # 기본 바인딩: Shift+휠
+
+    def tearDown(self):
+        hook_ring.set_mod_probe(self.saved_probe)
+        hook_ring.reset_mods()
+        hook_ring.drain(self.actions)
+
+    def notches(self) -> list[int]:
+        return [n for op, arg in hook_ring.drain(self.actions) if op == hook_ring.OP_VOL
+                for n, _ in arg]
+
+    def test_partial_deltas_add_up_to_a_notch(self):
+        for _ in range(4):
+            self.assertTrue(hook_ring.on_wheel(30))
+        self.assertEqual(self.notches(), [1])
+
+    def test_reversal_drops_the_other_direction_remainder(self):
+        hook_ring.on_wheel(90)                      # 한 노치에 못 미침
+        hook_ring.on_wheel(-120)                    # 반대로 한 노치 - 잔여 +90 에 먹히면 안 됨
+        self.assertEqual(self.notches(), [-1])
+        hook_ring.on_wheel(-60)
+        hook_ring.on_wheel(120)
+        self.assertEqual(self.notches(), [1])
+
+    def test_missed_modifier_key_up_does_not_swallow_plain_wheel(self):
+        self.held = 0                               # Shift key-up 을 훅이 못 봄 (UAC, 잠금 화면 …)
+        self.assertFalse(hook_ring.on_wheel(120))   # 그냥 휠 - 다음 훅으로 넘김
+        self.assertEqual(self.notches(), [])
+        self.assertEqual(hook_ring._mods, 0)        # 추적값도 교정됨
+        self.assertFalse(hook_ring.on_wheel(120))
+
+
+if __name__ == "__main__":
+    unittest.main()
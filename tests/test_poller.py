@@ -0,0 +1,57 @@
+# tests/test_poller.py
+# -*- coding: utf-8 -*-
+"""
+Poller: 간격 변경·정지/시작을 반복해도 폴링 스레드는 항상 하나
+(예전 stop_polling() → start_polling() 연속 호출은 이전 스레드가 멈추기 전에 새 스레드를 띄웠음)
+"""
+import threading, unittest
+from simcore import SimCoreTest, core, wait_until
+
+TOGGLES = 100
+
+
+def _pollers() -> int:
+    return sum(t.name == core.Poller.THREAD_NAME and t.is_alive() for t in threading.enumerate())
+
+
+class PollerTest(SimCoreTest):
+    def test_interval_toggles_keep_exactly_one_poller(self):
+        self.start_polling()
+        starts = core._poller.starts
+        for i in range(TOGGLES):
+            core.set_poll_interval(0.05 if i % 2 else 0.2)
+            self.assertEqual(_pollers(), 1)
+        self.assertEqual(core._poller.starts, starts, "interval change restarted the thread")
+        self.assertEqual(core._poller.interval, 0.05)
+        self.assertEqual(core.get_poll_stats()["threads"], 1)
+
+    def test_stop_start_toggles_keep_exactly_one_poller(self):
+        self.start_polling()
+        for i in range(TOGGLES):
+            # 설정 창이 하던 순서 그대로: 멈추고 곧바로 새 간격으로 시작
+            core.stop_polling()
+            core.start_polling(0.05 if i % 2 else 0.2)
+            self.assertEqual(_pollers(), 1)
+            if i % 10 == 0:
+                core.restart_polling()
+                self.assertEqual(_pollers(), 1)
+        self.assertEqual(core.get_poll_stats()["threads"], 1)
+        core.stop_polling()
+        self.assertEqual(_pollers(), 0)
+
+    def test_start_is_idempotent(self):
+        self.start_polling()
+        self.assertFalse(core._poller.start())
+        self.assertEqual(_pollers(), 1)
+
+    def test_restart_skips_initial_read(self):
+        self.start_polling()
+        self.osd.clear()
+        core.restart_polling()
+        # 유효한 상태가 있으면 초기 읽기(OSD 로 첫 값 표시)를 다시 하지 않음
+        self.assertTrue(wait_until(lambda: core.get_poll_stats()["n"] >= 3))
+        self.assertEqual(self.osd, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
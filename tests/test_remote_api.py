@@ -0,0 +1,64 @@
+# tests/test_remote_api.py
+# -*- coding: utf-8 -*-
+"""
+HTTP API 입력 검증: 잘못된 본문은 400 + 오류 메시지 (예전에는 응답 없이 소켓을 닫았음)
+"""
+import json, socket, unittest
+from simcore import SimCoreTest
+from remote_api import RemoteServer
+
+
+class RemoteApiTest(SimCoreTest):
+    def setUp(self):
+        super().setUp()
+        self.server = RemoteServer("127.0.0.1", 0)
+        self.server.start()
+
+    def tearDown(self):
+        self.server.stop()
+        super().tearDown()
+
+    def raw(self, data: bytes) -> bytes:
+        with socket.create_connection(("127.0.0.1", self.server.port), timeout=5) as s:
+            s.sendall(data)
+            chunks = []
+            while chunk := s.recv(4096):
+                chunks.append(chunk)
+        return b"".join(chunks)
+
+    def post(self, path: str, body: bytes) -> tuple[int, dict]:
+        resp = self.raw(f"POST {path} HTTP/1.1\r\nHost: x\r\nContent-Length: {len(body)}\r\n\r\n".encode()
+                        + body)
+        head, _, payload = resp.partition(b"\r\n\r\n")
+        return int(head.split(b" ", 2)[1]), json.loads(payload)
+
+    def test_invalid_bodies_get_400_with_a_message(self):
+        writes = self.dev.writes
+        for path, body in [("/gain", b"[1, 2]"), ("/gain", b'"-20"'), ("/gain", b'{"db": "loud"}'),
+                           ("/gain", b'{"db": NaN}'), ("/gain", b'{"delta": Infinity}'),
+                           ("/gain", b'{"db": true}'), ("/gain", b'{"db": 1e999999}'),
+                           ("/gain", b'{"db": ' + b"9" * 400 + b"}"), ("/mute", b'{"muted": "yes"}'),
+                           ("/mute", b"null"), ("/gain", b"{"), ("/gain", b"\xff\xfe")]:
+            with self.subTest(path=path, body=body):
+                status, payload = self.post(path, body)
+                self.assertEqual(status, 400)
+                self.assertTrue(payload.get("error"))
+        self.assertEqual(self.dev.writes, writes)
+
+    def test_valid_requests_still_apply(self):
+        status, snap = self.post("/gain", b'{"db": -20}')
+        self.assertEqual(status, 200)
+        self.assertEqual(self.gain(), -20.0)
+        status, snap = self.post("/mute", b'{"muted": true}')
+        self.assertEqual(status, 200)
+        self.assertTrue(snap["keyboard_muted"] or snap["digital_muted"])
+
+    def test_garbage_request_line_is_closed_silently(self):
+        self.assertEqual(self.raw(b"nonsense\r\n\r\n"), b"")
+
+    def test_bad_content_length_is_400(self):
+        self.assertIn(b" 400 ", self.raw(b"POST /gain HTTP/1.1\r\nContent-Length: -5\r\n\r\n"))
+
+
+if __name__ == "__main__":
+    unittest.main()
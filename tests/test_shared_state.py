@@ -0,0 +1,69 @@
+# tests/test_shared_state.py
+# -*- coding: utf-8 -*-
+"""
+seqlock 공유 메모리 블록: 다른 프로세스의 StateReader 가 쓰는 도중의 값을 보지 않는지
+• 부모가 gain/flags/device_id 가 서로 맞물린 스냅샷을 계속 게시
+• 별도 프로세스(이 파일을 --reader 로 실행)가 계속 읽으면서 모든 필드가 같은 게시에서 왔는지 확인
+"""
+import json, os, subprocess, sys, time, unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import shared_state as ss
+
+WRITES = 200_000
+STOP_ID = 0xFFFFFFFF
+
+
+def _snapshot(i: int) -> dict:
+    return {"gain": -0.5 * (i % 255), "keyboard_muted": bool(i & 1),
+            "digital_muted": bool(i & 2), "paused": bool(i & 4), "device_id": i}
+
+
+def _torn(snap: dict) -> bool:
+    return snap != dict(_snapshot(snap["device_id"]), seq=snap["seq"], timestamp=snap["timestamp"])
+
+
+def _reader(name: str) -> dict:
+    reads = torn = 0
+    seqs = set()
+    with ss.StateReader(name) as r:
+        print("ready", flush=True)
+        while True:
+            snap = r.read()
+            if snap["device_id"] == STOP_ID:
+                break
+            reads += 1
+            seqs.add(snap["seq"])
+            torn += _torn(snap)
+    return {"reads": reads, "torn": torn, "distinct": len(seqs)}
+
+
+class SharedStateCrossProcessTest(unittest.TestCase):
+    def test_reader_in_other_process_sees_no_torn_snapshots(self):
+        name = f"minidsp_test_{os.getpid()}"
+        writer = ss.StateWriter(name)
+        try:
+            writer.publish(_snapshot(0))
+            child = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--reader", name],
+                                     stdout=subprocess.PIPE, text=True)
+            self.assertEqual(child.stdout.readline().strip(), "ready")
+            for i in range(1, WRITES):
+                writer.publish(_snapshot(i))
+                if i % 256 == 0:
+                    time.sleep(0)               # 코어가 하나여도 리더가 쓰기 사이사이에 돌도록
+            writer.publish(dict(_snapshot(0), device_id=STOP_ID))
+            out, _ = child.communicate(timeout=60)
+        finally:
+            writer.close()
+        self.assertEqual(child.returncode, 0)
+        result = json.loads(out)
+        self.assertEqual(result["torn"], 0, result)
+        # 쓰기와 실제로 겹쳐서 읽었는지 (한 값만 계속 읽었다면 검증이 아님)
+        self.assertGreater(result["distinct"], 20, result)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--reader"]:
+        print(json.dumps(_reader(sys.argv[2])))
+    else:
+        unittest.main()
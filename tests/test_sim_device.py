@@ -0,0 +1,109 @@
+# tests/test_sim_device.py
+# -*- coding: utf-8 -*-
+"""
+시뮬레이션 기기를 통한 core 동작: gain 지정/스텝, 키보드 뮤트 토글, 리모컨 변경 감지, 채널 배치 쓰기
+"""
+import struct, threading, unittest
+from simcore import SimCoreTest, core, wait_until
+
+
+class GainTest(SimCoreTest):
+    def test_set_gain_writes_device_and_shows_osd(self):
+        core.set_gain(-20.0)
+        self.assertEqual(self.gain(), -20.0)
+        self.assertEqual(self.osd[-1], -20.0)
+        self.assertEqual(core.state.saved_gain, -20.0)
+
+    def test_set_gain_clamps_to_device_range(self):
+        core.set_gain(6.0)
+        self.assertEqual(self.gain(), 0.0)
+
+    def test_step_up_and_down(self):
+        core.step(1.5)
+        self.assertEqual(self.gain(), -28.5)
+        core.step(-3.0)
+        self.assertEqual(self.gain(), -31.5)
+        self.assertEqual(core.state.saved_gain, -31.5)
+
+    def test_step_is_ignored_while_paused(self):
+        core.pause_hotkeys(True)
+        try:
+            core.step(1.0)
+        finally:
+            core.pause_hotkeys(False)
+        self.assertEqual(self.gain(), -30.0)
+
+
+class MuteTest(SimCoreTest):
+    def test_keyboard_mute_toggle_restores_gain(self):
+        core.toggle_mute()
+        self.assertEqual(self.gain(), -127.0)
+        self.assertTrue(core.state.keyboard_muted)
+        self.assertEqual(core.state.saved_gain, -30.0)
+        core.toggle_mute()
+        self.assertEqual(self.gain(), -30.0)
+        self.assertFalse(core.state.keyboard_muted)
+
+    def test_step_while_muted_unmutes_to_saved_gain(self):
+        core.toggle_mute()
+        core.step(1.0)
+        self.assertEqual(self.gain(), -30.0)
+        self.assertFalse(core.state.keyboard_muted)
+
+
+class RemoteTest(SimCoreTest):
+    def test_poller_picks_up_remote_volume_change(self):
+        self.start_polling()
+        self.dev.set_remote(db=-12.0)
+        self.assertTrue(wait_until(lambda: core.get_state()["gain"] == -12.0))
+        self.assertTrue(wait_until(lambda: self.osd and self.osd[-1] == -12.0))
+
+    def test_poller_picks_up_remote_mute(self):
+        self.start_polling()
+        self.dev.set_remote(muted=True)
+        self.assertTrue(wait_until(lambda: core.state.digital_muted))
+        self.assertTrue(core.get_state()["digital_muted"])
+
+    def test_remote_zero_db_is_observed(self):
+        self.start_polling()
+        self.dev.set_remote(db=0.0)
+        self.assertTrue(wait_until(lambda: core.get_state()["gain"] == 0.0))
+
+
+class ChannelTest(SimCoreTest):
+    def _word(self, addr):
+        return self.dev.memory.get(addr)
+
+    def test_channel_changes_go_out_as_one_batch(self):
+        writes = self.dev.writes
+        core.set_channels({0: (-3.0, None), 1: (None, True), 2: (-6.5, False)})
+        # 0 gain, 1 mute, 2 gain - 2 의 mute 는 미러 동기화로 읽은 값(False)과 같아 생략
+        self.assertEqual(self.dev.writes - writes, 3)
+        self.assertEqual(struct.unpack("<f", self._word(0x0030))[0], -3.0)
+        self.assertEqual(struct.unpack("<i", self._word(0x0035))[0], 1)
+        self.assertEqual(core.read_channels()[:3], [(-3.0, False), (0.0, True), (-6.5, False)])
+
+    def test_unchanged_channels_are_skipped(self):
+        core.set_channels({0: (-3.0, False)})
+        writes = self.dev.writes
+        core.set_channels({0: (-3.0, False)})
+        self.assertEqual(self.dev.writes, writes)
+
+
+class DeviceSwitchTest(SimCoreTest):
+    def test_set_device_returns_without_waiting_for_io(self):
+        gate = threading.Event()
+        core._executor.submit(gate.wait, 5)          # 앞선 I/O 작업이 밀려 있는 상황
+        fut = core.set_device(b"no-such-device")
+        self.assertFalse(fut.done())
+        gate.set()
+        with self.assertRaises(Exception):           # 열 수 없는 경로 - 기존 기기 유지
+            fut.result(5)
+        self.assertIs(core._dev, self.dev)
+
+    def test_same_device_is_a_no_op(self):
+        self.assertEqual(core.set_device(core.device_path).result(5), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,13 +10,9 @@ import ctypes, platform
 from ctypes import wintypes
 from pathlib import Path
 from core3 import log_exceptions, logger
-from PySide6.QtCore   import QSettings, Qt, QTimer, QObject, Signal, QCoreApplication, QFile, QTextStream, qInstallMessageHandler, QtMsgType, QPoint
-from PySide6.QtGui    import QPalette, QColor, QIcon, QAction, QGuiApplication, QActionGroup, QFont, QShortcut, QKeySequence, QPainter
-from PySide6.QtWidgets import (
-    QApplication, QWidget, QMenu, QMenuBar, QStyleFactory, QLabel, QStyle,
-    QVBoxLayout, QFormLayout, QCheckBox, QComboBox, QSystemTrayIcon, 
-    QDialog, QTextEdit, QStyle, QSizePolicy, QMainWindow, QProxyStyle, QMessageBox
-)
+from PySide6.QtCore   import QSettings, QObject, Signal, qInstallMessageHandler, QtMsgType
+from PySide6.QtGui    import QPalette, QColor
+from PySide6.QtWidgets import QWidget, QMenu, QMenuBar, QStyleFactory, QMessageBox
 
 #--- 오류 검증용 개발후 삭제
 _qss_warnings: list[str] = []           # 앱 전역 경고 버퍼
@@ -61,6 +57,8 @@ def set_window_dark_titlebar(hwnd: int, enable: bool = True):
     )
 
 class ThemeManager(QObject):
+    themeChanged = Signal(str)          # 트레이 레벨 아이콘 등 테마별 리소스 갱신용
+
     @log_exceptions
     def __init__(self, app):
         super().__init__(app)  # parent=app
@@ -106,6 +104,8 @@ class ThemeManager(QObject):
             self._apply_light_palette()
             self._apply_qss(self._light_qss())
 
+        self.themeChanged.emit(mode)
+
         # ── 2) 스타일은 고정됐으므로 더 할 일 없음 ──────────────
         if window is not None:
             self._pending_refresh = (window, mode == "dark")
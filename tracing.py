@@ -0,0 +1,151 @@
+# tracing.py
+# -*- coding: utf-8 -*-
+"""
+miniDSP Gain Helper - Tracing
+===================================
+• 입력 이벤트 하나(핫키/HTTP/리모컨)에 trace id 를 붙여
+  hook → executor 대기 → handle_event → _lock 대기 → USB write → show_osd → Qt 시그널 → popup/paint
+  구간을 span 으로 기록 (고정 크기 메모리 버퍼)
+• 스레드를 건너갈 때: bind() (executor), handoff()/adopt() (Qt 시그널)
+• export_chrome(): Chrome trace-event JSON (Perfetto / chrome://tracing 에서 열기)
+  같은 trace id 의 span 은 flow 화살표로 연결
+• 꺼져 있을 때는 enabled 확인 한 번 - 버퍼/시계 접근 없음
+"""
+import collections, functools, itertools, json, os, threading, time
+
+enabled = False
+CAPACITY = 50_000
+
+_buf   = collections.deque(maxlen=CAPACITY)   # (name, trace, thread id, t0_ns, dur_ns)
+_ids   = itertools.count(1)
+_local = threading.local()
+_ns    = time.perf_counter_ns
+_pending = (0, 0)                              # Qt 시그널로 넘어가는 (trace, emit 시각)
+
+
+def enable(flag: bool):
+    global enabled
+    enabled = bool(flag)
+
+
+def clear():
+    _buf.clear()
+
+
+def current() -> int:
+    return getattr(_local, "trace", 0)
+
+
+# ─── span 기록
+def now() -> int:
+    """구간 시작 시각 (꺼져 있으면 0 - mark 가 무시)"""
+    return _ns() if enabled else 0
+
+
+def mark(name: str, t0: int, trace: int | None = None):
+    """t0(now() 값)부터 지금까지를 span 으로 기록"""
+    if t0:
+        _buf.append((name, current() if trace is None else trace,
+                     threading.get_ident(), t0, _ns() - t0))
+
+
+def traced(name: str):
+    """함수 호출 전체를 span 으로 (trace id 는 끝날 때의 현재 id)"""
+    def deco(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return func(*args, **kwargs)
+            t0 = _ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _buf.append((name, current(), threading.get_ident(), t0, _ns() - t0))
+        return wrapper
+    return deco
+
+
+# ─── trace 시작 / 스레드 전달
+def begin(name: str | None = None, t0: int = 0) -> int:
+    """현재 스레드에서 새 trace 시작 (t0 가 있으면 그때부터 지금까지를 name span 으로)"""
+    if not enabled:
+        return 0
+    tid = _local.trace = next(_ids)
+    if name and t0:
+        mark(name, t0, tid)
+    return tid
+
+
+def bind(func):
+    """현재 trace 를 다른 스레드(_executor)로 넘기는 래퍼 - 대기 시간은 executor.queue span"""
+    if not enabled:
+        return func
+    tid, t_submit = current(), _ns()
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        prev = current()
+        _local.trace = tid
+        mark("executor.queue", t_submit, tid)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _local.trace = prev
+    return wrapper
+
+
+def handoff():
+    """Qt 시그널 emit 직전 호출 - 받는 쪽이 adopt() 로 이어받음"""
+    global _pending
+    if enabled:
+        _pending = (current(), _ns())
+
+
+def adopt(name: str = "qt.signal"):
+    """GUI 스레드에서 호출: 넘어온 trace 를 현재 trace 로 삼고 전달 지연을 span 으로"""
+    global _pending
+    if not enabled:
+        return
+    tid, t0 = _pending
+    _pending = (0, 0)
+    _local.trace = tid
+    mark(name, t0, tid)
+
+
+# ─── 내보내기
+def spans() -> list[tuple]:
+    return list(_buf)
+
+
+def export_chrome(path: str, extra: list[tuple] = (), extra_pid: int | None = None) -> int:
+    """
+    버퍼(와 다른 프로세스에서 받은 extra span)를 Chrome trace-event JSON 으로 저장 → 이벤트 수
+    perf_counter_ns 는 시스템 전체 시계라 엔진 프로세스 span 과 그대로 합칠 수 있음
+    extra_pid: extra 를 기록한 프로세스의 실제 pid (extra 가 있으면 필수)
+    """
+    if extra and extra_pid is None:
+        raise ValueError("extra spans need the pid of the process that recorded them")
+    pid = os.getpid()
+    rows = [(s, pid) for s in _buf] + [(s, extra_pid) for s in extra]
+    rows.sort(key=lambda r: r[0][3])
+    events, flows = [], {}
+    for (name, trace, thread, t0, dur), p in rows:
+        ev = {"name": name, "cat": "minidsp", "ph": "X", "pid": p, "tid": thread,
+              "ts": t0 / 1000, "dur": dur / 1000, "args": {"trace": trace}}
+        events.append(ev)
+        if trace:
+            flows.setdefault(trace, []).append(ev)
+    # 같은 trace 의 span 들을 시간 순서대로 flow 로 연결
+    for trace, evs in flows.items():
+        if len(evs) < 2:
+            continue
+        for i, ev in enumerate(evs):
+            ph = "s" if i == 0 else ("f" if i == len(evs) - 1 else "t")
+            flow = {"name": "trace", "cat": "flow", "ph": ph, "id": trace,
+                    "pid": ev["pid"], "tid": ev["tid"], "ts": ev["ts"]}
+            if ph == "f":
+                flow["bp"] = "e"
+            events.append(flow)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+    return len(events)
@@ -0,0 +1,63 @@
+# transport.py
+# -*- coding: utf-8 -*-
+"""
+miniDSP Gain Helper - Direct HID Transport
+===================================
+• 헬퍼(GUI/엔진)가 실행 중이 아닐 때 minidsp_ctl 이 기기와 직접 통신
+• 요청 → 일치하는 응답을 timeout 안에 기다림 (한 번 재시도)
+• 흐름 제어/브레이커/폴링은 없음 - 짧게 열고 닫는 단발성 명령용 (상시 경로는 core3)
+"""
+import time
+import hid
+import protocol as p
+
+
+class HidTransport:
+    def __init__(self, path: bytes | None = None, timeout: float = 0.25):
+        self.timeout = timeout
+        info = None
+        for d in hid.enumerate():
+            if p.is_minidsp(d) and (path is None or d['path'] == path):
+                info = d
+                break
+        if info is None:
+            raise RuntimeError("miniDSP device not found")
+        self.info = info
+        self._dev = hid.Device(path=info['path'])
+
+    def close(self):
+        self._dev.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, req: bytes):
+        self._dev.write(req)
+
+    def exchange(self, req: bytes, match) -> bytes:
+        for _ in range(2):
+            self._dev.write(req)
+            deadline = time.monotonic() + self.timeout
+            while (left := deadline - time.monotonic()) > 0:
+                r = self._dev.read(65, max(1, int(left * 1000)))
+                if not r:
+                    continue
+                if r[0] == 0:
+                    r = r[1:]
+                if match(r):
+                    return bytes(r)
+        raise RuntimeError("miniDSP did not answer")
+
+    # ─── 명령
+    def status(self) -> dict:
+        r = self.exchange(p.memory_request(p.MASTER_STATUS, 4), p.memory_match(p.MASTER_STATUS))
+        return p.parse_status(r)
+
+    def set_gain(self, db: float):
+        self.write(p.gain_request(db))
+
+    def set_mute(self, muted: bool):
+        self.write(p.mute_request(muted))
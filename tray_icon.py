@@ -0,0 +1,123 @@
+# tray_icon.py
+# -*- coding: utf-8 -*-
+"""
+miniDSP Gain Helper - Tray Level Icon
+===================================
+• 트레이 아이콘/툴팁에 현재 gain·mute 표시
+• 아이콘은 (테마, DPI) 별로 한 번만 그린 아틀라스에서 선택 - 폴링마다 래스터화하지 않음
+  레벨 0~LEVELS(막대 수) + mute, gain 은 FLOOR_DB~0 dB 구간을 LEVELS 단계로 양자화
+• 양자화된 레벨(또는 테마/DPI)이 바뀔 때만 setIcon, 툴팁은 문구가 바뀔 때만 setToolTip
+"""
+import math
+from core3 import log_exceptions, MUTE_THRESHOLD
+from PySide6.QtCore   import QObject, Qt, QRectF, Signal
+from PySide6.QtGui    import QColor, QGuiApplication, QIcon, QPainter, QPen, QPixmap
+
+LEVELS   = 4                          # 막대 수
+FLOOR_DB = -60.0                      # 이 값 이하는 레벨 0 (막대 없음)
+MUTE     = LEVELS + 1                 # 아틀라스에서 mute 아이콘 위치
+SIZES    = (16, 32)                   # 논리 픽셀 (트레이 소형/대형)
+
+COLORS = {
+    "dark":  ("#F0F0F0", "#E05050"),  # 전경, mute 표시
+    "light": ("#202020", "#C02020"),
+}
+
+
+def quantize(gain: float | None, muted: bool) -> int | None:
+    """gain(dB)/mute → 아틀라스 인덱스 (상태가 없으면 None)"""
+    if gain is None:
+        return None
+    if muted or gain <= MUTE_THRESHOLD:
+        return MUTE
+    if gain <= FLOOR_DB:
+        return 0
+    return max(1, min(LEVELS, math.ceil((gain - FLOOR_DB) / -FLOOR_DB * LEVELS)))
+
+
+def _render(size: int, dpr: float, level: int, theme: str) -> QPixmap:
+    fg, red = (QColor(c) for c in COLORS.get(theme, COLORS["dark"]))
+    pm = QPixmap(round(size * dpr), round(size * dpr))
+    pm.setDevicePixelRatio(dpr)
+    pm.fill(Qt.transparent)
+    p = QPainter(pm)
+    p.setRenderHint(QPainter.Antialiasing)
+    p.setPen(Qt.NoPen)
+    # 오른쪽으로 갈수록 높아지는 막대
+    gap = size / 16
+    w = (size - gap * (LEVELS + 1)) / LEVELS
+    for i in range(LEVELS):
+        h = size * (0.35 + 0.65 * (i + 1) / LEVELS) - 2 * gap
+        lit = level != MUTE and i < level
+        c = QColor(fg)
+        c.setAlphaF(1.0 if lit else 0.3)
+        p.setBrush(c)
+        p.drawRoundedRect(QRectF(gap + i * (w + gap), size - gap - h, w, h), w / 4, w / 4)
+    if level == MUTE:
+        pen = QPen(red, size / 8)
+        pen.setCapStyle(Qt.RoundCap)
+        p.setPen(pen)
+        r = QRectF(0, 0, size, size).adjusted(gap * 2, gap * 2, -gap * 2, -gap * 2)
+        p.drawLine(r.topLeft(), r.bottomRight())
+    p.end()
+    return pm
+
+
+class IconAtlas:
+    """(테마, DPI) → 레벨별 QIcon 리스트 (처음 요청될 때 한 번만 그림)"""
+    def __init__(self):
+        self._cache: dict[tuple[str, float], list[QIcon]] = {}
+
+    def icons(self, theme: str, dpr: float) -> list[QIcon]:
+        key = (theme, dpr)
+        atlas = self._cache.get(key)
+        if atlas is None:
+            atlas = []
+            for level in range(MUTE + 1):
+                icon = QIcon()
+                for size in SIZES:
+                    icon.addPixmap(_render(size, dpr, level, theme))
+                atlas.append(icon)
+            self._cache[key] = atlas
+        return atlas
+
+
+class TrayLevelIndicator(QObject):
+    """core state listener(폴링 스레드) → 시그널 → GUI 스레드에서 트레이 갱신"""
+    stateChanged = Signal(dict)
+
+    def __init__(self, tray, theme_mgr, app_name: str, parent=None):
+        super().__init__(parent)
+        self.tray, self.theme_mgr, self.app_name = tray, theme_mgr, app_name
+        self.atlas = IconAtlas()
+        self._shown = None                # (레벨, 테마, dpr)
+        self._tooltip = None
+        self._snap = None
+        self.stateChanged.connect(self._apply)
+        theme_mgr.themeChanged.connect(lambda _: self._apply(self._snap))
+
+    def on_state(self, snap: dict):
+        self.stateChanged.emit(snap)
+
+    @log_exceptions
+    def _apply(self, snap: dict | None):
+        if snap is None:
+            return
+        self._snap = snap
+        gain = snap.get("gain")
+        muted = bool(snap.get("keyboard_muted") or snap.get("digital_muted"))
+        level = quantize(gain, muted)
+        if level is None:
+            return
+
+        screen = QGuiApplication.primaryScreen()
+        dpr = screen.devicePixelRatio() if screen else 1.0
+        key = (level, self.theme_mgr.current, dpr)
+        if key != self._shown:
+            self.tray.setIcon(self.atlas.icons(key[1], dpr)[level])
+            self._shown = key
+
+        text = f"{self.app_name}\n" + ("Muted" if level == MUTE else f"Gain: {gain:.1f} dB")
+        if text != self._tooltip:
+            self.tray.setToolTip(text)
+            self._tooltip = text
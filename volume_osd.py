@@ -7,13 +7,10 @@ miniDSP Gain Helper - Volume OSD
 • 
 """
 from core3 import log_exceptions, logger
-from PySide6.QtCore   import QSettings, Qt, QTimer, QObject, Signal, QCoreApplication, QFile, QTextStream, qInstallMessageHandler, QtMsgType, QPoint
-from PySide6.QtGui    import QPalette, QColor, QIcon, QAction, QGuiApplication, QActionGroup, QFont, QShortcut, QKeySequence, QPainter
-from PySide6.QtWidgets import (
-    QApplication, QWidget, QMenu, QMenuBar, QStyleFactory, QLabel, QStyle,
-    QVBoxLayout, QFormLayout, QCheckBox, QComboBox, QSystemTrayIcon, 
-    QDialog, QTextEdit, QStyle, QSizePolicy, QMainWindow, QProxyStyle, QMessageBox
-)
+import tracing
+from PySide6.QtCore   import Qt, QTimer
+from PySide6.QtGui    import QPalette, QFont, QPainter
+from PySide6.QtWidgets import QApplication, QWidget
 
 class VolumeOSD(QWidget):
     """상단 중앙 볼륨 표시 오버레이 (rounded rect + text)"""
@@ -38,9 +35,11 @@ class VolumeOSD(QWidget):
         self._timer.setSingleShot(True)
         self._timer.timeout.connect(self.hide)
 
+    @tracing.traced("osd.popup")
     @log_exceptions
     def popup(self, gain: float):
         """볼륨 변경할때마다 호출"""
+        tracing.adopt()                 # show_osd 에서 넘어온 trace 이어받기 (시그널 지연 = qt.signal)
         self._text = "Mute" if gain <= -126.9 else f"Gain: {gain:5.1f} dB"
         
         if self._text == self._last_text:
@@ -56,6 +55,7 @@ class VolumeOSD(QWidget):
         self.update() 
         self._timer.start()
 
+    @tracing.traced("osd.paint")
     @log_exceptions
     def paintEvent(self, event):
         p = QPainter(self)